@@ -0,0 +1,70 @@
+"""
+Compara o tempo de parse do fluxo antigo do main.py (três aberturas do PDF e
+extract_text duas vezes por página) com o motor de passada única.
+
+Uso:
+    python -m benchmarks.bench_engine arquivo.pdf [repetições]
+
+Um PDF de teste pode ser gerado com: python -m benchmarks.synthetic contracheque 500 arquivo.pdf
+"""
+import sys
+import time
+
+import pdfplumber
+
+from extracao.engine import extract_document, document_text, document_tables
+
+
+def legacy_extract(path):
+    # Reprodução do fluxo original: texto, tabelas e contagem de páginas do preview
+    with pdfplumber.open(path) as pdf:
+        raw_text = [page.extract_text() for page in pdf.pages if page.extract_text()]
+    text = "\n".join(raw_text)
+    tables = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            tables.extend(page.extract_tables() or [])
+    with pdfplumber.open(path) as pdf:
+        num_pages = len(pdf.pages)
+    return text, tables, num_pages
+
+
+def engine_extract(path):
+    document = extract_document(path)
+    return document_text(document), document_tables(document), document['num_pages']
+
+
+def best_of(func, path, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 1
+    path = argv[0]
+    repeat = int(argv[1]) if len(argv) > 1 else 3
+
+    legacy_time, legacy_result = best_of(legacy_extract, path, repeat)
+    engine_time, engine_result = best_of(engine_extract, path, repeat)
+    if legacy_result != engine_result:
+        print("ERRO: o motor de passada única diverge do fluxo original")
+        return 1
+
+    num_pages = engine_result[2]
+    print(f"Páginas: {num_pages}")
+    print(f"Fluxo original: {legacy_time:.3f}s ({num_pages / legacy_time:.1f} páginas/s)")
+    print(f"Passada única:  {engine_time:.3f}s ({num_pages / engine_time:.1f} páginas/s)")
+    print(f"Redução: {100 * (1 - engine_time / legacy_time):.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
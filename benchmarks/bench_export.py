@@ -0,0 +1,66 @@
+"""
+Vazão de cada formato de exportação.
+
+Gera registros de contracheque sintéticos e mede, para cada formato, o tempo
+e o tamanho da saída em dois modos:
+  - DataFrame completo em memória (`export_dataframe`, usado nos downloads)
+  - escrita incremental em arquivo (`open_writer`, usado no lote), em blocos
+
+Uso:
+    python -m benchmarks.bench_export [registros] [formatos separados por vírgula]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_tables import synthetic_table
+from extracao.export import WRITERS, export_dataframe, open_writer
+from extracao.tables import DEFAULT_LAYOUT, parse_table
+
+
+def synthetic_rows(size, seed=0):
+    rng = random.Random(seed)
+    # Poucas tabelas distintas bastam: o custo medido é o da serialização
+    sample = [parse_table(synthetic_table(rng, i)) for i in range(min(size, 1000))]
+    return [dict(sample[i % len(sample)], **{'Matrícula': str(100000 + i)}) for i in range(size)]
+
+
+def report(name, seconds, size_bytes, rows):
+    print(f"{name:<22} {seconds:8.3f}s {rows / seconds:12.0f} registros/s "
+          f"{size_bytes / 1e6:8.1f} MB {size_bytes / 1e6 / seconds:8.1f} MB/s")
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 100000
+    formats = argv[1].split(',') if len(argv) > 1 else ['csv', 'parquet', 'arrow', 'txt', 'xlsx']
+    rows = synthetic_rows(size)
+    columns = DEFAULT_LAYOUT.columns
+    print(f"Registros: {size}, colunas: {len(columns)}")
+
+    df = pd.DataFrame(rows, columns=columns)
+    print("-- DataFrame em memória (download)")
+    for fmt in formats:
+        start = time.perf_counter()
+        data = export_dataframe(df, fmt)
+        report(fmt, time.perf_counter() - start, len(data), size)
+
+    print("-- Escrita incremental (lote), blocos de 10.000 registros")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            if fmt not in WRITERS:
+                continue
+            path = os.path.join(tmp, f"saida.{fmt}")
+            start = time.perf_counter()
+            with open_writer(fmt, path, columns) as writer:
+                for i in range(0, size, 500):  # registros chegam aos poucos, como no lote
+                    writer.append(rows[i:i + 500])
+            report(fmt, time.perf_counter() - start, os.path.getsize(path), size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+Compara o modo de texto rápido (extracao.fasttext) com o modo completo do
+pdfplumber em fichas: throughput de extract_text_by_page e regressão dos
+campos extraídos pelo parse_page_1 e da chave de agrupamento (extract_id).
+
+Sem arquivo, gera uma ficha sintética (benchmarks.synthetic) com o número de
+páginas indicado. Termina com código 1 se algum campo divergir.
+
+Uso:
+    python -m benchmarks.bench_fasttext [arquivo.pdf | páginas] [semente]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+from extracao.engine import TEXT_FAST, TEXT_FULL, iter_pages
+from extracao.fields import extract_fields, extract_identity
+
+
+def texts(path, text_mode):
+    start = time.perf_counter()
+    result = [page['text'] for page in iter_pages(path, tables=False, text_mode=text_mode)]
+    return time.perf_counter() - start, result
+
+
+def field_differences(full_texts, fast_texts):
+    """(página, campo, valor completo, valor rápido) de cada divergência."""
+    differences = []
+    for number, (full, fast) in enumerate(zip(full_texts, fast_texts), start=1):
+        if extract_identity(full) != extract_identity(fast):
+            differences.append((number, '(agrupamento)', extract_identity(full), extract_identity(fast)))
+        full_fields = extract_fields(full)
+        fast_fields = extract_fields(fast)
+        for field in full_fields.keys() | fast_fields.keys():
+            if full_fields.get(field) != fast_fields.get(field):
+                differences.append((number, field, full_fields.get(field), fast_fields.get(field)))
+    return differences
+
+
+def main(argv):
+    source = argv[0] if argv else "200"
+    seed = int(argv[1]) if len(argv) > 1 else 0
+    if source.isdigit():
+        path = os.path.join(tempfile.gettempdir(), f"ficha-{source}-{seed}-v{synthetic.VERSION}.pdf")
+        if not os.path.exists(path):
+            synthetic.generate('ficha', int(source), path, seed)
+    else:
+        path = source
+
+    full_time, full_texts = texts(path, TEXT_FULL)
+    fast_time, fast_texts = texts(path, TEXT_FAST)
+    num_pages = len(full_texts)
+    identical = sum(full == fast for full, fast in zip(full_texts, fast_texts))
+    differences = field_differences(full_texts, fast_texts)
+
+    print(f"Páginas: {num_pages} ({path})")
+    print(f"Modo completo: {full_time:.3f}s ({num_pages / full_time:.1f} páginas/s)")
+    print(f"Modo rápido:   {fast_time:.3f}s ({num_pages / fast_time:.1f} páginas/s)")
+    print(f"Aceleração: {full_time / fast_time:.2f}x")
+    print(f"Texto idêntico em {identical} de {num_pages} páginas")
+    if differences:
+        print(f"ERRO: {len(differences)} campos divergem do modo completo")
+        for number, field, full, fast in differences[:20]:
+            print(f"  página {number}, {field}: {full!r} != {fast!r}")
+        return 1
+    print("Campos do parse_page_1 e chaves de agrupamento idênticos em todas as páginas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,114 @@
+"""
+Microbenchmark do extrator de campos da Ficha Completa.
+
+Compara a implementação original do parse_page_1 (dicionário de padrões
+montado a cada chamada e resolvido no cache do `re`) com `extract_fields`
+(padrões pré-compilados na importação), sobre um corpus de páginas
+sintéticas, e confere que as duas produzem exatamente a mesma saída em todas
+as páginas.
+
+Uso:
+    python -m benchmarks.bench_fields [páginas] [semente]
+"""
+import random
+import re
+import sys
+import time
+
+from benchmarks import synthetic
+from extracao.fields import extract_fields
+
+NOISE = [
+    "FOLHA DE PAGAMENTO - REGISTRO DO EMPREGADO",
+    "Observações: sem ocorrências no período",
+    "Histórico funcional 2019 2020 2021 2022 2023",
+]
+
+
+def synthetic_page(rng, i):
+    """Página do servidor `i` com campos variados, linhas ausentes e ruído entre as linhas."""
+    values = synthetic.employee_values(rng, i)
+    lines = []
+    for line in synthetic.FICHA_LINES:
+        if rng.random() < 0.1:
+            continue  # página de continuação ou campo ausente
+        lines.append(line.format(**values))
+        if rng.random() < 0.3:
+            lines.append(rng.choice(NOISE))
+    return "\n".join(lines)
+
+
+def legacy_parse_page_1(text):
+    # Implementação original do main2.parse_page_1 (cópia fiel, independente
+    # de extracao.fields.FIELD_PATTERNS)
+    data = {}
+    patterns = {
+        "Nome": r'Nome:\s*([^\n]+)',
+        "Matrícula": r'Matr[ií]cula:\s*(\d+)',
+        "CPF": r'C\.P\.F:\s*([\d\.\-]+)',
+        "RG": r'RG:\s*([\w\/\.\-]+)',
+        "Data de Nascimento": r'Data Nasc(?:\.|imento):\s*([\d\/]+)',
+        "Data de Admissão": r'Data Adm(?:\.|issão):\s*([\d\/]+)',
+        "Cargo": r'Cargo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+        "Vínculo": r'V[ií]nculo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+        "PIS/PASEP": r'PIS/PASEP:\s*([\d\.\-]+)',
+        "Sexo": r'Sexo:\s*([MF])',
+        "Estado Civil": r'Estado Civil:\s*([^\n]+?)(?=\s+N[ií]vel Instru[cç][ãa]o:|$)',
+        "Nível de Instrução": r'N[ií]vel Instru[cç][ãa]o:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+        "Órgão": r'Órgão\s*([\d]+\s*-\s*[^\n]+)(?=\s+Regime:|$)',
+        "Regime": r'Regime:\s*([^\n]+?)(?=\s+(?:Regime Prev\.|Lotação|[A-Z][\w\s/\.]+:)|$)',
+        "Lotação": r'Lotação\s*([\d]+\s*-\s*[^\n]+)',
+        "Regime Prev.": r'Regime Prev\.:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+        "Pai": r'Pai:\s*([^\n]+)(?=\s+M[ãa]e:|$)',
+        "Mãe": r'M[ãa]e:\s*([^\n]+)',
+        "Cônjugue": r'C[ôo]njugue:\s*([^\n]+)(?=\s+Data Nascimento:|$)',
+        "Rua/Av": r'Rua/Av:\s*([^\n]+)(?=\s+Número:|$)',
+        "Número": r'Número:\s*([^\n]+)(?=\s+Bairro:|$)',
+        # Bairro: captura até encontrar "Cidade:" ou o fim da linha
+        "Bairro": r'Bairro:\s*([^\n]+?)(?=\s+Cidade:|$)',
+        # Cidade: captura até encontrar "UF:" ou o fim da linha
+        "Cidade": r'Cidade:\s*([^\n]+?)(?=\s+UF:|$)',
+        "UF": r'UF:\s*([A-Z]{2})(?!\w)',
+        "C.E.P": r'C\.E\.P:\s*([\d\.\-]+)',
+        "Telefone": r'Telefone:\s*([\d]+)',
+        "Nº Dependentes Sal. Família": r'Nº Dependentes Sal\. Família:\s*(\d+)',
+        "Nº Dependentes IRRF": r'Nº Dependentes IRRF:\s*(\d+)',
+        "Dependentes": r'Nome dos Dependentes Sal\. Família:\s*([^\n]+)(?=\s+Data Nascimento:|$)'
+    }
+    for field, pattern in patterns.items():
+        match = re.search(pattern, text)
+        if match:
+            data[field] = match.group(1).strip()
+    return data
+
+
+def timed(func, corpus):
+    start = time.perf_counter()
+    results = [func(text) for text in corpus]
+    return time.perf_counter() - start, results
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 5000
+    seed = int(argv[1]) if len(argv) > 1 else 0
+    rng = random.Random(seed)
+    corpus = [synthetic_page(rng, i) for i in range(size)]
+
+    re.purge()  # o original dependia do cache interno do módulo re
+    legacy_time, legacy_results = timed(legacy_parse_page_1, corpus)
+    engine_time, engine_results = timed(extract_fields, corpus)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_results, engine_results)) if a != b]
+    if mismatches:
+        print(f"ERRO: {len(mismatches)} páginas com saída diferente (ex.: página {mismatches[0]})")
+        return 1
+
+    print(f"Páginas: {size} (saídas idênticas)")
+    print(f"Original:        {legacy_time:.3f}s ({size / legacy_time:.0f} páginas/s)")
+    print(f"Pré-compilado:   {engine_time:.3f}s ({size / engine_time:.0f} páginas/s)")
+    print(f"Ganho: {legacy_time / engine_time:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,96 @@
+"""
+Agrupamento das fichas por funcionário (extracao.grouping) em documentos com
+páginas de continuação sem o cabeçalho "Nome: ... Matrícula: ...".
+
+Gera a mesma ficha sintética com e sem o cabeçalho nas páginas de
+continuação e compara os funcionários obtidos: sem o cabeçalho, o
+agrupamento antigo (pelo nome, descartando as páginas sem nome) perde as
+páginas de continuação; o atual deve produzir os mesmos dados do documento
+com cabeçalho. Mede também o tempo do agrupamento por página sobre os
+textos repetidos até `repetições` vezes. Termina com código 1 se os dados
+divergirem ou se uma página só com rótulos em branco ("Nome:", "Nome:
+Matrícula:") for tomada como um funcionário.
+
+Uso:
+    python -m benchmarks.bench_grouping [páginas] [repetições]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+from extracao.engine import iter_pages
+from extracao.fields import extract_identity
+from extracao.grouping import EmployeeGrouper, summarize_warnings
+from extracao.pipeline import ficha_records, merge_records
+
+# Cabeçalhos com os rótulos em branco: a página é de continuação
+BLANK_LABELS = (
+    "Nome: \nCargo: ANALISTA",
+    "Nome: Matrícula:\nCargo: ANALISTA",
+    "Nome:\tMatrícula: \n",
+)
+
+
+def page_texts(num_pages, continuation_header):
+    suffix = "cabecalho" if continuation_header else "continuacao"
+    path = os.path.join(tempfile.gettempdir(), f"ficha-{num_pages}-{suffix}-v{synthetic.VERSION}.pdf")
+    if not os.path.exists(path):
+        synthetic.generate('ficha', num_pages, path, 0, continuation_header=continuation_header)
+    return [{'page_number': page['page_number'], 'text': page['text']}
+            for page in iter_pages(path, tables=False)]
+
+
+# Identificação antiga, só pelo nome (primeira linha "Nome: ..." da página)
+LEGACY_NAME_PATTERN = re.compile(r"Nome:\s*([^\n]+)")
+
+
+def by_name(pages):
+    # Agrupamento antigo: pelo nome, descartando as páginas sem a linha "Nome:"
+    kept = [page for page in pages if LEGACY_NAME_PATTERN.search(page['text'])]
+    return len(pages) - len(kept)
+
+
+def grouped(pages):
+    warnings = []
+    grouper = EmployeeGrouper()
+    users = merge_records(ficha_records(iter(pages), warnings, grouper=grouper))
+    return users, warnings, grouper.continuations
+
+
+def main(argv):
+    num_pages = int(argv[0]) if argv else 200
+    repeat = int(argv[1]) if len(argv) > 1 else 100
+
+    with_header = page_texts(num_pages, True)
+    without_header = page_texts(num_pages, False)
+    reference, _, _ = grouped(with_header)
+    users, warnings, continuations = grouped(without_header)
+    same = users == reference and list(users) == list(reference)
+
+    print(f"Páginas: {num_pages}, funcionários: {len(users)}")
+    print(f"Sem cabeçalho nas continuações: agrupamento pelo nome descartaria {by_name(without_header)} páginas; "
+          f"{continuations} páginas de continuação atribuídas ao funcionário anterior")
+    print(f"Avisos: {summarize_warnings(warnings) or 'nenhum'}")
+
+    # Textos repetidos: o custo por página não cresce com a quantidade de funcionários já vistos
+    texts = [page['text'] for page in without_header] * repeat
+    start = time.perf_counter()
+    grouper = EmployeeGrouper()
+    for text in texts:
+        grouper.resolve(extract_identity(text))
+    elapsed = time.perf_counter() - start
+    print(f"Identificação e agrupamento: {len(texts)} páginas em {elapsed:.3f}s "
+          f"({elapsed / len(texts) * 1e6:.1f} µs/página)")
+
+    blank = [text for text in BLANK_LABELS if extract_identity(text) is not None]
+    print(f"Rótulos em branco tomados como funcionário: {len(blank)}")
+
+    print(f"Dados idênticos ao documento com cabeçalho: {same}")
+    return 0 if same and not blank else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
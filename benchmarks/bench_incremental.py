@@ -0,0 +1,75 @@
+"""
+Mede o reprocessamento incremental das fichas (extracao.incremental): um
+primeiro envio com o índice vazio, o reenvio do mesmo PDF e um envio com
+páginas a mais, comparando com o processamento completo de cada um.
+
+Sem arquivos, gera fichas sintéticas (benchmarks.synthetic) com a mesma
+semente, de modo que as páginas iniciais do segundo documento coincidem com
+as do primeiro. Termina com código 1 se os dados dos funcionários divergirem
+do processamento completo.
+
+Uso:
+    python -m benchmarks.bench_incremental [páginas] [páginas do segundo envio]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks import synthetic
+from extracao.engine import iter_pages
+from extracao.incremental import PageIndex, employee_status, indexed_pages, indexed_records
+from extracao.pipeline import ficha_records, merge_records
+
+
+def full_run(data):
+    warnings = []
+    start = time.perf_counter()
+    users = merge_records(ficha_records(iter_pages(io.BytesIO(data), tables=False), warnings))
+    return time.perf_counter() - start, users
+
+
+def incremental_run(data, index_path):
+    warnings = []
+    changed = set()
+    start = time.perf_counter()
+    with PageIndex(index_path) as index:
+        users = merge_records(indexed_records(indexed_pages(io.BytesIO(data), index, warnings), changed, warnings))
+        status = employee_status(users, changed, index)
+        index.flush()
+        reused = index.hits
+    return time.perf_counter() - start, users, status, reused
+
+
+def main(argv):
+    first = int(argv[0]) if argv else 200
+    second = int(argv[1]) if len(argv) > 1 else first + first // 10
+    directory = tempfile.mkdtemp(prefix="extracao-incremental-")
+    index_path = os.path.join(directory, "indice.sqlite3")
+    uploads = []
+    for num_pages in (first, second):
+        path = os.path.join(directory, f"ficha-{num_pages}.pdf")
+        synthetic.generate('ficha', num_pages, path, 0)
+        with open(path, 'rb') as f:
+            uploads.append((f"{num_pages} páginas", f.read()))
+    uploads.insert(1, (f"{first} páginas (reenvio)", uploads[0][1]))
+
+    failed = False
+    for label, data in uploads:
+        full_time, full_users = full_run(data)
+        incremental_time, users, status, reused = incremental_run(data, index_path)
+        same = users == full_users and list(users) == list(full_users)
+        failed = failed or not same
+        print(f"{label}: completo {full_time:.3f}s, incremental {incremental_time:.3f}s "
+              f"({full_time / incremental_time:.1f}x), {reused} páginas do índice, "
+              f"situação {dict(Counter(status.values()))}, dados {'idênticos' if same else 'DIVERGENTES'}")
+    if failed:
+        print("ERRO: o processamento incremental diverge do completo")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
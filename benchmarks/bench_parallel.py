@@ -0,0 +1,50 @@
+"""
+Compara a extração serial com a extração paralela por páginas e confere que
+as duas produzem exatamente o mesmo resultado.
+
+Uso:
+    python -m benchmarks.bench_parallel arquivo.pdf [processos]
+
+Um PDF de teste pode ser gerado com: python -m benchmarks.synthetic contracheque 500 arquivo.pdf
+"""
+import io
+import os
+import sys
+import time
+
+from extracao.cache import file_bytes
+from extracao.engine import extract_document
+from extracao.parallel import document_errors, extract_document_parallel
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 1
+    data = file_bytes(argv[0])
+    workers = int(argv[1]) if len(argv) > 1 else (os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    serial = extract_document(io.BytesIO(data))
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = extract_document_parallel(data, workers=workers)
+    parallel_time = time.perf_counter() - start
+
+    errors = document_errors(parallel)
+    for page_number, message in errors:
+        print(f"Página {page_number}: {message}")
+    if not errors and parallel != serial:
+        print("ERRO: a extração paralela diverge da serial")
+        return 1
+
+    num_pages = serial['num_pages']
+    print(f"Páginas: {num_pages}")
+    print(f"Serial:            {serial_time:.3f}s ({num_pages / serial_time:.1f} páginas/s)")
+    print(f"Paralelo ({workers:>2} proc): {parallel_time:.3f}s ({num_pages / parallel_time:.1f} páginas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,80 @@
+"""
+Latência e memória da pré-visualização de páginas.
+
+Compara o fluxo original (pdfplumber.open sem fechar e to_image a 800 dpi a
+cada rerun) com o `PreviewRenderer` (resolução ajustada à largura de
+exibição, cache LRU e pré-renderização da próxima página).
+Mede o tempo por página, o tamanho do bitmap gerado e o da imagem enviada
+ao navegador.
+
+Uso:
+    python -m benchmarks.bench_preview arquivo.pdf [páginas]
+
+Um PDF de teste pode ser gerado com: python -m benchmarks.synthetic contracheque 500 arquivo.pdf
+"""
+import io
+import sys
+import time
+
+import pdfplumber
+from PIL import Image
+
+from extracao.cache import file_bytes
+from extracao.preview import PreviewRenderer
+
+
+def legacy_render(data, page_number):
+    # Reprodução do fluxo original (o PDF não era fechado)
+    pdf = pdfplumber.open(io.BytesIO(data))
+    image = pdf.pages[page_number - 1].to_image(resolution=800).original
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')  # o Streamlit codifica a imagem para enviá-la
+    return image, buffer.getvalue()
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 1
+    data = file_bytes(argv[0])
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        num_pages = min(len(pdf.pages), int(argv[1]) if len(argv) > 1 else 3)
+
+    start = time.perf_counter()
+    for n in range(1, num_pages + 1):
+        image, png = legacy_render(data, n)
+    legacy_time = (time.perf_counter() - start) / num_pages
+    legacy_bitmap = image.width * image.height * len(image.getbands())
+    print(f"Original (800 dpi):       {legacy_time * 1000:8.0f} ms/página, "
+          f"bitmap {image.width}x{image.height} ({legacy_bitmap / 1e6:.0f} MB), PNG {len(png) / 1e6:.2f} MB")
+
+    renderer = PreviewRenderer(prefetch=False)
+    start = time.perf_counter()
+    for n in range(1, num_pages + 1):
+        png = renderer.render(data, n)
+    fitted_time = (time.perf_counter() - start) / num_pages
+    image = Image.open(io.BytesIO(png))
+    fitted_bitmap = image.width * image.height * len(image.getbands())
+    print(f"Ajustada à largura:       {fitted_time * 1000:8.0f} ms/página, "
+          f"bitmap {image.width}x{image.height} ({fitted_bitmap / 1e6:.1f} MB), PNG {len(png) / 1e6:.2f} MB")
+
+    start = time.perf_counter()
+    for n in range(1, num_pages + 1):
+        renderer.render(data, n)
+    print(f"Rerun (cache):            {(time.perf_counter() - start) / num_pages * 1000:8.2f} ms/página")
+
+    # Navegação com pré-renderização: o usuário gasta ~1s olhando cada página
+    renderer = PreviewRenderer(prefetch=True)
+    waits = []
+    for n in range(1, num_pages + 1):
+        start = time.perf_counter()
+        renderer.render(data, n)
+        waits.append(time.perf_counter() - start)
+        time.sleep(1)
+    later = waits[1:] or waits
+    print(f"Próxima página (prefetch): {sum(later) / len(later) * 1000:7.1f} ms de espera por página")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Compara os registros como lista de dicionários de textos com o modelo
+tipado (extracao.records.RecordTable): memória retida, tempo de montagem do
+DataFrame e uma agregação típica (total de vencimentos por órgão). Alguns
+lançamentos recebem um item que não é valor ("###"): os campos de várias
+linhas do DataFrame tipado devem trazer exatamente os textos de origem.
+Termina com código 1 se a agregação ou os textos divergirem.
+
+Uso:
+    python -m benchmarks.bench_records [registros]
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_export import synthetic_rows
+from extracao.records import CONTRACHEQUE_SCHEMA, LIST_KINDS, RecordTable, parse_money
+
+# A cada quantos registros as vantagens trazem um item não convertido
+UNPARSEABLE_EVERY = 11
+
+
+def retained(build):
+    # Memória retida pelo objeto construído (tracemalloc)
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return time.perf_counter() - start, value
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 100000
+    def make_rows():
+        # Cópias independentes dos textos, como sairiam do parser
+        rows = [{k: v if v is None else ''.join(v) for k, v in row.items()} for row in synthetic_rows(size)]
+        for row in rows[::UNPARSEABLE_EVERY]:
+            if row.get('Vantagens'):
+                row['Vantagens'] += "; ###"
+        return rows
+
+    _, rows_bytes = retained(make_rows)
+    _, table_bytes = retained(lambda: RecordTable(CONTRACHEQUE_SCHEMA).extend(make_rows()))
+    rows = make_rows()
+    build_time, table = timed(lambda: RecordTable(CONTRACHEQUE_SCHEMA).extend(rows))
+
+    dict_frame_time, dict_frame = timed(lambda: pd.DataFrame(rows))
+    typed_frame_time, typed_frame = timed(table.to_frame)
+
+    def string_total():
+        values = dict_frame['Total de Vencimentos'].map(lambda v: parse_money(v) if v else None)
+        return values.groupby(dict_frame['Órgão/Secretaria']).sum()
+
+    string_time, by_string = timed(string_total)
+    typed_time, by_typed = timed(lambda: typed_frame.groupby('Órgão/Secretaria')['Total de Vencimentos'].sum())
+    children_time, children = timed(lambda: table.children('Vantagens', keys=('Órgão/Secretaria',)))
+
+    print(f"Registros: {size}")
+    print(f"Memória: dicionários {rows_bytes / 1e6:.1f} MB, tipado {table_bytes / 1e6:.1f} MB "
+          f"({rows_bytes / table_bytes:.1f}x menor)")
+    print(f"Conversão para o modelo tipado: {build_time:.3f}s")
+    print(f"DataFrame: dicionários {dict_frame_time:.3f}s, tipado {typed_frame_time:.3f}s")
+    print(f"Total por órgão: a partir dos textos {string_time:.3f}s, tipado {typed_time:.4f}s")
+    print(f"Lançamentos de vantagens em linhas filhas: {len(children)} linhas em {children_time:.3f}s")
+    same = (by_string.round(2) == by_typed.round(2)).all()
+    print(f"Agregações idênticas: {same}")
+    list_columns = [column for column, kind in CONTRACHEQUE_SCHEMA.items() if kind in LIST_KINDS]
+    preserved = all(typed_frame[column].fillna('').tolist() == [row.get(column) or '' for row in rows]
+                    for column in list_columns)
+    print(f"Textos dos campos de várias linhas preservados ({len(table.invalid)} itens não convertidos): {preserved}")
+    return 0 if same and preserved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+"""
+Tempo de importação e memória de um processo novo que só importa as
+aplicações (o que cada worker do Streamlit faz na primeira execução, antes de
+receber um PDF) e a linha de comando do processamento em lote.
+
+Cada módulo é importado em um processo novo com `python -X importtime`; o
+resultado é a mediana das repetições, o pico de RSS do processo e as
+importações diretas mais caras. Termina com código 1 se algum módulo que
+deve ser importado só sob demanda (pdfplumber, pool de processos,
+pré-visualização, modelo de regiões, modo de texto rápido...) for carregado
+na importação.
+
+Uso:
+    python -m benchmarks.bench_startup [repetições] [módulos...]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos carregados só quando usados (PDF recebido, pré-visualização, lote
+# paralelo, exportação em Excel)
+APP_DEFERRED = (
+    'pdfplumber',
+    'pdfminer',
+    'multiprocessing',
+    'concurrent.futures.process',
+    'streamlit_pdf_viewer',
+    'extracao.preview',
+    'extracao.regions',
+    'extracao.fasttext',
+    'extracao.batch',
+    'xlsxwriter',
+    'openpyxl',
+)
+
+# Módulo -> o que não deve ser importado com ele
+MODULES = {
+    'main': APP_DEFERRED,
+    'main2': APP_DEFERRED,
+    # O lote sempre lê PDFs; só a interface, o pandas e os escritores de Excel ficam de fora
+    'extracao.cli': ('streamlit', 'pandas', 'extracao.preview', 'xlsxwriter', 'openpyxl'),
+}
+
+# O ru_maxrss do Linux é herdado no exec (vem do processo que disparou a
+# medição); o VmHWM do /proc é só do processo novo
+_CHILD = """
+import resource, sys
+import {module}
+try:
+    with open('/proc/self/status') as status:
+        peak = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:')) / 1024
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+print(round(peak, 1))
+print(','.join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+
+def import_profile(module, deferred):
+    """
+    (tempo total em µs, {importação direta: µs}, pico de RSS em MB, módulos
+    de `deferred` carregados).
+    """
+    code = _CHILD.format(module=module, deferred=list(deferred))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    total = None
+    children = {}
+    direct = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, raw_name = line.split('|')
+        name = raw_name.strip()
+        # O -X importtime indenta cada nível com 2 espaços; os filhos vêm antes do pai
+        level = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        if level == 1:
+            children[name] = int(cumulative)
+        elif level == 0:
+            if name == module:
+                total, direct = int(cumulative), children
+            children = {}
+    peak, loaded = process.stdout.splitlines()[-2:]
+    return total, direct, float(peak), [m for m in loaded.split(',') if m]
+
+
+def measure(module, repeat=5):
+    """Mediana de `repeat` importações em processos novos, no formato dos resultados do benchmarks.run."""
+    runs = [import_profile(module, MODULES.get(module, APP_DEFERRED)) for _ in range(repeat)]
+    direct = runs[-1][1]
+    return {
+        'caso': f"importacao_{module}",
+        'tipo': 'inicializacao',
+        'paginas': 0,
+        'segundos': round(statistics.median(run[0] for run in runs) / 1e6, 6),
+        'paginas_por_s': None,
+        'pico_rss_mb': statistics.median(run[2] for run in runs),
+        'pico_rss_preparacao_mb': None,
+        'mais_caros': {name: direct[name] for name in sorted(direct, key=direct.get, reverse=True)[:6]},
+        'importados_antes_do_uso': runs[-1][3],
+    }
+
+
+def main(argv):
+    repeat = int(argv[0]) if argv else 5
+    modules = argv[1:] or list(MODULES)
+    failed = False
+    for module in modules:
+        result = measure(module, repeat)
+        print(f"{module}: importação {result['segundos'] * 1000:.0f} ms, pico de RSS {result['pico_rss_mb']:.1f} MB")
+        print("  mais caros: " + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in result['mais_caros'].items()))
+        if result['importados_antes_do_uso']:
+            failed = True
+            print(f"  ERRO: importados antes do uso: {', '.join(result['importados_antes_do_uso'])}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,202 @@
+"""
+Benchmark do parser de tabelas do contracheque.
+
+Compara a implementação original do parse_table (cadeia de if/elif e três
+passadas pela tabela) com `extracao.tables.parse_table` (passada única com
+dicionário rótulo -> campo), sobre tabelas sintéticas no formato devolvido
+pelo pdfplumber, e confere que as saídas são idênticas.
+
+Uso:
+    python -m benchmarks.bench_tables [tabelas] [semente]
+"""
+import random
+import sys
+import time
+
+from extracao.tables import parse_table, parse_table_report
+
+def legacy_parse_table(table):
+    # Implementação original do main.parse_table (if/elif e três passadas)
+    result = {
+        'Matrícula': None,
+        'Nome': None,
+        'CPF': None,
+        'PIS/PASEP': None,
+        'Banco': None,
+        'Agência': None,
+        'Conta': None,
+        'Órgão/Secretaria': None,
+        'Unid. Trabalho/Lotação': None,
+        'Data Admissão': None,
+        'Cargo/Benefício': None,
+        'Carga Horária': None,
+        'Tempo de Serviço': None,
+        'Margem Consignável': None,
+        'Tempo de Serviço Anterior': None,
+        'Código': None,
+        'Descrição': None,
+        'Limite': None,
+        'Vantagens': None,
+        'Descontos': None,
+        'Total de Vencimentos': None,
+        'Total de Descontos': None,
+        'Valor Líquido a Receber': None
+    }
+
+    # Parte 1: Processar as linhas superiores (primeiras 7 linhas)
+    for row in table[:7]:
+        for cell in row:
+            if cell is None:
+                continue
+            lines = cell.split('\n')
+            if lines[0] == 'Matrícula' and len(lines) > 1:
+                result['Matrícula'] = lines[1].strip()
+            elif lines[0] == 'Nome' and len(lines) > 1:
+                result['Nome'] = lines[1].strip()
+            elif lines[0] == 'CPF' and len(lines) > 1:
+                result['CPF'] = lines[1].strip()
+            elif lines[0] == 'PIS/PASEP' and len(lines) > 1:
+                result['PIS/PASEP'] = lines[1].strip()
+            elif lines[0] == 'Banco' and len(lines) > 1:
+                result['Banco'] = lines[1].strip()
+            elif lines[0] == 'Agência' and len(lines) > 1:
+                result['Agência'] = lines[1].strip()
+            elif lines[0] == 'Conta' and len(lines) > 1:
+                result['Conta'] = lines[1].strip()
+            elif lines[0] == 'Órgão/Secretaria' and len(lines) > 1:
+                result['Órgão/Secretaria'] = lines[1].strip()
+            elif lines[0] == 'Unid. Trabalho/Lotação' and len(lines) > 1:
+                result['Unid. Trabalho/Lotação'] = lines[1].strip()
+            elif lines[0] == 'Data Admissão' and len(lines) > 1:
+                result['Data Admissão'] = lines[1].strip()
+            elif lines[0] == 'Cargo/Benefício' and len(lines) > 1:
+                result['Cargo/Benefício'] = lines[1].strip()
+            elif lines[0] == 'Carga Horária' and len(lines) > 1:
+                result['Carga Horária'] = lines[1].strip()
+            elif lines[0] == 'Tempo de Serviço' and len(lines) > 1:
+                result['Tempo de Serviço'] = lines[1].strip()
+            elif lines[0] == 'Margem Consignável' and len(lines) > 1:
+                result['Margem Consignável'] = lines[1].strip()
+            elif 'Tempo de Serviço Anterior' in lines[0]:
+                if len(lines) > 1:
+                    result['Tempo de Serviço Anterior'] = lines[1].strip()
+                else:
+                    result['Tempo de Serviço Anterior'] = ''
+
+    # Parte 2: Processar a parte da tabela (cabeçalho e linha de valores)
+    header_row = None
+    data_row = None
+    for idx, row in enumerate(table):
+        if row[0] == 'Código':
+            header_row = row
+            # Supomos que a linha seguinte contenha os dados correspondentes
+            if idx + 1 < len(table):
+                data_row = table[idx + 1]
+            break
+
+    if header_row and data_row:
+        for i, header in enumerate(header_row):
+            if header is None:
+                continue
+            value = data_row[i] if i < len(data_row) else None
+            if value is None:
+                continue
+            # Extração baseada no rótulo da coluna
+            if header == 'Código':
+                # Junta valores separados por quebra de linha com vírgula
+                result['Código'] = '; '.join([v.strip() for v in value.split('\n')])
+            elif header == 'Descrição':
+                # Junta com " - " para melhor legibilidade
+                result['Descrição'] = '; '.join([v.strip() for v in value.split('\n')])
+            elif header == 'Limite':
+                result['Limite'] = '; '.join([v.strip() for v in value.split('\n')])
+            elif header == 'Vantagens':
+                result['Vantagens'] = '; '.join([v.strip() for v in value.split('\n')])
+            elif header == 'Descontos':
+                result['Descontos'] = '; '.join([v.strip() for v in value.split('\n')])
+            # O rótulo "Ref." pode ser ignorado ou tratado se necessário
+
+    # Parte 3: Processar as linhas de totais
+    for row in table:
+        for cell in row:
+            if cell is None:
+                continue
+            if cell.startswith('Total de Vencimentos'):
+                lines = cell.split('\n')
+                if len(lines) > 1:
+                    result['Total de Vencimentos'] = lines[1].strip()
+            elif cell.startswith('Total de Descontos'):
+                lines = cell.split('\n')
+                if len(lines) > 1:
+                    result['Total de Descontos'] = lines[1].strip()
+            elif cell.startswith('Valor Líquido a Receber'):
+                lines = cell.split('\n')
+                if len(lines) > 1:
+                    result['Valor Líquido a Receber'] = lines[1].strip()
+
+    return result
+
+
+def synthetic_table(rng, i):
+    """Tabela no formato do pdfplumber, com células ausentes e variações de ordem."""
+    header = [
+        ['Matrícula\n%d' % (100000 + i), 'Nome\nSERVIDOR %d' % i, 'CPF\n123.456.789-00',
+         'PIS/PASEP\n123.45678.90-1', 'Banco\n001', 'Agência\n1234'],
+        ['Conta\n56789-0', 'Órgão/Secretaria\nSEC EDUCACAO', 'Unid. Trabalho/Lotação\nESCOLA X',
+         'Data Admissão\n01/02/2010', 'Cargo/Benefício\nPROFESSOR', 'Carga Horária\n40'],
+        ['Tempo de Serviço\n10 anos', 'Margem Consignável\n500,00',
+         rng.choice(['Tempo de Serviço Anterior', 'Tempo de Serviço Anterior\n2 anos']), '', None, None],
+    ]
+    for row in header:
+        rng.shuffle(row)
+        if rng.random() < 0.2:
+            row[rng.randrange(len(row))] = None
+    lines = rng.randint(1, 12)
+    body = [
+        ['Código', 'Descrição', 'Ref.', 'Limite', 'Vantagens', 'Descontos'],
+        ['\n'.join('%03d' % rng.randint(1, 999) for _ in range(lines)),
+         '\n'.join('RUBRICA %d' % k for k in range(lines)),
+         '\n'.join('30' for _ in range(lines)), '',
+         '\n'.join('%d,00' % rng.randint(100, 5000) for _ in range(lines)),
+         '\n'.join('%d,00' % rng.randint(10, 500) for _ in range(lines // 2 + 1))],
+    ]
+    totals = [['Total de Vencimentos\n3.500,00', 'Total de Descontos\n385,00',
+               'Valor Líquido a Receber\n3.115,00', '', None, None]]
+    if rng.random() < 0.1:
+        body = []  # tabela sem lançamentos
+    if rng.random() < 0.1:
+        totals.append(['Valor Líquido a Receber', None, None, None, None, None])
+    return header + body + totals
+
+
+def timed(func, tables):
+    start = time.perf_counter()
+    results = [func(table) for table in tables]
+    return time.perf_counter() - start, results
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 20000
+    seed = int(argv[1]) if len(argv) > 1 else 0
+    rng = random.Random(seed)
+    tables = [synthetic_table(rng, i) for i in range(size)]
+
+    legacy_time, legacy_results = timed(legacy_parse_table, tables)
+    engine_time, engine_results = timed(parse_table, tables)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_results, engine_results)) if a != b]
+    if mismatches:
+        print(f"ERRO: {len(mismatches)} tabelas com saída diferente (ex.: tabela {mismatches[0]})")
+        return 1
+    unmatched = {label for table in tables for label in parse_table_report(table)[1]}
+
+    print(f"Tabelas: {size} (saídas idênticas)")
+    print(f"Original (if/elif, 3 passadas): {legacy_time:.3f}s ({size / legacy_time:.0f} tabelas/s)")
+    print(f"Passada única (dicionário):     {engine_time:.3f}s ({size / engine_time:.0f} tabelas/s)")
+    print(f"Ganho: {legacy_time / engine_time:.2f}x")
+    print(f"Rótulos não reconhecidos: {sorted(unmatched) or 'nenhum'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
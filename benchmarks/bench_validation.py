@@ -0,0 +1,139 @@
+"""
+Validação e agregação vetorizadas (extracao.validation) contra a conferência
+linha a linha sobre os textos, em contracheques sintéticos. Metade dos
+registros tem os totais recalculados para fechar com os lançamentos e um
+Código por lançamento; a outra metade mantém os totais fixos e os códigos do
+gerador (um por vantagem) e fica inconsistente. Alguns registros consistentes
+recebem ainda um lançamento que não pode ser convertido, e também devem ser
+apontados. Confere também o Código de cada lançamento no formato longo (nulo
+quando as quantidades não batem).
+Termina com código 1 se as conferências divergirem.
+
+Uso:
+    python -m benchmarks.bench_validation [registros]
+"""
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.bench_export import synthetic_rows
+from extracao.records import CONTRACHEQUE_SCHEMA, RecordTable, parse_money
+from extracao.validation import TOLERANCE, lancamentos, summarize, validate_contracheques
+
+
+# A cada quantos registros consistentes um lançamento de vantagem é ilegível
+UNPARSEABLE_EVERY = 7
+
+
+def format_money(value):
+    # 1234.56 -> "1.234,56" (inverso de parse_money)
+    return f"{value:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def money_list(text):
+    return [parse_money(value) for value in text.split('; ')] if text else []
+
+
+def checked_sum(text):
+    # Soma dos lançamentos; None se algum não pode ser convertido
+    try:
+        return sum(money_list(text))
+    except ValueError:
+        return None
+
+
+def text_list(text):
+    return text.split('; ') if text else []
+
+
+def consistent_rows(size):
+    rows = synthetic_rows(size)
+    for row in rows[::2]:
+        earnings = sum(money_list(row['Vantagens']))
+        deductions = sum(money_list(row['Descontos']))
+        # Um código por lançamento: os das vantagens e, em seguida, os dos descontos
+        lines = len(text_list(row['Vantagens'])) + len(text_list(row['Descontos']))
+        row['Código'] = '; '.join(f"{900 + i}" for i in range(lines)) or None
+        row['Descrição'] = '; '.join(f"RUBRICA {900 + i}" for i in range(lines)) or None
+        row['Total de Vencimentos'] = format_money(earnings)
+        row['Total de Descontos'] = format_money(deductions)
+        row['Valor Líquido a Receber'] = format_money(earnings - deductions)
+    for row in rows[::2 * UNPARSEABLE_EVERY]:
+        row['Vantagens'] = f"{row['Vantagens']}; ###" if row['Vantagens'] else "###"
+    return rows
+
+
+def row_by_row(rows):
+    # Conferência como no script antigo: um contracheque por vez, a partir dos textos
+    flags = []
+    totals = defaultdict(float)
+    for row in rows:
+        earnings = parse_money(row['Total de Vencimentos'])
+        deductions = parse_money(row['Total de Descontos'])
+        net = parse_money(row['Valor Líquido a Receber'])
+        earnings_sum = checked_sum(row['Vantagens'])
+        deductions_sum = checked_sum(row['Descontos'])
+        aligned = len(text_list(row['Código'])) == len(text_list(row['Vantagens'])) + len(text_list(row['Descontos']))
+        flags.append(aligned and earnings_sum is not None and deductions_sum is not None
+                     and abs(earnings_sum - earnings) <= TOLERANCE
+                     and abs(deductions_sum - deductions) <= TOLERANCE
+                     and abs(earnings - deductions - net) <= TOLERANCE)
+        totals[row['Órgão/Secretaria'] or "(sem informação)"] += net
+    return flags, totals
+
+
+def codes_by_line(rows):
+    # (registro, tipo, posição, código) de cada lançamento; código None sem um por lançamento
+    result = []
+    for index, row in enumerate(rows):
+        earnings, deductions, codes = text_list(row['Vantagens']), text_list(row['Descontos']), text_list(row['Código'])
+        aligned = len(codes) == len(earnings) + len(deductions)
+        for offset, (kind, values) in enumerate((('Vantagem', earnings), ('Desconto', deductions))):
+            start = len(earnings) if offset else 0
+            result.extend((index, kind, position, codes[start + position] if aligned else None)
+                          for position in range(len(values)))
+    return result
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return time.perf_counter() - start, value
+
+
+def main(argv):
+    size = int(argv[0]) if argv else 100000
+    rows = consistent_rows(size)
+    records = RecordTable(CONTRACHEQUE_SCHEMA).extend(rows)
+
+    reference_time, (flags, totals) = timed(lambda: row_by_row(rows))
+    frame_time, df = timed(records.to_frame)
+    validation_time, checks = timed(lambda: validate_contracheques(records))
+    summary_time, summary = timed(lambda: summarize(df, checks))
+    long_time, long_frame = timed(lambda: lancamentos(records))
+
+    print(f"Registros: {size}")
+    print(f"Linha a linha (textos): {reference_time:.3f}s")
+    print(f"Vetorizado: validação {validation_time:.3f}s, agregação por órgão {summary_time:.3f}s "
+          f"(DataFrame tipado {frame_time:.3f}s)")
+    print(f"Lançamentos em formato longo: {len(long_frame)} linhas em {long_time:.3f}s")
+    print(f"Inconsistentes: {(~checks['Consistente']).sum()} de {size} "
+          f"({checks['Inconsistências'].str.contains('não convertido').sum()} com valores não convertidos)")
+
+    expected_codes = codes_by_line(rows)
+    long_codes = long_frame['Código'].astype(object).where(long_frame['Código'].notna(), None)
+    same_codes = sorted(expected_codes) == sorted(zip(long_frame['registro'], long_frame['Tipo'],
+                                                      long_frame['posição'], long_codes))
+    misaligned = checks['Inconsistências'].str.contains('códigos').sum()
+    print(f"Códigos dos lançamentos idênticos à conferência linha a linha: {same_codes} "
+          f"({misaligned} contracheques sem um código por lançamento)")
+
+    same_flags = checks['Consistente'].tolist() == flags
+    by_group = summary.set_index('Órgão/Secretaria')['Valor Líquido a Receber']
+    same_totals = all(abs(by_group[group] - total) < 0.005 * max(1, abs(total)) for group, total in totals.items())
+    print(f"Conferência idêntica à linha a linha: {same_flags and same_totals}")
+    return 0 if same_flags and same_totals and same_codes else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,52 @@
+"""
+Compara dois resultados gravados pelo benchmarks.run (por exemplo, de dois
+commits diferentes), caso a caso e tamanho a tamanho.
+
+Uso:
+    python -m benchmarks.compare base.json novo.json
+"""
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _index(report):
+    return {(r['caso'], r['paginas']): r for r in report['resultados']}
+
+
+def compare(base, current):
+    """Linhas (caso, páginas, s base, s novo, aceleração, RSS base, RSS novo) dos casos em comum."""
+    base_index = _index(base)
+    rows = []
+    for key, new in _index(current).items():
+        old = base_index.get(key)
+        if old is None:
+            continue
+        speedup = old['segundos'] / new['segundos'] if new['segundos'] else None
+        rows.append((key[0], key[1], old['segundos'], new['segundos'], speedup,
+                     old.get('pico_rss_mb'), new.get('pico_rss_mb')))
+    return rows
+
+
+def print_comparison(base, current):
+    print(f"Base: {(base.get('commit') or '?')[:10]}  Novo: {(current.get('commit') or '?')[:10]}")
+    print(f"{'caso':<27} {'páginas':>7} {'base (s)':>10} {'novo (s)':>10} {'aceleração':>10} {'RSS (MB)':>16}")
+    for name, pages, old, new, speedup, old_rss, new_rss in compare(base, current):
+        ratio = f"{speedup:.2f}x" if speedup else "-"
+        print(f"{name:<27} {pages:>7} {old:>10.4f} {new:>10.4f} {ratio:>10} {str(old_rss):>7} -> {str(new_rss):<7}")
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    print_comparison(load(argv[0]), load(argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,267 @@
+"""
+Suíte de benchmarks reprodutível: gera (ou reaproveita) PDFs sintéticos
+determinísticos, mede as funções dos apps e grava o resultado em JSON, com o
+commit atual, para comparar entre versões.
+
+Casos medidos (cada um em um processo novo, para que o pico de RSS seja só dele):
+    extract_pdf_text       main.py, texto de todas as páginas (contracheque)
+    extract_pdf_tables     main.py, tabelas de todas as páginas (contracheque)
+    extract_text_by_page   main2.py, texto por página (ficha)
+    extract_text_by_page_rapido  idem, no modo de texto rápido
+    parse_table            main.py, uma chamada por tabela
+    parse_page_1           main2.py, uma chamada por página
+    export_<formato>       extracao.export, DataFrame dos contracheques
+    importacao_<módulo>    importação dos apps e da linha de comando em um
+                           processo novo (benchmarks.bench_startup; páginas = 0)
+
+Nos casos de parse e exportação a extração do PDF é preparação: fica fora do
+tempo, mas entra no pico de RSS; o pico após as importações e a preparação é
+gravado à parte (pico_rss_preparacao_mb). O throughput é sempre em páginas do PDF por
+segundo, para que os casos de um mesmo tamanho sejam comparáveis entre si.
+
+Uso:
+    python -m benchmarks.run [--paginas 10,100,1000] [--casos parse_table,...]
+                             [--repeticoes 3] [--semente 0] [--saida resultado.json]
+                             [--comparar resultado_anterior.json]
+
+Comparação de dois resultados já gravados: python -m benchmarks.compare A.json B.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+from benchmarks import bench_startup, compare, synthetic
+
+DEFAULT_PAGES = [10, 100, 1000]
+DATA_DIR = os.path.join(tempfile.gettempdir(), "extracao-benchmarks")
+# Resultados sem --saida: fora do repositório, junto com os PDFs gerados
+RESULTS_DIR = os.path.join(DATA_DIR, "resultados")
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual (None fora de Unix)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB, macOS em bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ---------------------------------------------------------------------------
+# Casos: preparação (fora do tempo) e execução medida
+# ---------------------------------------------------------------------------
+
+def _setup_path(path):
+    return path
+
+
+def _run_extract_pdf_text(path):
+    from main import extract_pdf_text
+    return extract_pdf_text(path)
+
+
+def _run_extract_pdf_tables(path):
+    from main import extract_pdf_tables
+    return extract_pdf_tables(path)
+
+
+def _run_extract_text_by_page(path):
+    from main2 import extract_text_by_page
+    return extract_text_by_page(path)
+
+
+def _run_extract_text_by_page_fast(path):
+    from main2 import extract_text_by_page
+    from extracao.engine import TEXT_FAST
+    return extract_text_by_page(path, text_mode=TEXT_FAST)
+
+
+def _setup_tables(path):
+    from main import extract_pdf_tables
+    return extract_pdf_tables(path)
+
+
+def _run_parse_table(tables):
+    from main import parse_table
+    return [parse_table(table) for table in tables]
+
+
+def _setup_texts(path):
+    from main2 import extract_text_by_page
+    return extract_text_by_page(path)
+
+
+def _run_parse_page_1(texts):
+    from main2 import parse_page_1
+    return [parse_page_1(text) for text in texts]
+
+
+def _setup_dataframe(path):
+    import pandas as pd
+    from main import extract_pdf_tables, parse_table
+    return pd.DataFrame([parse_table(table) for table in extract_pdf_tables(path)])
+
+
+def _export_case(fmt):
+    def run(df):
+        from extracao.export import export_dataframe
+        return export_dataframe(df, fmt)
+    return run
+
+
+# nome -> (tipo de PDF, preparação, execução)
+CASES = {
+    'extract_pdf_text': ('contracheque', _setup_path, _run_extract_pdf_text),
+    'extract_pdf_tables': ('contracheque', _setup_path, _run_extract_pdf_tables),
+    'extract_text_by_page': ('ficha', _setup_path, _run_extract_text_by_page),
+    'extract_text_by_page_rapido': ('ficha', _setup_path, _run_extract_text_by_page_fast),
+    'parse_table': ('contracheque', _setup_tables, _run_parse_table),
+    'parse_page_1': ('ficha', _setup_texts, _run_parse_page_1),
+}
+for _fmt in ('csv', 'xlsx', 'parquet', 'arrow'):
+    CASES[f'export_{_fmt}'] = ('contracheque', _setup_dataframe, _export_case(_fmt))
+
+
+def run_case(name, path, num_pages, repeat):
+    """Executa um caso (no processo filho) e devolve a melhor de `repeat` medições."""
+    import main, main2  # noqa: F401 - importações dos apps fora da medição
+    kind, setup, run = CASES[name]
+    data = setup(path)
+    setup_rss = peak_rss_mb()  # importações + preparação, para separar o custo do caso
+    run(data)  # aquecimento: caches de primeira chamada
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'caso': name,
+        'tipo': kind,
+        'paginas': num_pages,
+        'segundos': round(best, 6),
+        'paginas_por_s': round(num_pages / best, 2) if best else None,
+        'pico_rss_mb': peak_rss_mb(),
+        'pico_rss_preparacao_mb': setup_rss,
+    }
+
+
+def dataset(kind, num_pages, seed, directory=DATA_DIR):
+    """Caminho do PDF sintético; gerado só na primeira vez (é determinístico)."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{kind}-{num_pages}-{seed}-v{synthetic.VERSION}.pdf")
+    if not os.path.exists(path):
+        partial = path + ".parcial"
+        synthetic.generate(kind, num_pages, partial, seed)
+        os.replace(partial, path)
+    return path
+
+
+def git_commit():
+    """Commit atual e se há alterações não commitadas (None fora de um repositório)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def environment():
+    import pdfplumber
+    import pandas as pd
+    commit, dirty = git_commit()
+    return {
+        'commit': commit,
+        'alteracoes_locais': dirty,
+        'data': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'pdfplumber': pdfplumber.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def run_suite(pages, cases, repeat=3, seed=0, log=print):
+    results = []
+    spawn = get_context("spawn")
+    for num_pages in pages:
+        for name in cases:
+            path = dataset(CASES[name][0], num_pages, seed)
+            # Um processo por caso: o pico de RSS não acumula entre casos
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                result = pool.submit(run_case, name, path, num_pages, repeat).result()
+            results.append(result)
+            log(f"{name:<27} {num_pages:>6} páginas  {result['segundos']:>9.4f}s  "
+                f"{result['paginas_por_s']:>10.1f} páginas/s  pico RSS {result['pico_rss_mb']} MB")
+    return results
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmarks reprodutíveis com PDFs sintéticos; resultado gravado em JSON.",
+    )
+    parser.add_argument("--paginas", type=_csv_list, default=[str(n) for n in DEFAULT_PAGES],
+                        help="tamanhos dos PDFs, separados por vírgula (ex.: 10,100,10000)")
+    parser.add_argument("--casos", type=_csv_list, default=list(CASES),
+                        help="casos a medir, separados por vírgula (padrão: todos)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help=f"arquivo JSON do resultado (padrão: {RESULTS_DIR})")
+    parser.add_argument("--comparar", metavar="BASE.json", help="compara com um resultado anterior")
+    parser.add_argument("--sem-inicializacao", action="store_true",
+                        help="não mede a importação dos apps (casos importacao_*)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.casos if name not in CASES]
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(CASES)})")
+    pages = [int(n) for n in args.paginas]
+
+    report = environment()
+    report.update({'semente': args.semente, 'repeticoes': args.repeticoes,
+                   'versao_dados': synthetic.VERSION})
+    report['resultados'] = run_suite(pages, args.casos, args.repeticoes, args.semente)
+    if not args.sem_inicializacao:
+        for module in bench_startup.MODULES:
+            result = bench_startup.measure(module, max(args.repeticoes, 5))
+            report['resultados'].append(result)
+            print(f"{result['caso']:<27} {result['segundos']:>25.4f}s  pico RSS {result['pico_rss_mb']} MB")
+
+    output = args.saida
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(report['commit'] or 'sem-git')[:10]}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultado gravado em {output}")
+
+    if args.comparar:
+        print()
+        compare.print_comparison(compare.load(args.comparar), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
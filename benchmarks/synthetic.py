@@ -0,0 +1,285 @@
+"""
+Gerador de PDFs sintéticos (contracheques e fichas completas) para os
+benchmarks. Os arquivos são determinísticos para uma mesma semente, então o
+mesmo PDF pode ser regerado em qualquer commit para comparar resultados.
+
+- Contracheque: uma tabela por página, desenhada com linhas (como no PDF do
+  sistema de folha), com o layout que o parse_table reconhece e de 1 a 12
+  lançamentos. Como nos contracheques reais, a grade tem posição e tamanho
+  fixos (o quadro de lançamentos comporta 12 linhas), com título e rodapé
+  fora da tabela. Cada servidor tem de 1 a 3 contracheques em páginas seguidas
+  (vínculos ou competências diferentes).
+- Ficha completa: a primeira página do servidor traz todos os campos do
+  parse_page_1; as páginas de continuação (até 2) repetem a linha
+  "Nome: ... Matrícula: ..." e trazem o histórico funcional.
+
+Uso:
+    python -m benchmarks.synthetic {contracheque,ficha} PÁGINAS saida.pdf [--semente N] [--sem-cabecalho]
+"""
+import argparse
+import random
+import sys
+
+# Versão do conteúdo gerado: deve ser incrementada sempre que os PDFs mudarem,
+# pois faz parte do nome dos arquivos reaproveitados pelo benchmarks.run
+VERSION = 2
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MAX_PAGES_PER_EMPLOYEE = 3
+MAX_LANCAMENTOS = 12
+# Linhas de texto reservadas em cada linha da tabela do contracheque
+CONTRACHEQUE_ROW_LINES = [2, 2, 2, 1, MAX_LANCAMENTOS, 2]
+
+NAMES = ["MARIA DA SILVA", "JOSE SANTOS", "ANA PAULA SOUZA", "JOÃO PEREIRA", "LUCIA GONÇALVES"]
+RUBRICAS = ["SALARIO BASE", "GRATIFICACAO", "ADIC TEMPO SERVICO", "INSS", "IRRF",
+            "VALE ALIMENTACAO", "CONSIGNADO BANCO", "PLANO DE SAUDE", "SINDICATO"]
+FICHA_LINES = [
+    "Nome: {nome} Matrícula: {matricula}",
+    "C.P.F: {cpf} RG: {rg} Data Nasc.: {nascimento}",
+    "Data Adm.: {admissao} Cargo: {cargo} Vínculo: 1 - EFETIVO",
+    "PIS/PASEP: {pis} Sexo: {sexo} Estado Civil: {estado_civil} Nível Instrução: SUPERIOR COMPLETO",
+    "Órgão {orgao} Regime: ESTATUTARIO",
+    "Lotação {lotacao}",
+    "Regime Prev.: RPPS",
+    "Pai: {pai} Mãe: {mae}",
+    "Cônjugue: {conjuge} Data Nascimento: 05/05/1982",
+    "Rua/Av: {rua} Número: {numero} Bairro: {bairro} Cidade: {cidade} UF: {uf}",
+    "C.E.P: 01.000-000 Telefone: {telefone}",
+    "Nº Dependentes Sal. Família: {dep_sf} Nº Dependentes IRRF: {dep_irrf}",
+    "Nome dos Dependentes Sal. Família: {dependente} Data Nascimento: 01/01/2010",
+]
+
+
+def _date(rng, first_year, last_year):
+    return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(first_year, last_year)}"
+
+
+def _money(value):
+    # Formato brasileiro: 1.234,56
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def employee_values(rng, i):
+    """Dados de um servidor, compartilhados pelas suas páginas."""
+    return {
+        'nome': f"{rng.choice(NAMES)} {i}",
+        'matricula': 100000 + i,
+        'cpf': f"{rng.randint(100, 999)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}-{rng.randint(10, 99)}",
+        'rg': f"{rng.randint(100000, 9999999)}/SSP",
+        'nascimento': _date(rng, 1950, 2000),
+        'admissao': _date(rng, 1990, 2023),
+        'cargo': f"{rng.randint(1, 99)} - PROFESSOR NIVEL {rng.choice('IV')}",
+        'pis': f"{rng.randint(100, 999)}.{rng.randint(10000, 99999)}.{rng.randint(10, 99)}-{rng.randint(0, 9)}",
+        'sexo': rng.choice("MF"),
+        'estado_civil': rng.choice(["CASADO", "SOLTEIRO", "DIVORCIADO"]),
+        'orgao': f"{rng.randint(1, 99)} - SECRETARIA DE EDUCACAO",
+        'lotacao': f"{rng.randint(1, 999)} - ESCOLA MUNICIPAL",
+        'pai': rng.choice(NAMES),
+        'mae': rng.choice(NAMES),
+        'conjuge': rng.choice(NAMES),
+        'rua': "RUA DAS FLORES",
+        'numero': rng.randint(1, 9999),
+        'bairro': rng.choice(["CENTRO", "JARDIM AMERICA", "VILA NOVA"]),
+        'cidade': rng.choice(["SAO PAULO", "CAMPINAS", "SANTOS"]),
+        'uf': rng.choice(["SP", "RJ", "MG"]),
+        'telefone': rng.randint(1000000000, 99999999999),
+        'dep_sf': rng.randint(0, 5),
+        'dep_irrf': rng.randint(0, 5),
+        'dependente': rng.choice(NAMES),
+        'banco': f"{rng.randint(1, 999):03d}",
+        'agencia': f"{rng.randint(1000, 9999)}",
+        'conta': f"{rng.randint(10000, 99999)}-{rng.randint(0, 9)}",
+    }
+
+
+def employee_pages(rng, num_pages):
+    """Distribui as páginas entre os servidores: (índice, nº de páginas)."""
+    i = 0
+    remaining = num_pages
+    while remaining > 0:
+        count = min(remaining, rng.randint(1, MAX_PAGES_PER_EMPLOYEE))
+        yield i, count
+        remaining -= count
+        i += 1
+
+
+# ---------------------------------------------------------------------------
+# Escrita do PDF (objetos mínimos, fonte Helvetica com WinAnsiEncoding)
+# ---------------------------------------------------------------------------
+
+def _escape(text):
+    return text.encode('cp1252').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _text(x, y, text, size=7):
+    return b'BT /F1 %d Tf %.1f %.1f Td (' % (size, x, y) + _escape(text) + b') Tj ET\n'
+
+
+def write_pdf(path, streams, num_pages):
+    """
+    Grava um PDF com `num_pages` páginas, uma por content stream. As páginas
+    são escritas conforme o iterável é consumido; apenas os offsets ficam em
+    memória, o que permite gerar documentos com dezenas de milhares de páginas.
+    """
+    offsets = []
+    with open(path, 'wb') as out:
+        position = out.write(b'%PDF-1.4\n')
+
+        def write_object(body):
+            nonlocal position
+            offsets.append(position)
+            position += out.write(b'%d 0 obj\n' % len(offsets) + body + b'\nendobj\n')
+
+        kids = ' '.join(f'{4 + 2 * i} 0 R' for i in range(num_pages))
+        write_object(b'<< /Type /Catalog /Pages 2 0 R >>')
+        write_object(f'<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>'.encode())
+        write_object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        for i, stream in enumerate(streams):
+            write_object(
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+                f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'.encode()
+            )
+            write_object(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        if len(offsets) != 3 + 2 * num_pages:
+            raise ValueError(f"esperadas {num_pages} páginas, geradas {(len(offsets) - 3) // 2}")
+
+        xref = position
+        out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(offsets) + 1))
+        out.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+        out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(offsets) + 1, xref))
+    return num_pages
+
+
+# ---------------------------------------------------------------------------
+# Contracheque
+# ---------------------------------------------------------------------------
+
+def contracheque_rows(rng, values):
+    """Linhas da tabela como pares (rótulo, valor); valor None = célula só com o rótulo."""
+    lines = rng.randint(1, MAX_LANCAMENTOS)
+    rubricas = [rng.choice(RUBRICAS) for _ in range(lines)]
+    vantagens = [rng.randint(10000, 500000) / 100 for _ in range(lines)]
+    descontos = [rng.randint(1000, 50000) / 100 for _ in range(lines // 2 + 1)]
+    total_vencimentos = sum(vantagens)
+    total_descontos = sum(descontos)
+    # Versões abreviadas, como no contracheque, para caberem na célula
+    orgao = values['orgao'].replace("SECRETARIA DE ", "SEC ")
+    lotacao = values['lotacao'].replace("ESCOLA ", "ESC ")
+    cargo = values['cargo'].split(" NIVEL")[0]
+    return [
+        [('Matrícula', str(values['matricula'])), ('Nome', values['nome']), ('CPF', values['cpf']),
+         ('PIS/PASEP', values['pis']), ('Banco', values['banco']), ('Agência', values['agencia'])],
+        [('Conta', values['conta']), ('Órgão/Secretaria', orgao),
+         ('Unid. Trabalho/Lotação', lotacao), ('Data Admissão', values['admissao']),
+         ('Cargo/Benefício', cargo), ('Carga Horária', '40')],
+        [('Tempo de Serviço', f"{rng.randint(0, 35)} anos"),
+         ('Margem Consignável', _money(total_vencimentos * 0.3)),
+         ('Tempo de Serviço Anterior', None), ('', None), ('', None), ('', None)],
+        [('Código', None), ('Descrição', None), ('Ref.', None), ('Limite', None),
+         ('Vantagens', None), ('Descontos', None)],
+        [('\n'.join(f"{rng.randint(1, 999):03d}" for _ in range(lines)), None),
+         ('\n'.join(rubricas), None),
+         ('\n'.join('30' for _ in range(lines)), None),
+         ('', None),
+         ('\n'.join(_money(v) for v in vantagens), None),
+         ('\n'.join(_money(v) for v in descontos), None)],
+        [('Total de Vencimentos', _money(total_vencimentos)),
+         ('Total de Descontos', _money(total_descontos)),
+         ('Valor Líquido a Receber', _money(total_vencimentos - total_descontos)),
+         ('', None), ('', None), ('', None)],
+    ]
+
+
+def contracheque_page(rows, competencia):
+    stream = bytearray()
+    x0, width = 20, 92
+    stream += _text(x0, PAGE_HEIGHT - 26, "PREFEITURA MUNICIPAL - DEMONSTRATIVO DE PAGAMENTO", 9)
+    stream += _text(x0 + 5 * width, PAGE_HEIGHT - 26, f"Competência: {competencia}", 7)
+    y = PAGE_HEIGHT - 42
+    for row, min_lines in zip(rows, CONTRACHEQUE_ROW_LINES):
+        cells = [label.split('\n') + ([value] if value is not None else []) for label, value in row]
+        height = 10 * max(min_lines, *(len(lines) for lines in cells)) + 6
+        for column, lines in enumerate(cells):
+            x = x0 + column * width
+            stream += b'%.1f %.1f %.1f %.1f re S\n' % (x, y - height, width, height)
+            for k, line in enumerate(lines):
+                if line:
+                    stream += _text(x + 3, y - 10 - 10 * k, line, 6)
+        y -= height
+    stream += _text(x0, y - 14, "Mensagem: crédito em conta conforme dados bancários acima.", 6)
+    return bytes(stream)
+
+
+def contracheque_streams(num_pages, seed=0):
+    rng = random.Random(seed)
+    for i, count in employee_pages(rng, num_pages):
+        values = employee_values(rng, i)
+        for k in range(count):
+            competencia = f"{(i + k) % 12 + 1:02d}/2024"
+            yield contracheque_page(contracheque_rows(rng, values), competencia)
+
+
+# ---------------------------------------------------------------------------
+# Ficha completa
+# ---------------------------------------------------------------------------
+
+def ficha_page(lines):
+    stream = bytearray()
+    for k, line in enumerate(lines):
+        stream += _text(30, PAGE_HEIGHT - 42 - 14 * k, line, 8)
+    return bytes(stream)
+
+
+def ficha_streams(num_pages, seed=0, continuation_header=True):
+    """
+    continuation_header=False gera páginas de continuação sem a linha
+    "Nome: ...", que o agrupamento atribui ao funcionário da página anterior.
+    """
+    rng = random.Random(seed)
+    for i, count in employee_pages(rng, num_pages):
+        values = employee_values(rng, i)
+        yield ficha_page([line.format(**values) for line in FICHA_LINES])
+        for page in range(1, count):
+            lines = [FICHA_LINES[0].format(**values)] if continuation_header else []
+            lines.append(f"HISTÓRICO FUNCIONAL - FOLHA {page + 1}")
+            lines.extend(
+                f"{_date(rng, 1990, 2024)} {rng.choice(['PROGRESSAO', 'FERIAS', 'LICENCA', 'REMOCAO'])}"
+                f" - PORTARIA {rng.randint(1, 9999)}/{rng.randint(1990, 2024)}"
+                for _ in range(rng.randint(5, 40))
+            )
+            yield ficha_page(lines)
+
+
+GENERATORS = {
+    'contracheque': contracheque_streams,
+    'ficha': ficha_streams,
+}
+
+
+def generate(kind, num_pages, path, seed=0, **options):
+    """Gera o PDF sintético `kind` com `num_pages` páginas em `path`."""
+    return write_pdf(path, GENERATORS[kind](num_pages, seed, **options), num_pages)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.synthetic",
+        description="Gera PDFs sintéticos de contracheques ou fichas para benchmarks.",
+    )
+    parser.add_argument("tipo", choices=sorted(GENERATORS))
+    parser.add_argument("paginas", type=int)
+    parser.add_argument("saida")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--sem-cabecalho", action="store_true",
+                        help="fichas: páginas de continuação sem a linha 'Nome: ...'")
+    args = parser.parse_args(argv)
+
+    options = {'continuation_header': False} if args.sem_cabecalho and args.tipo == 'ficha' else {}
+    num_pages = generate(args.tipo, args.paginas, args.saida, args.semente, **options)
+    print(f"{args.saida}: {num_pages} páginas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Núcleo de extração de dados dos PDFs (contracheques e fichas completas),
+compartilhado pelas aplicações Streamlit e pelo processamento em lote
+(`python -m extracao`).
+
+Os nomes abaixo são importados sob demanda, no primeiro acesso
+(`extracao.process_ficha`): importar um submódulo (`extracao.fields`) não
+carrega o restante do pacote, como o pandas, o pdfplumber, o pool de
+processos ou a pré-visualização. Ver benchmarks/bench_startup.py.
+"""
+import importlib
+
+_EXPORTS = {
+    'extracao.engine': ('extract_document', 'iter_pages', 'document_text', 'document_tables'),
+    'extracao.cache': ('cached_extract_document',),
+    'extracao.parallel': ('extract_document_parallel', 'document_errors'),
+    'extracao.fields': ('extract_fields', 'extract_identity'),
+    'extracao.grouping': ('EmployeeGrouper', 'group_pages'),
+    'extracao.tables': ('parse_table', 'parse_table_report', 'make_layout', 'load_layout'),
+    'extracao.records': ('RecordTable', 'CONTRACHEQUE_SCHEMA', 'FICHA_SCHEMA'),
+    'extracao.regions': ('TableTemplate', 'learn_template', 'load_template', 'save_template'),
+    'extracao.pipeline': ('process_contracheque', 'process_ficha', 'detect_kind'),
+    'extracao.batch': ('process_file', 'run_batch'),
+    'extracao.export': ('export_dataframe', 'open_writer'),
+    'extracao.preview': ('PreviewRenderer',),
+    'extracao.profiling': ('Profiler', 'stage'),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'extracao' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # próximos acessos não passam por aqui
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,5 @@
+import sys
+
+from extracao.cli import main
+
+sys.exit(main())
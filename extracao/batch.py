@@ -0,0 +1,87 @@
+"""
+Processamento em lote de pastas de PDFs, sem Streamlit.
+
+Os arquivos são distribuídos em um pool de processos; para cada um é
+registrado o tempo gasto, o número de páginas e registros e, em caso de
+falha, o erro, sem interromper o restante do lote.
+"""
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from extracao.engine import TEXT_FULL
+from extracao.pipeline import CONTRACHEQUE, PROCESSORS, detect_kind
+from extracao.profiling import Profiler
+from extracao.tables import DEFAULT_LAYOUT
+
+
+def expand_inputs(inputs):
+    """
+    Resolve as entradas (arquivos, pastas ou padrões glob) em uma lista
+    ordenada e sem repetições de caminhos de PDF. Pastas são percorridas
+    recursivamente.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, name) for name in files if name.lower().endswith('.pdf'))
+        elif glob.has_magic(item):
+            paths.extend(p for p in glob.glob(item, recursive=True) if p.lower().endswith('.pdf'))
+        else:
+            paths.append(item)
+    return sorted(set(paths))
+
+
+def process_file(path, kind='auto', profile=None, template=None, text_mode=TEXT_FULL, layout=DEFAULT_LAYOUT):
+    """
+    Processa um arquivo e devolve o resultado com as métricas:
+    {'file', 'kind', 'num_pages', 'rows', 'unmatched', 'warnings', 'seconds', 'error'}.
+    Com `profile` (argumentos do Profiler, ex.: {'track_memory': True}) o
+    resultado inclui também o relatório de desempenho por etapa ('profile').
+    `template` é o modelo de regiões usado nas tabelas dos contracheques,
+    `layout` o layout dos rótulos dos contracheques (ver extracao.tables) e
+    `text_mode` o modo de texto das fichas.
+    """
+    start = time.perf_counter()
+    result = {'file': path, 'kind': kind, 'num_pages': 0, 'rows': [], 'unmatched': [],
+              'warnings': [], 'error': None}
+    profiler = Profiler(**profile) if profile is not None else None
+    try:
+        with profiler.activate() if profiler else nullcontext():
+            if kind == 'auto':
+                kind = result['kind'] = detect_kind(path)
+            if kind == CONTRACHEQUE:
+                options = {'template': template, 'layout': layout}
+            else:
+                options = {'text_mode': text_mode}
+            result.update(PROCESSORS[kind](path, **options))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    if profiler:
+        result['profile'] = profiler.report()
+    return result
+
+
+def run_batch(paths, kind='auto', workers=None, profile=None, template=None, text_mode=TEXT_FULL,
+              layout=DEFAULT_LAYOUT):
+    """
+    Processa os arquivos em paralelo e produz os resultados na ordem de
+    `paths`, conforme ficam prontos.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for path in paths:
+            yield process_file(path, kind, profile, template, text_mode, layout)
+        return
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # map preserva a ordem de entrada; chunksize reduz o custo de IPC em lotes grandes
+        chunksize = max(1, min(32, len(paths) // (workers * 4)))
+        yield from pool.map(process_file, paths, [kind] * len(paths), [profile] * len(paths),
+                            [template] * len(paths), [text_mode] * len(paths), [layout] * len(paths),
+                            chunksize=chunksize)
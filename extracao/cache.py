@@ -0,0 +1,221 @@
+"""
+Cache de extração indexado pelo conteúdo do PDF.
+
+A chave combina o SHA-256 dos bytes enviados com a versão do motor
+(`PARSER_VERSION`) e as opções de extração, de forma que os reruns do
+Streamlit (edições no data_editor, multiselect, troca de página) não voltem a
+analisar o documento. Os resultados ficam em memória com despejo LRU e limite
+de tamanho e, opcionalmente, em um diretório local para sobreviver a novas
+sessões.
+
+Configuração por variáveis de ambiente:
+  - EXTRACAO_CACHE_MAX_MB: limite aproximado da memória usada (padrão 512)
+  - EXTRACAO_CACHE_DIR: diretório do armazenamento em disco (desativado se vazio)
+"""
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from extracao.engine import PARSER_VERSION, TEXT_FULL, count_pages, extract_document, iter_pages
+from extracao.parallel import default_workers, document_errors, extract_document_parallel
+
+
+def file_bytes(file):
+    """Lê os bytes de um caminho, buffer (ex.: UploadedFile do Streamlit) ou bytes."""
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return bytes(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        position = file.tell()
+        file.seek(0)
+        data = file.read()
+        file.seek(position)
+        return data
+    with open(file, 'rb') as f:
+        return f.read()
+
+
+def content_key(data, *options):
+    """Chave do cache: SHA-256 do conteúdo + versão do motor + opções."""
+    digest = hashlib.sha256(data).hexdigest()
+    return ":".join([digest, PARSER_VERSION, *options])
+
+
+class ExtractionCache:
+    """
+    Cache LRU em memória, limitado pelo tamanho aproximado (bytes serializados)
+    dos valores, com armazenamento opcional em disco.
+    Os valores devolvidos são compartilhados e não devem ser alterados.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()  # chave -> (valor, tamanho)
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        payload = self._read_disk(key)
+        if payload is None:
+            return None
+        value = pickle.loads(payload)
+        self._remember(key, value, len(payload))
+        return value
+
+    def put(self, key, value):
+        """
+        Guarda o valor. Retorna False se ele não pôde ser guardado (maior que o
+        limite inteiro da memória e sem armazenamento em disco).
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        remembered = self._remember(key, value, len(payload))
+        written = self._write_disk(key, payload)
+        return remembered or written
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key, value, size):
+        # Valores maiores que o limite inteiro não são mantidos em memória
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+        return True
+
+    def _disk_path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.pkl')
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key, payload):
+        if not self.directory:
+            return False
+        # Escrita atômica: grava em arquivo temporário e renomeia
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Cache do processo, compartilhado entre reruns e sessões do Streamlit."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_mb = int(os.environ.get('EXTRACAO_CACHE_MAX_MB', '512'))
+            _default_cache = ExtractionCache(
+                max_bytes=max_mb * 1024 * 1024,
+                directory=os.environ.get('EXTRACAO_CACHE_DIR') or None,
+            )
+        return _default_cache
+
+
+def document_key(data, text, tables, text_mode=TEXT_FULL):
+    # O modo de texto rápido muda o texto extraído, então entra na chave
+    options = [f"text={text}", f"tables={tables}"]
+    if text and text_mode != TEXT_FULL:
+        options.append(f"text_mode={text_mode}")
+    return content_key(data, *options)
+
+
+def cached_extract_document(file, text=True, tables=True, cache=None, workers=None, template=None,
+                            text_mode=TEXT_FULL):
+    """
+    Versão com cache de `extract_document`: o PDF só é analisado quando o
+    conteúdo (ou a versão do motor) ainda não foi visto. Com mais de um
+    processo (`workers` ou EXTRACAO_WORKERS) usa a extração paralela, cuja
+    saída é idêntica à serial; documentos com páginas que falharam não são
+    guardados no cache. O modelo de regiões (`template`) não muda o resultado
+    e por isso não faz parte da chave.
+    """
+    cache = cache or get_default_cache()
+    data = file_bytes(file)
+    key = document_key(data, text, tables, text_mode)
+    document = cache.get(key)
+    if document is not None:
+        return document
+
+    workers = workers or default_workers()
+    if workers > 1:
+        document = extract_document_parallel(data, text=text, tables=tables, workers=workers, template=template,
+                                             text_mode=text_mode)
+    else:
+        document = extract_document(io.BytesIO(data), text=text, tables=tables, template=template,
+                                    text_mode=text_mode)
+    if not document_errors(document):
+        cache.put(key, document)
+    return document
+
+
+def stream_document_pages(file, text=True, tables=True, cache=None, keep=True, workers=None, template=None,
+                          text_mode=TEXT_FULL):
+    """
+    Versão incremental de `cached_extract_document`.
+    Retorna (num_pages, páginas), onde `páginas` é um gerador. Se o documento
+    já estiver no cache as páginas vêm dele; caso contrário são lidas uma a uma
+    do PDF. Com `keep=False` nada é acumulado, e a memória de pico fica
+    limitada à página corrente. Com `keep=True` o documento completo vai para
+    o cache ao final. Com mais de um processo configurado a extração é feita
+    em paralelo (documento inteiro) e as páginas são servidas a partir dela.
+    """
+    cache = cache or get_default_cache()
+    if (workers or default_workers()) > 1:
+        document = cached_extract_document(file, text=text, tables=tables, cache=cache, workers=workers,
+                                           template=template, text_mode=text_mode)
+        return document['num_pages'], iter(document['pages'])
+    data = file_bytes(file)
+    key = document_key(data, text, tables, text_mode)
+    document = cache.get(key)
+    if document is not None:
+        return document['num_pages'], iter(document['pages'])
+
+    def generate():
+        pages = [] if keep else None
+        for page in iter_pages(io.BytesIO(data), text=text, tables=tables, template=template,
+                               text_mode=text_mode):
+            if keep:
+                pages.append(page)
+            yield page
+        if keep:
+            cache.put(key, {'num_pages': len(pages), 'pages': pages})
+
+    return count_pages(io.BytesIO(data)), generate()
@@ -0,0 +1,173 @@
+"""
+Linha de comando para processar pastas de PDFs sem Streamlit.
+
+Exemplos:
+    python -m extracao contracheques/ -o contracheques.csv
+    python -m extracao "fichas/**/*.pdf" --tipo ficha -j 8 -o fichas.parquet --relatorio relatorio.json
+    python -m extracao contracheques/ -o saida.csv --salvar-modelo-tabela modelo.json
+    python -m extracao outros/ -o outros.csv --modelo-tabela modelo.json
+    python -m extracao outros/ -o outros.csv --tipo contracheque --layout layout.json
+
+Saídas .csv, .parquet e .arrow são gravadas de forma incremental, conforme os
+arquivos são processados; .xlsx exige montar a planilha inteira em memória.
+"""
+import argparse
+import json
+import sys
+import time
+
+from extracao.batch import expand_inputs, run_batch
+from extracao.export import format_from_path, open_writer, write_excel
+from extracao.engine import TEXT_FAST, TEXT_FULL
+from extracao.pipeline import CONTRACHEQUE, FICHA, output_columns
+from extracao.profiling import DEEP_PROFILERS, Profiler, merge_stage_reports
+from extracao.regions import learn_template, load_template, save_template
+from extracao.tables import DEFAULT_LAYOUT, load_layout
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m extracao',
+        description="Extrai os dados de contracheques e fichas completas em lote.",
+    )
+    parser.add_argument('entradas', nargs='+', help="arquivos PDF, pastas ou padrões glob")
+    parser.add_argument('-o', '--saida', required=True,
+                        help="arquivo consolidado (.csv, .parquet, .arrow ou .xlsx)")
+    parser.add_argument('--tipo', choices=['auto', CONTRACHEQUE, FICHA], default='auto',
+                        help="tipo dos documentos (padrão: detecta pela primeira página)")
+    parser.add_argument('-j', '--processos', type=int, default=None,
+                        help="número de processos (padrão: número de CPUs)")
+    parser.add_argument('--relatorio', help="grava o tempo e as falhas de cada arquivo em JSON")
+    parser.add_argument('--modelo-tabela', default='auto',
+                        help="modelo de regiões das tabelas dos contracheques: 'auto' (aprende com a "
+                             "primeira página de cada arquivo), 'nenhum' ou um modelo salvo (.json)")
+    parser.add_argument('--salvar-modelo-tabela', metavar='ARQUIVO',
+                        help="aprende o modelo com o primeiro PDF das entradas, grava em JSON e o usa no lote")
+    parser.add_argument('--layout', metavar='ARQUIVO',
+                        help="layout dos contracheques em JSON, com os rótulos a acrescentar ao padrão "
+                             "(mesmas chaves de extracao.tables.DEFAULT_SPEC)")
+    parser.add_argument('--texto-rapido', action='store_true',
+                        help="fichas: extrai o texto no modo rápido (sem a análise de layout completa)")
+    parser.add_argument('--perfil', help="grava o tempo, CPU e memória por etapa e por página em JSON")
+    parser.add_argument('--perfil-memoria', action='store_true',
+                        help="mede o pico de memória por etapa (tracemalloc; mais lento)")
+    parser.add_argument('--perfil-detalhado', choices=DEEP_PROFILERS,
+                        help="anexa ao perfil o relatório do cProfile ou do pyinstrument")
+    return parser
+
+
+class ExcelOutput:
+    """Saída .xlsx: acumula os registros e grava a planilha ao final."""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self.rows = []
+
+    def append(self, rows):
+        self.rows.extend(rows)
+
+    def close(self):
+        import pandas as pd
+        write_excel(pd.DataFrame(self.rows, columns=self.columns), self.path)
+
+
+def open_output(path, columns):
+    fmt = format_from_path(path)
+    if fmt == 'xlsx':
+        return ExcelOutput(path, columns)
+    return open_writer(fmt, path, columns)
+
+
+def resolve_template(args, paths):
+    """Opção de modelo de regiões repassada ao lote (ver extracao.regions.table_extractor)."""
+    if args.salvar_modelo_tabela:
+        template = learn_template(paths[0])
+        if template is None:
+            raise ValueError(f"nenhuma tabela encontrada em {paths[0]}")
+        save_template(template, args.salvar_modelo_tabela)
+        print(f"Modelo de tabela gravado em {args.salvar_modelo_tabela}", file=sys.stderr)
+        return template
+    if args.modelo_tabela == 'nenhum':
+        return None
+    if args.modelo_tabela == 'auto':
+        return 'auto'
+    return load_template(args.modelo_tabela)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = expand_inputs(args.entradas)
+    if not paths:
+        print("Nenhum PDF encontrado nas entradas informadas.", file=sys.stderr)
+        return 2
+
+    try:
+        template = resolve_template(args, paths)
+    except (OSError, ValueError) as e:
+        print(f"Modelo de tabela: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        layout = load_layout(args.layout) if args.layout else DEFAULT_LAYOUT
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Layout: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        output = open_output(args.saida, ['Arquivo', 'Tipo'] + output_columns(args.tipo, layout))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    profile = None
+    if args.perfil:
+        profile = {'track_memory': args.perfil_memoria, 'deep': args.perfil_detalhado}
+    # Etapas do processo principal (escrita da saída consolidada)
+    main_profiler = Profiler(track_memory=args.perfil_memoria)
+
+    start = time.perf_counter()
+    total_records = 0
+    report = []
+    profiles = []
+    text_mode = TEXT_FAST if args.texto_rapido else TEXT_FULL
+    results = run_batch(paths, args.tipo, args.processos, profile, template, text_mode, layout)
+    for n, result in enumerate(results, start=1):
+        if 'profile' in result:
+            profiles.append({'file': result['file'], **result.pop('profile')})
+        rows = result.pop('rows')
+        with main_profiler.stage("escrita da saída"):
+            output.append([{'Arquivo': result['file'], 'Tipo': result['kind'], **row} for row in rows])
+        total_records += len(rows)
+        report.append({**result, 'records': len(rows)})
+        if result['error']:
+            status = f"ERRO {result['error']}"
+        else:
+            status = f"{result['num_pages']} páginas, {len(rows)} registros"
+        print(f"[{n}/{len(paths)}] {result['file']}: {status} ({result['seconds']:.2f}s)", file=sys.stderr)
+
+    with main_profiler.stage("escrita da saída"):
+        output.close()
+    elapsed = time.perf_counter() - start
+    failures = [item for item in report if item['error']]
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as f:
+            json.dump({
+                'files': report,
+                'total_files': len(paths),
+                'failed_files': len(failures),
+                'total_pages': sum(item['num_pages'] for item in report),
+                'total_records': total_records,
+                'seconds': elapsed,
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.perfil:
+        with open(args.perfil, 'w', encoding='utf-8') as f:
+            stages = merge_stage_reports(profiles + [main_profiler.report(include_pages=False)])
+            json.dump({'stages': stages, 'files': profiles},
+                      f, ensure_ascii=False, indent=2)
+
+    print(f"{len(paths)} arquivos, {total_records} registros, {len(failures)} falhas em {elapsed:.1f}s "
+          f"-> {args.saida}", file=sys.stderr)
+    return 1 if failures else 0
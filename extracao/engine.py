@@ -0,0 +1,116 @@
+"""
+Motor de leitura de páginas.
+
+Abre o PDF uma única vez e, para cada página, executa a análise de layout do
+pdfminer uma só vez, reaproveitando-a para o texto, as tabelas e os metadados.
+"""
+from extracao.profiling import stage
+
+# Modos de extração de texto (opção `text_mode`; ver extracao.fasttext)
+TEXT_FULL = 'completo'
+TEXT_FAST = 'rapido'
+TEXT_MODES = (TEXT_FULL, TEXT_FAST)
+
+# Versão do formato produzido pelo motor. Deve ser incrementada sempre que a
+# saída de `read_page` mudar, pois faz parte da chave do cache de extração.
+PARSER_VERSION = "1"
+
+
+def read_page(page, text=True, tables=True, extractor=None, text_mode=TEXT_FULL):
+    """
+    Lê uma página já aberta e devolve um dicionário com:
+      - page_number, width, height: metadados da página
+      - text: texto extraído ("" quando a página não tem texto)
+      - tables: lista de tabelas (cada tabela é uma lista de linhas)
+    O texto e as tabelas usam o mesmo cache de caracteres da página,
+    de modo que o layout é analisado apenas uma vez. Com `extractor`
+    (ver extracao.regions.table_extractor) as tabelas saem do modelo de
+    regiões do documento. Com text_mode=TEXT_FAST o texto sai do modo rápido
+    (ver extracao.fasttext), que dispensa a análise de layout quando as
+    tabelas não são pedidas.
+    """
+    data = {
+        'page_number': page.page_number,
+        'width': float(page.width),
+        'height': float(page.height),
+        'text': None,
+        'tables': [],
+    }
+    page_number = page.page_number
+    fast = text and text_mode == TEXT_FAST
+    if tables or not fast:
+        with stage("layout (pdfminer)", page_number):
+            page.chars  # dispara a análise de layout, reaproveitada pelas etapas abaixo
+    if fast:
+        from extracao.fasttext import fast_text
+        with stage("extract_text (rápido)", page_number):
+            data['text'] = fast_text(page, use_layout=tables)
+    elif text:
+        with stage("extract_text", page_number):
+            data['text'] = page.extract_text() or ""
+    if tables and extractor is not None:
+        data['tables'] = extractor.extract_tables(page)
+    elif tables:
+        with stage("extract_tables", page_number):
+            data['tables'] = page.extract_tables() or []
+    return data
+
+
+def iter_pages(file, text=True, tables=True, template=None, text_mode=TEXT_FULL):
+    """
+    Percorre o PDF em uma única passada, produzindo um dicionário por página
+    (ver `read_page`). O cache de layout de cada página é liberado assim que
+    ela é processada, para não acumular memória em documentos grandes.
+    `template` ativa o modelo de regiões nas tabelas: "auto" (aprende com a
+    primeira página), um TableTemplate ou o caminho de um modelo salvo.
+    `text_mode` escolhe o modo de texto do documento (ver extracao.fasttext).
+    """
+    if text_mode not in TEXT_MODES:
+        raise ValueError(f"Modo de texto desconhecido: {text_mode}")
+    extractor = None
+    if tables and template is not None:
+        # Modelo de regiões carregado só quando usado
+        from extracao.regions import table_extractor
+        extractor = table_extractor(template)
+    with stage("abertura do PDF"):
+        pdf = open_pdf(file)
+    with pdf:
+        for page in pdf.pages:
+            try:
+                yield read_page(page, text=text, tables=tables, extractor=extractor, text_mode=text_mode)
+            finally:
+                page.close()
+
+
+def open_pdf(file, **options):
+    """
+    pdfplumber.open, com o pdfplumber importado no primeiro uso: as
+    aplicações carregam sem ele e só o importam ao receber um PDF.
+    """
+    import pdfplumber
+    return pdfplumber.open(file, **options)
+
+
+def count_pages(file):
+    # Lê apenas a árvore de páginas, sem análise de layout
+    with open_pdf(file) as pdf:
+        return len(pdf.pages)
+
+
+def extract_document(file, text=True, tables=True, template=None, text_mode=TEXT_FULL):
+    """
+    Extrai o documento inteiro em uma só abertura do arquivo.
+    Retorna {'num_pages': int, 'pages': [dict por página]}.
+    """
+    pages = list(iter_pages(file, text=text, tables=tables, template=template, text_mode=text_mode))
+    return {'num_pages': len(pages), 'pages': pages}
+
+
+def document_text(document):
+    # Junta o texto das páginas não vazias, como fazia o extract_pdf_text original
+    return "\n".join(page['text'] for page in document['pages'] if page['text'])
+
+
+def document_tables(document):
+    # Lista plana com todas as tabelas, na ordem das páginas
+    return [table for page in document['pages'] for table in page['tables']]
@@ -0,0 +1,214 @@
+"""
+Camada de exportação dos dados extraídos.
+
+Dois caminhos:
+  - `export_dataframe(df, formato)`: gera os bytes de um DataFrame já montado
+    (usado pelos botões de download, sob demanda).
+  - Escritores incrementais (`open_writer`): recebem os registros conforme
+    são extraídos e gravam em blocos (row groups no Parquet, record batches
+    no Arrow IPC, linhas no CSV), sem montar o DataFrame inteiro em memória.
+
+Parquet e Arrow dependem do pyarrow e o Excel do XlsxWriter (o mais rápido
+dos escritores do pandas, cerca de 2x o openpyxl), importados apenas quando
+usados.
+
+Vazão medida com `python -m benchmarks.bench_export 100000` (100 mil
+contracheques, 23 colunas, 1 núcleo):
+
+    formato   em memória (registros/s)   incremental (registros/s)   tamanho
+    xlsx              ~2.700                     -                    8 MB
+    txt               ~8.000                     -                   65 MB
+    csv              ~66.000                  ~98.000                34 MB
+    parquet       ~1.000.000                 ~160.000               1-2 MB
+    arrow         ~1.300.000                 ~175.000              40-49 MB
+
+No modo incremental o custo é dominado pela conversão dos dicionários em
+colunas; ainda assim fica bem acima da vazão da extração dos PDFs.
+"""
+import csv
+import io
+import math
+
+FORMATS = {
+    'xlsx': {'label': "Excel (XLSX)", 'extension': 'xlsx',
+             'mime': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+    'csv': {'label': "CSV", 'extension': 'csv', 'mime': "text/csv"},
+    'parquet': {'label': "Parquet", 'extension': 'parquet', 'mime': "application/vnd.apache.parquet"},
+    'arrow': {'label': "Arrow IPC", 'extension': 'arrow', 'mime': "application/vnd.apache.arrow.file"},
+    'txt': {'label': "Texto (TXT)", 'extension': 'txt', 'mime': "text/plain"},
+}
+
+# Registros acumulados antes de gravar um bloco nos escritores incrementais
+ROW_GROUP_SIZE = 10000
+
+# Escritor de Excel do pandas, o mesmo nos downloads e no lote (requirements.txt)
+EXCEL_ENGINE = "xlsxwriter"
+
+
+def format_from_path(path):
+    """Formato de saída pela extensão do arquivo (.csv, .parquet, .arrow/.feather/.ipc, .xlsx)."""
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension in ('feather', 'ipc'):
+        return 'arrow'
+    if extension not in FORMATS:
+        raise ValueError(f"Formato de saída não suportado: .{extension}")
+    return extension
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("A exportação em Parquet/Arrow requer o pacote pyarrow") from e
+    return pyarrow
+
+
+def write_excel(df, target):
+    """Grava o DataFrame em uma planilha "Dados" (`target`: caminho ou arquivo binário)."""
+    import pandas as pd
+    with pd.ExcelWriter(target, engine=EXCEL_ENGINE) as writer:
+        df.to_excel(writer, index=False, sheet_name="Dados")
+
+
+def export_dataframe(df, fmt):
+    """Serializa o DataFrame no formato pedido e devolve os bytes."""
+    if fmt == 'xlsx':
+        buffer = io.BytesIO()
+        write_excel(df, buffer)
+        return buffer.getvalue()
+    if fmt == 'csv':
+        return df.to_csv(index=False).encode('utf-8')
+    if fmt == 'txt':
+        return df.to_string(index=False).encode('utf-8')
+    if fmt == 'parquet':
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False, engine='pyarrow')
+        return buffer.getvalue()
+    if fmt == 'arrow':
+        pa = _pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+
+def _text(value):
+    # Os campos extraídos são texto; ausentes (None/NaN) viram nulos
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+class _RowWriter:
+    """Base dos escritores incrementais: acumula registros e grava em blocos."""
+
+    def __init__(self, sink, columns, row_group_size=ROW_GROUP_SIZE):
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._pending = []
+        self._owns_sink = isinstance(sink, str)
+        self._sink = open(sink, 'wb') if self._owns_sink else sink
+
+    def append(self, rows):
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._write(self._pending)
+            self.rows_written += len(self._pending)
+            self._pending = []
+
+    def close(self):
+        self.flush()
+        self._finish()
+        if self._owns_sink:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _columnar(self, rows):
+        return {column: [_text(row.get(column)) for row in rows] for column in self.columns}
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+class CsvWriter(_RowWriter):
+    def __init__(self, sink, columns, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(sink, columns, row_group_size)
+        self._text_stream = io.TextIOWrapper(self._sink, encoding='utf-8', newline='', write_through=True)
+        self._writer = csv.writer(self._text_stream)
+        self._writer.writerow(self.columns)
+
+    def _write(self, rows):
+        columns = self.columns
+        self._writer.writerows([[row.get(column) for column in columns] for row in rows])
+
+    def _finish(self):
+        self._text_stream.flush()
+        self._text_stream.detach()
+
+
+class ParquetWriter(_RowWriter):
+    """Cada bloco gravado vira um row group do arquivo Parquet."""
+
+    def __init__(self, sink, columns, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(sink, columns, row_group_size)
+        self._pa = _pyarrow()
+        self._schema = self._pa.schema([(column, self._pa.string()) for column in self.columns])
+        self._writer = self._pa.parquet.ParquetWriter(self._sink, self._schema)
+
+    def _write(self, rows):
+        table = self._pa.Table.from_pydict(self._columnar(rows), schema=self._schema)
+        self._writer.write_table(table)
+
+    def _finish(self):
+        self._writer.close()
+
+
+class ArrowWriter(_RowWriter):
+    """Arquivo Arrow IPC (Feather v2); cada bloco vira um record batch."""
+
+    def __init__(self, sink, columns, row_group_size=ROW_GROUP_SIZE):
+        super().__init__(sink, columns, row_group_size)
+        self._pa = _pyarrow()
+        self._schema = self._pa.schema([(column, self._pa.string()) for column in self.columns])
+        self._writer = self._pa.ipc.new_file(self._sink, self._schema)
+
+    def _write(self, rows):
+        batch = self._pa.RecordBatch.from_pydict(self._columnar(rows), schema=self._schema)
+        self._writer.write_batch(batch)
+
+    def _finish(self):
+        self._writer.close()
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowWriter,
+}
+
+
+def open_writer(fmt, sink, columns, row_group_size=ROW_GROUP_SIZE):
+    """
+    Abre um escritor incremental (csv, parquet ou arrow) sobre um caminho ou
+    stream binário. As colunas precisam ser conhecidas de antemão.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Formato sem escrita incremental: {fmt}")
+    return WRITERS[fmt](sink, columns, row_group_size)
@@ -0,0 +1,111 @@
+"""
+Modo de texto rápido para documentos só de texto (Ficha Completa).
+
+No modo completo, `page.chars` converte cada caractere do pdfminer em um
+dicionário com todos os atributos (cores, estado gráfico, matriz etc.) e o
+`extract_text` ainda agrupa os caracteres em palavras e linhas. Para os
+campos rotulados do parse_page_1 basta a posição e o texto de cada
+caractere. Aqui o interpretador do pdfminer alimenta um dispositivo mínimo,
+que guarda só (topo, x0, x1, texto), e as linhas são remontadas com uma
+passada de agrupamento por y.
+
+O resultado é próximo do `extract_text` (mesmas tolerâncias de 3 pontos
+para separar palavras e linhas), mas não idêntico em todos os casos, por
+isso o modo é opcional e escolhido por documento. A comparação com o modo
+completo está em benchmarks/bench_fasttext.py.
+
+Os modos de texto (TEXT_FULL, TEXT_FAST) ficam em extracao.engine, que só
+importa este módulo (e o interpretador do pdfminer) quando o modo rápido é usado.
+"""
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.utils import apply_matrix_pt
+
+# Mesmas tolerâncias padrão do extract_text do pdfplumber
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+class _CharCollector(PDFTextDevice):
+    """Dispositivo do pdfminer que só registra a caixa e o texto de cada caractere."""
+
+    def __init__(self, rsrcmgr, page_height):
+        super().__init__(rsrcmgr)
+        self.page_height = page_height
+        self.chars = []
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = "(cid:%d)" % cid
+        # Mesma geometria do LTChar (texto horizontal)
+        adv = font.char_width(cid) * fontsize * scaling
+        descent = font.get_descent() * fontsize
+        x0, y0 = apply_matrix_pt(matrix, (0, descent + rise))
+        x1, y1 = apply_matrix_pt(matrix, (adv, descent + rise + fontsize))
+        if x1 < x0:
+            x0, x1 = x1, x0
+        self.chars.append((self.page_height - max(y0, y1), x0, x1, text))
+        return adv
+
+
+def page_chars(page):
+    """(topo, x0, x1, texto) de cada caractere, direto do interpretador do pdfminer."""
+    device = _CharCollector(page.pdf.rsrcmgr, float(page.height))
+    PDFPageInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+    return device.chars
+
+
+def build_text(chars, x_tolerance=X_TOLERANCE, y_tolerance=Y_TOLERANCE):
+    """
+    Remonta o texto a partir de (topo, x0, x1, texto): caracteres cujos topos
+    distam até `y_tolerance` formam uma linha; dentro da linha, um espaço é
+    inserido nos caracteres em branco ou em saltos maiores que `x_tolerance`.
+    """
+    lines = []
+    current = []
+    last_top = None
+    for char in sorted(chars):
+        if current and char[0] - last_top > y_tolerance:
+            lines.append(current)
+            current = []
+        current.append(char)
+        last_top = char[0]
+    if current:
+        lines.append(current)
+
+    output = []
+    for line in lines:
+        line.sort(key=lambda char: char[1])
+        parts = []
+        prev_x1 = None
+        space = False
+        for _, x0, x1, text in line:
+            if text.isspace():
+                space = True
+                continue
+            if parts and (space or x0 > prev_x1 + x_tolerance):
+                parts.append(" ")
+            parts.append(text)
+            prev_x1 = x1
+            space = False
+        if parts:
+            output.append("".join(parts))
+    return "\n".join(output)
+
+
+def layout_chars(page):
+    # Caracteres já analisados pelo pdfplumber, no formato do modo rápido
+    return [(char['top'], char['x0'], char['x1'], char['text']) for char in page.chars]
+
+
+def fast_text(page, use_layout=False):
+    """
+    Texto da página no modo rápido. Com `use_layout=True` reaproveita
+    `page.chars`, quando a análise do pdfplumber já foi feita de qualquer
+    forma (ex.: porque as tabelas também foram pedidas).
+    """
+    chars = layout_chars(page) if use_layout else page_chars(page)
+    return build_text(chars)
@@ -0,0 +1,103 @@
+"""
+Extração dos campos rotulados da Ficha Completa.
+
+Os padrões são compilados uma única vez, na importação do módulo, em vez de
+o dicionário ser remontado (e consultado no cache do `re`) a cada página.
+"""
+import re
+from collections import namedtuple
+
+# Padrão completo de cada campo (o grupo 1 é o valor extraído)
+FIELD_PATTERNS = {
+    "Nome": r'Nome:\s*([^\n]+)',
+    "Matrícula": r'Matr[ií]cula:\s*(\d+)',
+    "CPF": r'C\.P\.F:\s*([\d\.\-]+)',
+    "RG": r'RG:\s*([\w\/\.\-]+)',
+    "Data de Nascimento": r'Data Nasc(?:\.|imento):\s*([\d\/]+)',
+    "Data de Admissão": r'Data Adm(?:\.|issão):\s*([\d\/]+)',
+    "Cargo": r'Cargo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+    "Vínculo": r'V[ií]nculo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+    "PIS/PASEP": r'PIS/PASEP:\s*([\d\.\-]+)',
+    "Sexo": r'Sexo:\s*([MF])',
+    "Estado Civil": r'Estado Civil:\s*([^\n]+?)(?=\s+N[ií]vel Instru[cç][ãa]o:|$)',
+    "Nível de Instrução": r'N[ií]vel Instru[cç][ãa]o:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+    "Órgão": r'Órgão\s*([\d]+\s*-\s*[^\n]+)(?=\s+Regime:|$)',
+    "Regime": r'Regime:\s*([^\n]+?)(?=\s+(?:Regime Prev\.|Lotação|[A-Z][\w\s/\.]+:)|$)',
+    "Lotação": r'Lotação\s*([\d]+\s*-\s*[^\n]+)',
+    "Regime Prev.": r'Regime Prev\.:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
+    "Pai": r'Pai:\s*([^\n]+)(?=\s+M[ãa]e:|$)',
+    "Mãe": r'M[ãa]e:\s*([^\n]+)',
+    "Cônjugue": r'C[ôo]njugue:\s*([^\n]+)(?=\s+Data Nascimento:|$)',
+    "Rua/Av": r'Rua/Av:\s*([^\n]+)(?=\s+Número:|$)',
+    "Número": r'Número:\s*([^\n]+)(?=\s+Bairro:|$)',
+    # Bairro: captura até encontrar "Cidade:" ou o fim da linha
+    "Bairro": r'Bairro:\s*([^\n]+?)(?=\s+Cidade:|$)',
+    # Cidade: captura até encontrar "UF:" ou o fim da linha
+    "Cidade": r'Cidade:\s*([^\n]+?)(?=\s+UF:|$)',
+    "UF": r'UF:\s*([A-Z]{2})(?!\w)',
+    "C.E.P": r'C\.E\.P:\s*([\d\.\-]+)',
+    "Telefone": r'Telefone:\s*([\d]+)',
+    "Nº Dependentes Sal. Família": r'Nº Dependentes Sal\. Família:\s*(\d+)',
+    "Nº Dependentes IRRF": r'Nº Dependentes IRRF:\s*(\d+)',
+    "Dependentes": r'Nome dos Dependentes Sal\. Família:\s*([^\n]+)(?=\s+Data Nascimento:|$)'
+}
+
+# Tabela compilada na importação: (campo, padrão). Cada padrão começa por um
+# rótulo literal, que o motor do `re` usa para saltar direto às ocorrências
+# do rótulo em vez de testar cada posição do texto.
+_COMPILED_FIELDS = [(field, re.compile(pattern)) for field, pattern in FIELD_PATTERNS.items()]
+
+# Nome da identificação: só na linha do rótulo ("Nome:" em branco não leva a linha seguinte)
+_IDENTITY_NAME_PATTERN = re.compile(r"Nome:[ \t]*([^\n]*)")
+_MATRICULA_PATTERN = re.compile(FIELD_PATTERNS["Matrícula"])
+_CPF_PATTERN = re.compile(FIELD_PATTERNS["CPF"])
+# Outros rótulos na mesma linha do nome ("Nome: FULANO Matrícula: 123"),
+# inclusive logo após o rótulo quando o nome está em branco ("Nome: Matrícula: 123")
+_NAME_END = re.compile(r"\s*Matr[ií]cula:.*")
+
+
+def extract_fields(text):
+    """
+    Extrai os campos rotulados de uma página: para cada campo vale a primeira
+    ocorrência que casa com o padrão, como no `re.search` original.
+    """
+    data = {}
+    for field, pattern in _COMPILED_FIELDS:
+        match = pattern.search(text)
+        if match:
+            data[field] = match.group(1).strip()
+    return data
+
+
+class Identity(namedtuple('Identity', ['matricula', 'cpf', 'nome'])):
+    """Identificação do funcionário em uma página (campos ausentes são None)."""
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Chave do funcionário pelo identificador mais forte: matrícula, CPF ou nome."""
+        if self.matricula:
+            return f"matrícula:{self.matricula}"
+        if self.cpf:
+            return f"cpf:{self.cpf}"
+        return f"nome:{self.nome}"
+
+
+def extract_identity(text):
+    """
+    Matrícula, CPF e nome da página; None quando a página não tem nenhum deles
+    (ou só tem rótulos em branco, como "Nome:").
+    """
+    matricula = _MATRICULA_PATTERN.search(text)
+    cpf = _CPF_PATTERN.search(text)
+    name = _IDENTITY_NAME_PATTERN.search(text)
+    if not (matricula or cpf or name):
+        return None
+    identity = Identity(
+        matricula.group(1) if matricula else None,
+        cpf.group(1).strip() or None if cpf else None,
+        _NAME_END.sub('', name.group(1)).strip() or None if name else None,
+    )
+    if not any(identity):
+        return None
+    return identity
@@ -0,0 +1,114 @@
+"""
+Agrupamento das páginas da Ficha Completa por funcionário.
+
+Cada página é identificada pela matrícula, pelo CPF ou, na falta dos dois,
+pelo nome (ver extracao.fields.extract_identity). O funcionário é procurado
+pelo identificador mais forte da página, em dicionários (custo constante por
+página), e os identificadores mais fracos ficam registrados como apelidos:
+uma página que só traz o CPF ou o nome se junta ao funcionário que já
+apareceu com a matrícula. Duas matrículas com o mesmo CPF continuam
+separadas (vínculos diferentes).
+
+Páginas sem nenhuma identificação são páginas de continuação e pertencem ao
+funcionário da página anterior; páginas que não puderam ser lidas (ver
+extracao.parallel) ficam de fora, com um aviso, em vez de virarem
+continuação. Os avisos são registros estruturados (página, aviso, detalhe),
+para serem resumidos em uma única tabela.
+"""
+from extracao.profiling import stage
+
+# Tipos de aviso
+NO_IDENTITY = "página sem identificação"
+IDENTITY_ERROR = "erro ao identificar a página"
+PARSE_ERROR = "erro ao processar a página"
+READ_ERROR = "erro ao ler a página"
+
+
+def page_warning(page_number, kind, detail=""):
+    return {'Página': page_number, 'Aviso': kind, 'Detalhe': detail}
+
+
+def readable_pages(pages, warnings):
+    """Repassa as páginas lidas sem erro; as que falharam na extração viram avisos."""
+    for page in pages:
+        error = page.get('error')
+        if error:
+            warnings.append(page_warning(page['page_number'], READ_ERROR, error))
+            continue
+        yield page
+
+
+def has_read_errors(warnings):
+    # Resultados com páginas não lidas ficam fora do cache (ver extracao.ui.background_result)
+    return any(warning['Aviso'] == READ_ERROR for warning in warnings)
+
+
+def summarize_warnings(warnings):
+    """Quantidade de avisos por tipo, com a primeira e a última página de cada um."""
+    summary = {}
+    for warning in warnings:
+        item = summary.setdefault(warning['Aviso'], {'Aviso': warning['Aviso'], 'Páginas': 0,
+                                                     'Primeira': warning['Página'], 'Última': warning['Página']})
+        item['Páginas'] += 1
+        item['Última'] = warning['Página']
+    return list(summary.values())
+
+
+class EmployeeGrouper:
+    """Resolve a identificação de cada página (na ordem do documento) para a chave do funcionário."""
+
+    def __init__(self):
+        self._aliases = {}  # (campo, valor) -> chave do funcionário
+        self.current = None
+        self.continuations = 0
+
+    def resolve(self, identity):
+        """
+        Chave do funcionário da página. Sem identificação (`identity` None), a
+        página continua o funcionário anterior; antes do primeiro, devolve None.
+        """
+        if identity is None:
+            if self.current is not None:
+                self.continuations += 1
+            return self.current
+        aliases = [(field, value) for field, value in zip(identity._fields, identity) if value]
+        # Busca só pelo identificador mais forte: matrículas diferentes com o mesmo
+        # CPF ou nome são funcionários (vínculos) diferentes
+        key = self._aliases.get(aliases[0])
+        if key is None:
+            key = identity.key
+        for alias in aliases:
+            self._aliases.setdefault(alias, key)
+        self.current = key
+        return key
+
+
+def group_pages(pages, identity_func, warnings, grouper=None):
+    """
+    Agrupa páginas consecutivas do mesmo funcionário, produzindo (chave,
+    [(número da página, texto)]) assim que o funcionário muda, sem manter o restante
+    do documento em memória. `identity_func` devolve a Identity da página (ou
+    None). Páginas de continuação entram no grupo anterior; as que não puderam
+    ser atribuídas vão para `warnings`.
+    """
+    grouper = EmployeeGrouper() if grouper is None else grouper
+    current_key = None
+    current_pages = []
+    for page in pages:
+        page_number = page['page_number']
+        try:
+            with stage("agrupamento", page_number):
+                key = grouper.resolve(identity_func(page['text']))
+        except Exception as e:
+            warnings.append(page_warning(page_number, IDENTITY_ERROR, str(e)))
+            continue
+        if key is None:
+            warnings.append(page_warning(page_number, NO_IDENTITY, "antes do primeiro funcionário"))
+            continue
+        if key != current_key and current_pages:
+            yield current_key, current_pages
+            current_pages = []
+        current_key = key
+        current_pages.append((page_number, page['text']))
+    if current_pages:
+        yield current_key, current_pages
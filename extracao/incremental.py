@@ -0,0 +1,270 @@
+"""
+Reprocessamento incremental da Ficha Completa.
+
+Todo mês o RH reenvia o PDF completo com poucos funcionários alterados. Cada
+página recebe uma impressão digital (SHA-256 do que ela desenha: os fluxos de
+conteúdo e os recursos usados, como fontes e tabelas ToUnicode), e um índice
+local guarda, por impressão digital, a identificação do funcionário
+(matrícula, CPF e nome; ver extracao.grouping) e os campos do parse_page_1. Em um novo envio só as páginas com impressão digital
+desconhecida passam pela extração de texto e pelo parse; as demais vêm do
+índice, e o tempo de processamento fica proporcional às mudanças.
+
+Os programas de fonte embutidos e o prefixo de subconjunto do nome das
+fontes ("ABCDEF+Arial") não entram na impressão digital, pois mudam a cada
+geração do PDF sem mudar o texto.
+
+O índice é um banco SQLite local.
+Configuração por variável de ambiente:
+  - EXTRACAO_INDICE: arquivo do índice (padrão ~/.cache/extracao/indice_paginas.sqlite3)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+from extracao.engine import PARSER_VERSION, TEXT_FULL, open_pdf, read_page
+from extracao.fields import Identity, extract_fields, extract_identity
+from extracao.grouping import IDENTITY_ERROR, NO_IDENTITY, PARSE_ERROR, READ_ERROR, EmployeeGrouper, page_warning
+from extracao.profiling import stage
+
+# Deve ser incrementada quando o formato do índice ou os campos extraídos
+# (extracao.fields) mudarem, invalidando as entradas antigas.
+INDEX_VERSION = "3"
+
+STATUS_NEW = 'novo'
+STATUS_CHANGED = 'alterado'
+STATUS_UNCHANGED = 'sem alteração'
+
+# Chaves que não mudam o texto da página
+_IGNORED_KEYS = frozenset(('FontFile', 'FontFile2', 'FontFile3', 'Length', 'Filter', 'DecodeParms', 'Parent'))
+_SUBSET_PREFIX = re.compile(r'^[A-Z]{6}\+')
+
+
+def default_index_path():
+    return os.environ.get('EXTRACAO_INDICE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'extracao', 'indice_paginas.sqlite3')
+
+
+def _object_digest(obj, memo):
+    # Resumo de um objeto PDF; objetos indiretos são resumidos uma vez por documento
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+    from pdfminer.psparser import PSLiteral
+
+    if isinstance(obj, PDFObjRef):
+        if obj.objid not in memo:
+            memo[obj.objid] = b''  # evita ciclos
+            memo[obj.objid] = _object_digest(obj.resolve(), memo)
+        return memo[obj.objid]
+    digest = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        digest.update(b'S')
+        digest.update(_object_digest(obj.attrs, memo))
+        digest.update(obj.get_data())
+    elif isinstance(obj, dict):
+        digest.update(b'D')
+        for key in sorted(obj):
+            if key not in _IGNORED_KEYS:
+                digest.update(key.encode('utf-8', 'replace'))
+                digest.update(_object_digest(obj[key], memo))
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'L')
+        for item in obj:
+            digest.update(_object_digest(item, memo))
+    elif isinstance(obj, PSLiteral):
+        digest.update(b'N')
+        digest.update(_SUBSET_PREFIX.sub('', str(obj.name)).encode('utf-8', 'replace'))
+    else:
+        digest.update(repr(obj).encode('utf-8', 'replace'))
+    return digest.digest()
+
+
+def page_fingerprint(page, namespace="", memo=None):
+    """
+    Impressão digital de uma página do pdfplumber (sem análise de layout).
+    `namespace` separa resultados de configurações diferentes (ex.: o modo de
+    texto) e `memo` reaproveita o resumo dos recursos compartilhados entre as
+    páginas do mesmo documento.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    memo = {} if memo is None else memo
+    page_obj = page.page_obj
+    digest = hashlib.sha256(namespace.encode('utf-8'))
+    for stream in page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+    digest.update(_object_digest(page_obj.resources, memo))
+    return digest.hexdigest()
+
+
+class PageIndex:
+    """
+    Índice local impressão digital -> (identificação, campos). As páginas novas ficam
+    pendentes até `flush()`, de modo que, durante a execução, as consultas
+    refletem o estado do índice antes do envio atual.
+    Cada instância deve ser usada por uma única thread.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        with self._db:
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(paginas)")]
+            if columns and 'identidade' not in columns:
+                # Índice da versão anterior (só o nome): as entradas não servem mais
+                self._db.execute("DROP TABLE paginas")
+            self._db.execute("CREATE TABLE IF NOT EXISTS paginas "
+                             "(impressao TEXT PRIMARY KEY, chave TEXT, identidade TEXT, campos TEXT)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS paginas_chave ON paginas (chave)")
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint):
+        """(identificação, campos) da página, ou None se a impressão digital é nova."""
+        if fingerprint in self._pending:
+            self.hits += 1
+            return self._pending[fingerprint]
+        row = self._db.execute("SELECT identidade, campos FROM paginas WHERE impressao = ?",
+                               (fingerprint,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        identity = Identity(*json.loads(row[0])) if row[0] is not None else None
+        return identity, json.loads(row[1]) if row[1] is not None else None
+
+    def put(self, fingerprint, identity, fields):
+        self._pending[fingerprint] = (identity, fields)
+
+    def known_keys(self, keys):
+        """Chaves (funcionários) que já aparecem no índice gravado."""
+        keys = list(keys)
+        known = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            query = f"SELECT DISTINCT chave FROM paginas WHERE chave IN ({','.join('?' * len(chunk))})"
+            known.update(row[0] for row in self._db.execute(query, chunk))
+        return known
+
+    def flush(self):
+        """Grava as páginas novas em uma única transação."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO paginas (impressao, chave, identidade, campos) VALUES (?, ?, ?, ?)",
+                [(fingerprint,
+                  None if identity is None else identity.key,
+                  None if identity is None else json.dumps(identity, ensure_ascii=False),
+                  None if fields is None else json.dumps(fields, ensure_ascii=False))
+                 for fingerprint, (identity, fields) in self._pending.items()],
+            )
+        self._pending.clear()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def indexed_pages(file, index, warnings, text_mode=TEXT_FULL, key_func=extract_identity, parse_func=extract_fields):
+    """
+    Percorre o PDF produzindo, por página, {'page_number', 'identity',
+    'fields', 'new'}. Páginas já vistas vêm do índice, sem extração de texto;
+    as novas são lidas, parseadas e registradas no índice. Páginas de
+    continuação (sem identificação) também são parseadas; o agrupamento fica
+    com indexed_records. Erros vão para `warnings`.
+    """
+    namespace = f"{INDEX_VERSION}:{PARSER_VERSION}:{text_mode}"
+    memo = {}
+    with stage("abertura do PDF"):
+        pdf = open_pdf(file)
+    with pdf:
+        for page in pdf.pages:
+            page_number = page.page_number
+            try:
+                with stage("impressão digital", page_number):
+                    fingerprint = page_fingerprint(page, namespace, memo)
+                entry = index.get(fingerprint)
+                new = entry is None
+                if new:
+                    text = read_page(page, tables=False, text_mode=text_mode)['text']
+            except Exception as e:
+                # Página ilegível: fica fora do índice e do agrupamento (não vira continuação)
+                warnings.append(page_warning(page_number, READ_ERROR, f"{type(e).__name__}: {e}"))
+                continue
+            finally:
+                page.close()
+            if new:
+                identity, fields, ok = _parse_page(text, page_number, warnings, key_func, parse_func)
+                if ok:
+                    index.put(fingerprint, identity, fields)
+                elif fields is None:
+                    continue  # erro na identificação: a página é ignorada
+            else:
+                identity, fields = entry
+            yield {'page_number': page_number, 'identity': identity, 'fields': fields, 'new': new}
+
+
+def _parse_page(text, page_number, warnings, key_func, parse_func):
+    # (identificação, campos, ok) de uma página nova; páginas com erro (ok=False) não vão para o índice
+    try:
+        identity = key_func(text)
+    except Exception as e:
+        warnings.append(page_warning(page_number, IDENTITY_ERROR, str(e)))
+        return None, None, False
+    try:
+        with stage("parse_page_1"):
+            return identity, parse_func(text), True
+    except Exception as e:
+        warnings.append(page_warning(page_number, PARSE_ERROR, str(e)))
+        return identity, {}, False
+
+
+def indexed_records(pages, changed, warnings, grouper=None):
+    """
+    Agrupa as páginas de `indexed_pages` como ficha_records: produz (chave,
+    dados) para cada grupo de páginas consecutivas do mesmo funcionário. As
+    chaves com alguma página nova são adicionadas a `changed`.
+    """
+    grouper = EmployeeGrouper() if grouper is None else grouper
+    current_key = None
+    user_data = None
+    for page in pages:
+        with stage("agrupamento", page['page_number']):
+            key = grouper.resolve(page['identity'])
+        if key is None:
+            warnings.append(page_warning(page['page_number'], NO_IDENTITY, "antes do primeiro funcionário"))
+            continue
+        if key != current_key and user_data is not None:
+            yield current_key, user_data
+            user_data = None
+        current_key = key
+        if user_data is None:
+            user_data = {}
+        user_data.update(page['fields'])
+        if page['new']:
+            changed.add(key)
+    if user_data is not None:
+        yield current_key, user_data
+
+
+def employee_status(keys, changed, index):
+    """
+    Situação de cada funcionário em relação aos envios anteriores: novo,
+    alterado ou sem alteração. Deve ser chamada antes de `index.flush()`.
+    """
+    known = index.known_keys(changed)
+    status = {}
+    for key in keys:
+        if key not in changed:
+            status[key] = STATUS_UNCHANGED
+        else:
+            status[key] = STATUS_CHANGED if key in known else STATUS_NEW
+    return status
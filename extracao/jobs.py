@@ -0,0 +1,225 @@
+"""
+Fila de processamentos em segundo plano.
+
+A extração de um PDF grande não precisa prender a execução do script do
+Streamlit: o trabalho é enviado a um pool de threads do servidor e recebe um
+identificador (job id). A interface consulta o status e o progresso
+periodicamente. Se a sessão cair, o processamento continua, e o resultado
+fica disponível para quem enviar o mesmo conteúdo depois.
+
+O pool é único por processo, compartilhado por todas as sessões, e o número
+de jobs executando ao mesmo tempo é limitado (os demais aguardam na fila).
+Os jobs são identificados também por uma chave (ex.: a chave de conteúdo do
+cache), de modo que o mesmo arquivo enviado duas vezes, ou por dois usuários,
+aproveita o job já existente em vez de processar de novo.
+
+Configuração por variável de ambiente:
+  - EXTRACAO_JOBS_MAX: jobs executando ao mesmo tempo (padrão 2)
+"""
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from extracao.profiling import Profiler
+
+QUEUED = 'na fila'
+RUNNING = 'em andamento'
+DONE = 'concluído'
+FAILED = 'erro'
+CANCELLED = 'cancelado'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+# Jobs terminados guardados (status, erro e perfil) antes de serem
+# descartados. O resultado fica em `job.result` só quando a função o devolve;
+# as aplicações o guardam no cache de extração (limitado em tamanho) e
+# devolvem None (ver extracao.ui.background_result)
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """
+    Um processamento enviado ao pool. A função do job recebe o próprio Job
+    como primeiro argumento e informa o andamento com `set_progress` e, se
+    quiser, um resultado parcial com `add_partial`.
+    """
+
+    def __init__(self, key, description):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.description = description
+        self.status = QUEUED
+        self.done = 0
+        self.total = None
+        self.partial = []  # blocos do resultado parcial, na ordem em que foram publicados
+        self.result = None
+        self.error = None
+        self.profile = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+
+    def set_progress(self, done, total=None):
+        self.done = done
+        if total is not None:
+            self.total = total
+
+    def add_partial(self, part):
+        """
+        Acrescenta um bloco (ex.: DataFrame com as linhas novas) ao resultado
+        parcial. Só o bloco novo é montado a cada publicação; quem exibe junta
+        os blocos quando precisa (ver extracao.ui).
+        """
+        self.partial.append(part)
+
+    @property
+    def fraction(self):
+        if self.status == DONE:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    @property
+    def is_finished(self):
+        return self.status in FINISHED
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def snapshot(self):
+        """Estado do job serializável, sem o resultado."""
+        return {
+            'id': self.id,
+            'description': self.description,
+            'status': self.status,
+            'done': self.done,
+            'total': self.total,
+            'error': self.error,
+            'seconds': self.elapsed(),
+            'created': self.created,
+        }
+
+
+class JobManager:
+    """Pool de threads com limite global de concorrência e registro dos jobs."""
+
+    def __init__(self, max_workers=2, max_finished=MAX_FINISHED_JOBS):
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='extracao-job')
+        self._jobs = OrderedDict()  # id -> Job
+        self._by_key = {}  # chave -> id
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, key=None, description="", profiler=None):
+        """
+        Envia `func(job, *args)` para o pool e devolve o Job. Com `key`, um job
+        da mesma chave que esteja na fila, em andamento ou concluído é
+        reaproveitado (jobs com erro ou cancelados são enviados de novo).
+        As etapas do job são medidas em `profiler` (por padrão, um Profiler
+        só de tempo) e o relatório fica em `job.profile`.
+        """
+        with self._lock:
+            if key is not None:
+                existing = self._jobs.get(self._by_key.get(key))
+                if existing is not None and existing.status not in (FAILED, CANCELLED):
+                    return existing
+            job = Job(key, description)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+            job.future = self._executor.submit(self._run, job, func, args, profiler or Profiler())
+        return job
+
+    def _run(self, job, func, args, profiler):
+        if job.status == CANCELLED:
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            with profiler.activate():
+                job.result = func(job, *args)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+            job.status = FAILED
+        finally:
+            job.profile = profiler.report()
+            job.partial = []
+            job.finished = time.time()
+            self._evict()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def find(self, key):
+        """Job mais recente da chave (ou None)."""
+        return self._jobs.get(self._by_key.get(key))
+
+    def jobs(self, ids=None):
+        """Jobs registrados (todos ou só os de `ids`), do mais antigo ao mais recente."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if ids is not None:
+            ids = set(ids)
+            jobs = [job for job in jobs if job.id in ids]
+        return jobs
+
+    def cancel(self, job_id):
+        """
+        Cancela um job que ainda está na fila; jobs em andamento não são
+        interrompidos. Devolve False se o pool já começou a executá-lo.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            if job.future is not None and not job.future.cancel():
+                return False
+            job.status = CANCELLED
+            job.finished = time.time()
+            return True
+
+    def discard(self, job_id):
+        """Remove um job terminado do registro (ex.: para reprocessar após um erro)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.is_finished:
+                return False
+            self._forget(job)
+            return True
+
+    def _forget(self, job):
+        del self._jobs[job.id]
+        if job.key is not None and self._by_key.get(job.key) == job.id:
+            del self._by_key[job.key]
+
+    def _evict(self):
+        # Descarta os jobs terminados mais antigos além do limite
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.is_finished]
+            for job in finished[:max(0, len(finished) - self.max_finished)]:
+                self._forget(job)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_manager():
+    """Gerenciador compartilhado pelo processo (todas as sessões do Streamlit)."""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = JobManager(max_workers=int(os.environ.get('EXTRACAO_JOBS_MAX', '2')))
+        return _default_manager
@@ -0,0 +1,122 @@
+"""
+Extração paralela por páginas.
+
+O documento é gravado em um arquivo temporário compartilhado e dividido em
+faixas de páginas; cada processo do pool abre o arquivo de forma independente
+e processa sua faixa com o mesmo `read_page` do caminho serial. Os resultados
+voltam na ordem das páginas e, quando uma página falha, o erro fica registrado
+nela (chave 'error') em vez de abortar o documento inteiro.
+
+O número de processos pode ser definido por parâmetro ou pela variável de
+ambiente EXTRACAO_WORKERS (padrão 1, ou seja, extração serial). O pool de
+processos só é importado quando a extração é de fato paralela.
+"""
+import os
+import tempfile
+
+from extracao.engine import TEXT_FULL, count_pages, open_pdf, read_page
+
+# Abaixo deste número de páginas por processo o custo de iniciar o pool
+# supera o ganho do paralelismo
+MIN_PAGES_PER_WORKER = 8
+
+
+def default_workers():
+    return max(1, int(os.environ.get('EXTRACAO_WORKERS', '1')))
+
+
+def page_ranges(num_pages, workers, min_pages=MIN_PAGES_PER_WORKER):
+    """
+    Divide as páginas (numeradas a partir de 1) em faixas contíguas. São
+    geradas algumas faixas por processo para equilibrar páginas mais pesadas.
+    """
+    if num_pages == 0:
+        return []
+    chunks = max(1, min(workers * 4, num_pages // min_pages))
+    size, rest = divmod(num_pages, chunks)
+    ranges = []
+    start = 1
+    for i in range(chunks):
+        stop = start + size + (1 if i < rest else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _error_page(page_number, error, text, tables):
+    return {
+        'page_number': page_number,
+        'width': None,
+        'height': None,
+        'text': "" if text else None,
+        'tables': [],
+        'error': f"{type(error).__name__}: {error}",
+    }
+
+
+def extract_range(path, start, stop, text=True, tables=True, template=None, text_mode=TEXT_FULL):
+    """
+    Processa as páginas [start, stop) de um arquivo; usado pelos processos do
+    pool. Com template="auto" cada faixa aprende o modelo na sua primeira página.
+    """
+    results = []
+    extractor = None
+    if tables and template is not None:
+        from extracao.regions import table_extractor
+        extractor = table_extractor(template)
+    try:
+        pdf = open_pdf(path, pages=list(range(start, stop)))
+    except Exception as e:
+        return [_error_page(n, e, text, tables) for n in range(start, stop)]
+    with pdf:
+        for page in pdf.pages:
+            try:
+                results.append(read_page(page, text=text, tables=tables, extractor=extractor,
+                                         text_mode=text_mode))
+            except Exception as e:
+                results.append(_error_page(page.page_number, e, text, tables))
+            finally:
+                page.close()
+    return results
+
+
+def extract_document_parallel(data, text=True, tables=True, workers=None, template=None, text_mode=TEXT_FULL):
+    """
+    Equivalente paralelo de `extract_document` para os bytes de um PDF.
+    Retorna {'num_pages': int, 'pages': [...]} com as páginas em ordem.
+    """
+    workers = workers or default_workers()
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        ranges = page_ranges(count_pages(path), workers)
+        if workers == 1 or len(ranges) <= 1:
+            # Documento pequeno: processa no próprio processo
+            pages = [page for start, stop in ranges for page in extract_range(path, start, stop, text, tables, template, text_mode)]
+            return {'num_pages': len(pages), 'pages': pages}
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # 'spawn' evita herdar, via fork, as threads do servidor do Streamlit
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(extract_range, path, start, stop, text, tables, template, text_mode)
+                for start, stop in ranges
+            ]
+            pages = []
+            for (start, stop), future in zip(ranges, futures):
+                try:
+                    pages.extend(future.result())
+                except Exception as e:
+                    # Falha do processo inteiro (ex.: memória): registra a faixa toda
+                    pages.extend(_error_page(n, e, text, tables) for n in range(start, stop))
+    finally:
+        os.remove(path)
+    return {'num_pages': len(pages), 'pages': pages}
+
+
+def document_errors(document):
+    # Lista (página, mensagem) das páginas que falharam na extração
+    return [(page['page_number'], page['error']) for page in document['pages'] if page.get('error')]
@@ -0,0 +1,112 @@
+"""
+Pipelines de processamento de um PDF, independentes do Streamlit.
+
+Usados pelas aplicações (modo incremental) e pelo processamento em lote
+(`python -m extracao`).
+"""
+from extracao.engine import TEXT_FULL, iter_pages
+from extracao.fields import FIELD_PATTERNS, extract_fields, extract_identity
+from extracao.grouping import PARSE_ERROR, group_pages, page_warning, readable_pages
+from extracao.profiling import stage
+from extracao.tables import DEFAULT_LAYOUT, parse_table_report
+
+CONTRACHEQUE = 'contracheque'
+FICHA = 'ficha'
+
+# Rótulos que só aparecem no contracheque (usados na detecção automática)
+_CONTRACHEQUE_MARKERS = ('Total de Vencimentos', 'Valor Líquido a Receber')
+
+
+def contracheque_rows(pages, unmatched=None, layout=DEFAULT_LAYOUT):
+    """Produz um dicionário por tabela encontrada nas páginas (ver parse_table_report)."""
+    for page in pages:
+        for table in page['tables']:
+            with stage("parse_table", page['page_number']):
+                parsed_dict, labels = parse_table_report(table, layout)
+            if unmatched is not None:
+                unmatched.update(labels)
+            yield parsed_dict
+
+
+def ficha_records(pages, warnings, key_func=extract_identity, parse_func=extract_fields, grouper=None):
+    """
+    Agrupa as páginas da Ficha Completa por funcionário (matrícula, CPF ou
+    nome; ver extracao.grouping) e produz (chave, dados) para cada grupo de
+    páginas consecutivas. Os avisos (páginas não lidas ou sem identificação,
+    erros de parse) vão para `warnings`, um dicionário por página.
+    """
+    pages = readable_pages(pages, warnings)
+    for key, user_pages in group_pages(pages, key_func, warnings, grouper):
+        user_data = {}
+        for page_number, page in user_pages:
+            try:
+                with stage("parse_page_1"):
+                    user_data.update(parse_func(page))
+            except Exception as e:
+                warnings.append(page_warning(page_number, PARSE_ERROR, f"{key}: {e}"))
+        yield key, user_data
+
+
+def merge_records(records, users=None):
+    """Mescla os grupos de um mesmo funcionário (páginas não consecutivas)."""
+    users = {} if users is None else users
+    for key, user_data in records:
+        users.setdefault(key, {}).update(user_data)
+    return users
+
+
+def detect_kind(file):
+    # Contracheque tem os totais de vencimentos/líquido já na primeira página
+    for page in iter_pages(file, tables=False):
+        if any(marker in page['text'] for marker in _CONTRACHEQUE_MARKERS):
+            return CONTRACHEQUE
+        return FICHA
+    return FICHA
+
+
+def _counted(pages, counter):
+    for page in pages:
+        counter[0] += 1
+        yield page
+
+
+def process_contracheque(file, layout=DEFAULT_LAYOUT, template=None):
+    """
+    Processa um contracheque: {'num_pages', 'rows', 'unmatched', 'warnings'}.
+    `template` é o modelo de regiões das tabelas (ver extracao.regions).
+    """
+    counter = [0]
+    unmatched = set()
+    pages = _counted(iter_pages(file, text=False, template=template), counter)
+    rows = list(contracheque_rows(pages, unmatched, layout))
+    return {'num_pages': counter[0], 'rows': rows, 'unmatched': sorted(unmatched), 'warnings': []}
+
+
+def process_ficha(file, text_mode=TEXT_FULL):
+    """
+    Processa uma Ficha Completa: {'num_pages', 'rows', 'unmatched', 'warnings'}.
+    `text_mode` escolhe o modo de texto (ver extracao.fasttext).
+    """
+    counter = [0]
+    warnings = []
+    pages = _counted(iter_pages(file, tables=False, text_mode=text_mode), counter)
+    users = merge_records(ficha_records(pages, warnings))
+    return {'num_pages': counter[0], 'rows': list(users.values()), 'unmatched': [], 'warnings': warnings}
+
+
+def output_columns(kind, layout=DEFAULT_LAYOUT):
+    """Colunas fixas dos registros de cada tipo de documento (contracheques pelo `layout`)."""
+    if kind == CONTRACHEQUE:
+        return list(layout.columns)
+    if kind == FICHA:
+        return list(FIELD_PATTERNS)
+    # auto: união das colunas dos dois tipos, sem repetição
+    columns = output_columns(CONTRACHEQUE, layout)
+    columns.extend(c for c in output_columns(FICHA) if c not in columns)
+    return columns
+
+
+PROCESSORS = {
+    CONTRACHEQUE: process_contracheque,
+    FICHA: process_ficha,
+}
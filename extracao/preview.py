@@ -0,0 +1,126 @@
+"""
+Renderização da pré-visualização das páginas.
+
+As páginas são renderizadas na resolução necessária para a largura de
+exibição (e não a 800 dpi fixos), com um zoom em alta resolução opcional. As
+imagens (PNG) ficam em um cache LRU indexado por (hash do arquivo, página,
+dpi), junto com as larguras das páginas de cada arquivo, e a página seguinte é renderizada em segundo plano para que a
+navegação pareça instantânea. Cada renderização abre e fecha o PDF.
+"""
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pdfplumber
+
+from extracao.cache import ExtractionCache
+
+# Largura (em pixels) da coluna de visualização nas aplicações
+PREVIEW_WIDTH_PX = 1000
+# Resolução do zoom opcional
+ZOOM_DPI = 300
+
+
+def fit_resolution(page_width_pt, width_px=PREVIEW_WIDTH_PX):
+    """Resolução (dpi) para que a página ocupe `width_px` pixels (1 pt = 1/72 pol.)."""
+    return max(36, round(72 * width_px / float(page_width_pt)))
+
+
+def render_page_png(data, page_number, resolution):
+    # Renderiza uma página (numerada a partir de 1) e devolve o PNG
+    with pdfplumber.open(io.BytesIO(data), pages=[page_number]) as pdf:
+        page = pdf.pages[0]
+        image = page.to_image(resolution=resolution).original
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        page.close()
+    return buffer.getvalue()
+
+
+class PreviewRenderer:
+    """
+    Renderizador com cache LRU (limitado em bytes) e pré-renderização da
+    próxima página em uma thread de fundo.
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024, prefetch=True):
+        # PNGs e larguras das páginas de cada arquivo (em pontos), no mesmo LRU limitado
+        self._images = ExtractionCache(max_bytes=max_bytes)
+        self._pending = {}  # chave -> Future das renderizações em andamento
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='preview') if prefetch else None
+
+    def page_widths(self, data, digest=None):
+        digest = digest or hashlib.sha256(data).hexdigest()
+        key = f"{digest}:larguras"
+        widths = self._images.get(key)
+        if widths is None:
+            # Só lê a árvore de páginas (sem análise de layout)
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                widths = [float(page.width) for page in pdf.pages]
+            self._images.put(key, widths)
+        return widths
+
+    def page_count(self, data, digest=None):
+        return len(self.page_widths(data, digest))
+
+    def render(self, data, page_number, width_px=PREVIEW_WIDTH_PX, resolution=None, digest=None):
+        """
+        PNG da página `page_number` (a partir de 1). Sem `resolution`, usa a
+        resolução que ajusta a página a `width_px`. Em seguida agenda a
+        renderização da próxima página com os mesmos parâmetros.
+        """
+        digest = digest or hashlib.sha256(data).hexdigest()
+        widths = self.page_widths(data, digest)
+        png = self._get(data, digest, page_number, resolution or fit_resolution(widths[page_number - 1], width_px))
+        if self._executor and page_number < len(widths):
+            next_resolution = resolution or fit_resolution(widths[page_number], width_px)
+            self._prefetch(data, digest, page_number + 1, next_resolution)
+        return png
+
+    def _key(self, digest, page_number, resolution):
+        return f"{digest}:{page_number}:{resolution}"
+
+    def _get(self, data, digest, page_number, resolution):
+        key = self._key(digest, page_number, resolution)
+        png = self._images.get(key)
+        if png is not None:
+            return png
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            # Já está sendo pré-renderizada: aguarda em vez de renderizar de novo
+            return future.result()
+        png = render_page_png(data, page_number, resolution)
+        self._images.put(key, png)
+        return png
+
+    def _prefetch(self, data, digest, page_number, resolution):
+        key = self._key(digest, page_number, resolution)
+        with self._lock:
+            if key in self._pending or self._images.get(key) is not None:
+                return
+            self._pending[key] = self._executor.submit(self._render_pending, data, key, page_number, resolution)
+
+    def _render_pending(self, data, key, page_number, resolution):
+        try:
+            png = render_page_png(data, page_number, resolution)
+            self._images.put(key, png)
+            return png
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_default_renderer():
+    """Renderizador do processo, compartilhado entre reruns e sessões do Streamlit."""
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = PreviewRenderer()
+        return _default_renderer
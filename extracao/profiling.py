@@ -0,0 +1,242 @@
+"""
+Instrumentação do pipeline de extração.
+
+Um `Profiler` ativo (ver `Profiler.activate`) recebe as medições das etapas
+instrumentadas com `stage(...)`: tempo de parede, tempo de CPU da thread e,
+opcionalmente, o pico de memória alocada (tracemalloc) de cada etapa, no
+total e por página. Sem profiler ativo, `stage` não faz nada.
+
+O tracemalloc é do processo inteiro: ele fica ligado enquanto houver algum
+profiler com `track_memory` ativo (por exemplo, o da sessão do Streamlit e o
+de um processamento em segundo plano ao mesmo tempo), e o pico de cada etapa
+aberta é preservado quando outra etapa, de qualquer thread, zera o contador.
+Com etapas simultâneas, o pico inclui a memória alocada pelas outras threads.
+
+Para investigações pontuais, o profiler pode também ligar o cProfile ou o
+pyinstrument (se instalado) durante toda a execução e anexar o relatório
+em texto.
+"""
+import contextvars
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+DEEP_PROFILERS = ('cprofile', 'pyinstrument')
+
+_current = contextvars.ContextVar('extracao_profiler', default=None)
+
+
+@contextmanager
+def stage(name, page=None):
+    """Mede uma etapa no profiler ativo (se houver)."""
+    profiler = _current.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name, page):
+        yield
+
+
+# Estado do tracemalloc compartilhado pelos profilers (de todas as threads)
+_memory_lock = threading.Lock()
+_memory_users = 0
+_memory_started = False  # se fomos nós que ligamos o tracemalloc
+_open_peaks = []  # pico corrente de cada etapa aberta
+
+
+class _Peak:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+
+def _start_tracing():
+    global _memory_users, _memory_started
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_started = True
+        _memory_users += 1
+
+
+def _stop_tracing():
+    global _memory_users, _memory_started
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+def _fold_peak():
+    # Repassa o pico desde o último reset a todas as etapas abertas (chamar com o lock)
+    peak = tracemalloc.get_traced_memory()[1]
+    for entry in _open_peaks:
+        entry.value = max(entry.value, peak)
+
+
+def _open_memory_stage():
+    """Abre a medição de uma etapa: (pico da etapa, memória no início)."""
+    with _memory_lock:
+        _fold_peak()
+        tracemalloc.reset_peak()
+        entry = _Peak()
+        _open_peaks.append(entry)
+        return entry, tracemalloc.get_traced_memory()[0]
+
+
+def _close_memory_stage(entry):
+    with _memory_lock:
+        _fold_peak()
+        for i, open_entry in enumerate(_open_peaks):
+            if open_entry is entry:
+                del _open_peaks[i]
+                break
+    return entry.value
+
+
+class Profiler:
+    """
+    Coleta as métricas das etapas. `track_memory` liga o tracemalloc (deixa a
+    execução bem mais lenta); `deep` pode ser 'cprofile' ou 'pyinstrument'.
+    """
+
+    def __init__(self, track_memory=False, deep=None):
+        if deep is not None and deep not in DEEP_PROFILERS:
+            raise ValueError(f"Profiler detalhado desconhecido: {deep}")
+        self.track_memory = track_memory
+        self.deep = deep
+        self.total_seconds = 0.0
+        self.deep_report = None
+        self._stages = {}  # etapa -> [chamadas, parede, cpu, pico]
+        self._pages = []  # medições por página
+
+    @contextmanager
+    def activate(self):
+        """Torna este profiler o ativo durante o bloco."""
+        token = _current.set(self)
+        if self.track_memory:
+            _start_tracing()
+        deep_profiler = self._start_deep()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_seconds += time.perf_counter() - start
+            self._stop_deep(deep_profiler)
+            if self.track_memory:
+                _stop_tracing()
+            _current.reset(token)
+
+    @contextmanager
+    def stage(self, name, page=None):
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            entry, start_memory = _open_memory_stage()
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.thread_time() - start_cpu
+            peak = None
+            if tracing:
+                peak = max(0, _close_memory_stage(entry) - start_memory)
+            self._record(name, page, wall, cpu, peak)
+
+    def _record(self, name, page, wall, cpu, peak):
+        totals = self._stages.setdefault(name, [0, 0.0, 0.0, None])
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+        if peak is not None:
+            totals[3] = peak if totals[3] is None else max(totals[3], peak)
+        if page is not None:
+            self._pages.append((page, name, wall, cpu, peak))
+
+    def _start_deep(self):
+        if self.deep == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.deep == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+            except ImportError as e:
+                raise ImportError("O perfil detalhado 'pyinstrument' requer o pacote pyinstrument") from e
+            profiler = PyinstrumentProfiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_deep(self, profiler):
+        if profiler is None:
+            return
+        if self.deep == 'cprofile':
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(40)
+            self.deep_report = output.getvalue()
+        else:
+            profiler.stop()
+            self.deep_report = profiler.output_text()
+
+    def stages(self):
+        """Totais por etapa, na ordem em que as etapas apareceram."""
+        return [
+            {
+                'stage': name,
+                'calls': calls,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'peak_mb': None if peak is None else peak / 1e6,
+            }
+            for name, (calls, wall, cpu, peak) in self._stages.items()
+        ]
+
+    def pages(self):
+        """Medições por página (apenas das etapas associadas a uma página)."""
+        return [
+            {
+                'page': page,
+                'stage': name,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'peak_mb': None if peak is None else peak / 1e6,
+            }
+            for page, name, wall, cpu, peak in self._pages
+        ]
+
+    def report(self, include_pages=True):
+        """Relatório serializável em JSON."""
+        report = {
+            'total_seconds': self.total_seconds,
+            'track_memory': self.track_memory,
+            'stages': self.stages(),
+            'deep_profiler': self.deep,
+            'deep_report': self.deep_report,
+        }
+        if include_pages:
+            report['pages'] = self.pages()
+        return report
+
+
+def merge_stage_reports(reports):
+    """Soma os totais por etapa de vários relatórios (ex.: um por arquivo do lote)."""
+    merged = {}
+    for report in reports:
+        for item in report['stages']:
+            totals = merged.setdefault(item['stage'], {'stage': item['stage'], 'calls': 0, 'wall_s': 0.0,
+                                                       'cpu_s': 0.0, 'peak_mb': None})
+            totals['calls'] += item['calls']
+            totals['wall_s'] += item['wall_s']
+            totals['cpu_s'] += item['cpu_s']
+            if item['peak_mb'] is not None:
+                totals['peak_mb'] = max(totals['peak_mb'] or 0, item['peak_mb'])
+    return list(merged.values())
@@ -0,0 +1,252 @@
+"""
+Modelo de registros tipados dos contracheques e fichas.
+
+Os parsers (parse_table, parse_page_1) produzem dicionários de textos. Aqui
+os registros são guardados em colunas com esquema fixo (coluna -> tipo) e os
+valores são convertidos uma única vez, na inserção:
+
+  - valores monetários no formato brasileiro ("1.234,56") -> float
+  - datas "dd/mm/aaaa" -> dias desde 1970 (datetime64 no DataFrame)
+  - números inteiros -> Int64 (nulo quando ausente)
+  - campos com várias linhas ("001; 002; 101") -> valores em um vetor único
+    com os deslocamentos de cada registro (como uma lista do Arrow), em vez
+    de um texto por registro; nas listas de valores, o texto original de
+    cada item também é guardado, para o DataFrame mostrar exatamente o que
+    veio do PDF (inclusive os itens que não puderam ser convertidos)
+
+O DataFrame é montado direto das colunas, já com os tipos, e os campos de
+várias linhas podem ser expandidos em linhas filhas (`children`), uma por
+valor, para agregações vetorizadas. Valores que não puderam ser convertidos
+ficam nulos e são listados em `invalid`.
+
+Em vez de um objeto por registro (mesmo com __slots__), o armazenamento é
+colunar: arrays do módulo `array` para números e datas e listas para textos,
+com os textos repetidos guardados uma só vez.
+"""
+import datetime
+import re
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from extracao.fields import FIELD_PATTERNS
+from extracao.tables import DEFAULT_LAYOUT
+
+# Deve ser incrementada quando os esquemas, a conversão ou o formato dos
+# resultados das aplicações mudarem (faz parte das chaves de cache desses
+# resultados).
+RECORDS_VERSION = "3"
+
+TEXT = 'texto'
+INTEGER = 'inteiro'
+MONEY = 'valor'
+DATE = 'data'
+TEXT_LIST = 'lista de textos'
+MONEY_LIST = 'lista de valores'
+LIST_KINDS = (TEXT_LIST, MONEY_LIST)
+
+# Separador dos campos de várias linhas (ver extracao.tables._join_lines)
+LIST_SEPARATOR = '; '
+
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min  # representação interna do NaT do numpy
+_DIGITS = re.compile(r'\d+')
+
+CONTRACHEQUE_SCHEMA = dict.fromkeys(DEFAULT_LAYOUT.columns, TEXT)
+CONTRACHEQUE_SCHEMA.update({
+    'Data Admissão': DATE,
+    'Carga Horária': INTEGER,
+    'Margem Consignável': MONEY,
+    'Código': TEXT_LIST,
+    'Descrição': TEXT_LIST,
+    'Limite': TEXT_LIST,
+    'Vantagens': MONEY_LIST,
+    'Descontos': MONEY_LIST,
+    'Total de Vencimentos': MONEY,
+    'Total de Descontos': MONEY,
+    'Valor Líquido a Receber': MONEY,
+})
+
+FICHA_SCHEMA = dict.fromkeys(FIELD_PATTERNS, TEXT)
+FICHA_SCHEMA.update({
+    'Data de Nascimento': DATE,
+    'Data de Admissão': DATE,
+    'Nº Dependentes Sal. Família': INTEGER,
+    'Nº Dependentes IRRF': INTEGER,
+})
+
+
+def parse_money(text):
+    """ "1.234,56" -> 1234.56. Aceita "R$" e sinal de negativo antes ou depois do número."""
+    text = text.replace('R$', '').strip()
+    negative = text.startswith('-') or text.endswith('-')
+    value = float(text.strip('-').strip().replace('.', '').replace(',', '.'))
+    return -value if negative else value
+
+
+def parse_date(text):
+    """ "dd/mm/aaaa" -> dias desde 01/01/1970."""
+    day, month, year = text.strip().split('/')
+    return datetime.date(int(year), int(month), int(day)).toordinal() - _EPOCH
+
+
+def parse_integer(text):
+    # Aceita unidades após o número (ex.: "40h")
+    match = _DIGITS.match(text.strip())
+    if match is None:
+        raise ValueError(text)
+    return int(match.group())
+
+
+_PARSERS = {
+    INTEGER: parse_integer,
+    MONEY: parse_money,
+    DATE: parse_date,
+    MONEY_LIST: parse_money,
+}
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and value != value) or value == ''
+
+
+class RecordTable:
+    """
+    Registros com esquema fixo, guardados por coluna. Colunas que não estão
+    no esquema (ex.: campos de um layout personalizado) entram como texto.
+    """
+
+    def __init__(self, schema):
+        self.schema = dict(schema)
+        self.invalid = []  # (registro, coluna, texto) dos valores não convertidos
+        self._size = 0
+        self._columns = {}
+        self._offsets = {}
+        self._texts = {}  # coluna -> textos originais dos itens das listas de valores
+        self._strings = {}  # textos repetidos (órgão, cargo, código...) guardados uma só vez
+        for column, kind in self.schema.items():
+            self._add_column(column, kind)
+
+    def __len__(self):
+        return self._size
+
+    def _add_column(self, column, kind):
+        if kind in (MONEY, MONEY_LIST):
+            self._columns[column] = array('d', [np.nan]) * self._size if kind == MONEY else array('d')
+        elif kind == DATE:
+            self._columns[column] = array('q', [_NAT]) * self._size
+        elif kind in (TEXT, INTEGER):
+            self._columns[column] = [None] * self._size
+        else:
+            self._columns[column] = []
+        if kind in LIST_KINDS:
+            self._offsets[column] = array('q', [0]) * (self._size + 1)
+        if kind == MONEY_LIST:
+            self._texts[column] = []
+
+    def append(self, row):
+        """Converte e acrescenta um registro (dicionário coluna -> texto)."""
+        index = self._size
+        for column in row.keys() - self.schema.keys():
+            self.schema[column] = TEXT
+            self._add_column(column, TEXT)
+        for column, kind in self.schema.items():
+            value = row.get(column)
+            values = self._columns[column]
+            if kind in LIST_KINDS:
+                if not _missing(value):
+                    items = value.split(LIST_SEPARATOR)
+                    values.extend(self._convert(index, column, kind, item) for item in items)
+                    if kind == MONEY_LIST:
+                        self._texts[column].extend(self._strings.setdefault(item, item) for item in items)
+                self._offsets[column].append(len(values))
+                continue
+            if _missing(value):
+                values.append(None if kind in (TEXT, INTEGER) else np.nan if kind == MONEY else _NAT)
+            elif kind == TEXT:
+                values.append(self._strings.setdefault(value, value))
+            else:
+                values.append(self._convert(index, column, kind, value))
+        self._size += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def _convert(self, index, column, kind, text):
+        if kind == TEXT_LIST:
+            return self._strings.setdefault(text, text)
+        try:
+            return _PARSERS[kind](text)
+        except (ValueError, TypeError, AttributeError):
+            self.invalid.append((index, column, text))
+            return None if kind == INTEGER else np.nan if kind in (MONEY, MONEY_LIST) else _NAT
+
+    def column(self, column, start=0):
+        """
+        Coluna como Series tipada (campos de várias linhas como o texto
+        original unido por "; "), a partir do registro `start`.
+        """
+        kind = self.schema[column]
+        values = self._columns[column]
+        if start and kind not in LIST_KINDS:
+            values = values[start:]
+        if kind == TEXT:
+            return pd.Series(values, dtype='string', name=column)
+        if kind == INTEGER:
+            return pd.Series(pd.array(values, dtype='Int64'), name=column)
+        if kind == MONEY:
+            return pd.Series(np.array(values, dtype=np.float64), name=column)
+        if kind == DATE:
+            days = np.array(values, dtype=np.int64).view('datetime64[D]')
+            return pd.Series(days.astype('datetime64[s]'), name=column)
+        offsets = self._offsets[column]
+        if kind == MONEY_LIST:
+            values = self._texts[column]
+        joined = [
+            LIST_SEPARATOR.join(values[offsets[i]:offsets[i + 1]]) if offsets[i + 1] > offsets[i] else None
+            for i in range(start, self._size)
+        ]
+        return pd.Series(joined, dtype='string', name=column)
+
+    def to_frame(self, columns=None, start=0):
+        """
+        DataFrame com uma linha por registro, montado direto das colunas
+        tipadas. Com `start`, só os registros a partir dele (ex.: os
+        acrescentados desde a última publicação).
+        """
+        columns = list(self.schema) if columns is None else columns
+        return pd.DataFrame({column: self.column(column, start) for column in columns})
+
+    def counts(self, column):
+        """Quantidade de valores de um campo de várias linhas em cada registro."""
+        if self.schema[column] not in LIST_KINDS:
+            raise ValueError(f"A coluna {column} não tem várias linhas")
+        return np.diff(np.array(self._offsets[column], dtype=np.int64))
+
+    def children(self, column, keys=()):
+        """
+        Linhas filhas de um campo de várias linhas: uma por valor, com o
+        número do registro ('registro'), a posição do valor no campo
+        ('posição') e, opcionalmente, colunas do registro (`keys`).
+        """
+        kind = self.schema[column]
+        if kind not in LIST_KINDS:
+            raise ValueError(f"A coluna {column} não tem várias linhas")
+        offsets = np.array(self._offsets[column], dtype=np.int64)
+        counts = np.diff(offsets)
+        parents = np.repeat(np.arange(self._size), counts)
+        data = {
+            'registro': parents,
+            'posição': np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts),
+        }
+        for key in keys:
+            data[key] = self.column(key).iloc[parents].to_numpy()
+        values = self._columns[column]
+        if kind == MONEY_LIST:
+            data[column] = np.array(values, dtype=np.float64)
+        else:
+            data[column] = pd.array(values, dtype='string')
+        return pd.DataFrame(data)
@@ -0,0 +1,221 @@
+"""
+Extração de tabelas guiada por um modelo de regiões.
+
+Os contracheques de um mesmo lote têm layout fixo: a grade da tabela
+(cabeçalho, quadro de lançamentos e totais) fica sempre nas mesmas
+coordenadas. O modelo é aprendido na primeira página com tabelas (ou
+carregado de um arquivo JSON salvo antes) e guarda:
+
+  - a assinatura da página: os retângulos, linhas e curvas que formam a
+    grade, com as coordenadas arredondadas;
+  - as células de cada tabela que o pdfplumber detectou nessa página.
+
+Numa página com a mesma assinatura as arestas são as mesmas, então a
+detecção de tabelas do pdfplumber chegaria às mesmas células. Elas são
+reaproveitadas do modelo, e os caracteres são distribuídos entre as células
+em uma única passada (busca binária na grade), em vez de filtrar todos os
+caracteres da página para cada linha e para cada célula. O texto de cada
+célula sai do mesmo `utils.extract_text`, então o resultado é igual ao de
+`page.extract_tables()`. Páginas com assinatura diferente (outro layout,
+tabela a mais ou a menos) usam a detecção completa.
+"""
+import json
+from bisect import bisect_right
+
+import pdfplumber
+from pdfplumber import utils
+from pdfplumber.table import TableSettings
+
+from extracao.profiling import stage
+
+TEMPLATE_VERSION = 1
+# Casas decimais das coordenadas na assinatura da grade
+SIGNATURE_PRECISION = 1
+# Mesmas opções de texto que page.extract_tables() usa por padrão
+_TEXT_SETTINGS = TableSettings.resolve(None).text_settings or {}
+
+
+def _round(value):
+    return round(float(value), SIGNATURE_PRECISION)
+
+
+def ruling_signature(page):
+    """
+    Objetos que geram as arestas usadas na detecção de tabelas (retângulos,
+    linhas e curvas), com as coordenadas arredondadas e em ordem estável.
+    """
+    signature = []
+    for kind in ('rect', 'line', 'curve'):
+        for obj in page.objects.get(kind, ()):
+            item = [kind, _round(obj['x0']), _round(obj['top']), _round(obj['x1']), _round(obj['bottom'])]
+            if kind != 'rect':
+                item.extend(_round(coord) for point in obj.get('pts') or () for coord in point)
+            signature.append(tuple(item))
+    signature.sort()
+    return signature
+
+
+class TableGrid:
+    """Células de uma tabela do modelo, indexadas para localizar caracteres."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        cells = [cell for row in rows for cell in row if cell is not None]
+        self.xs = sorted({x for cell in cells for x in (cell[0], cell[2])})
+        self.ys = sorted({y for cell in cells for y in (cell[1], cell[3])})
+        self.bbox = (self.xs[0], self.ys[0], self.xs[-1], self.ys[-1])
+        # Cada intervalo da grade (coluna i, linha j) aponta para as células que o contêm
+        self.slots = {}
+        for row_index, row in enumerate(rows):
+            for cell_index, cell in enumerate(row):
+                if cell is None:
+                    continue
+                x0, top, x1, bottom = cell
+                for i in range(self.xs.index(x0), self.xs.index(x1)):
+                    for j in range(self.ys.index(top), self.ys.index(bottom)):
+                        self.slots.setdefault((i, j), []).append((row_index, cell_index))
+
+    def extract(self, chars):
+        """
+        Mesmo resultado de Table.extract(): a célula recebe os caracteres cujo
+        ponto central está dentro dela, na ordem da página.
+        """
+        x0, top, x1, bottom = self.bbox
+        xs, ys, slots = self.xs, self.ys, self.slots
+        cell_chars = {}
+        for char in chars:
+            h_mid = (char['x0'] + char['x1']) / 2
+            v_mid = (char['top'] + char['bottom']) / 2
+            if h_mid < x0 or h_mid >= x1 or v_mid < top or v_mid >= bottom:
+                continue
+            for key in slots.get((bisect_right(xs, h_mid) - 1, bisect_right(ys, v_mid) - 1), ()):
+                cell_chars.setdefault(key, []).append(char)
+
+        table = []
+        for row_index, row in enumerate(self.rows):
+            values = []
+            for cell_index, cell in enumerate(row):
+                if cell is None:
+                    values.append(None)
+                    continue
+                found = cell_chars.get((row_index, cell_index))
+                values.append(utils.extract_text(found, **_TEXT_SETTINGS) if found else "")
+            table.append(values)
+        return table
+
+
+class TableTemplate:
+    """
+    Modelo de regiões pronto para uso. `spec` é o dicionário serializável
+    (ver `save_template`); as estruturas de busca são montadas uma única vez.
+    """
+
+    def __init__(self, spec):
+        if spec.get('version') != TEMPLATE_VERSION:
+            raise ValueError(f"Versão de modelo de tabela não suportada: {spec.get('version')}")
+        self.spec = spec
+        self.page_size = tuple(spec['page_size'])
+        self.signature = [tuple(item) for item in spec['signature']]
+        self.grids = [TableGrid([[tuple(cell) if cell else None for cell in row] for row in table['rows']])
+                      for table in spec['tables']]
+
+    @classmethod
+    def from_page(cls, page, tables=None):
+        """Aprende o modelo de uma página (reaproveita `tables` de page.find_tables(), se houver)."""
+        tables = page.find_tables() if tables is None else tables
+        return cls({
+            'version': TEMPLATE_VERSION,
+            'page_size': [float(page.width), float(page.height)],
+            'signature': [list(item) for item in ruling_signature(page)],
+            'tables': [
+                {'bbox': [float(v) for v in table.bbox],
+                 'rows': [[[float(v) for v in cell] if cell else None for cell in row.cells]
+                          for row in table.rows]}
+                for table in tables
+            ],
+        })
+
+    def matches(self, page):
+        """A página tem o mesmo tamanho e a mesma grade do modelo?"""
+        return (float(page.width), float(page.height)) == self.page_size and \
+            ruling_signature(page) == self.signature
+
+    def extract(self, page):
+        chars = page.chars
+        return [grid.extract(chars) for grid in self.grids]
+
+
+class TemplateTables:
+    """
+    Extração de tabelas de um documento com modelo: usa o modelo nas páginas
+    compatíveis e a detecção completa nas demais. Sem modelo inicial, aprende
+    com a primeira página em que encontrar tabelas.
+    """
+
+    def __init__(self, template=None):
+        self.template = template
+        self.learn = template is None
+        self.matched = 0
+        self.detected = 0
+
+    def extract_tables(self, page):
+        page_number = page.page_number
+        if self.template is not None:
+            with stage("modelo de tabela: validação", page_number):
+                matches = self.template.matches(page)
+            if matches:
+                self.matched += 1
+                with stage("extract_tables (modelo)", page_number):
+                    return self.template.extract(page)
+
+        self.detected += 1
+        with stage("extract_tables", page_number):
+            found = page.find_tables()
+            tables = [table.extract(**_TEXT_SETTINGS) for table in found]
+        if self.learn and found:
+            self.learn = False
+            with stage("modelo de tabela: aprendizado", page_number):
+                template = TableTemplate.from_page(page, found)
+                # Só adota o modelo se ele reproduz a detecção completa na própria página
+                if template.extract(page) == tables:
+                    self.template = template
+        return tables
+
+
+def table_extractor(template):
+    """
+    Extrator de tabelas para um documento a partir da opção de modelo:
+    None (detecção completa em todas as páginas), "auto" (aprende com a
+    primeira página), um TableTemplate ou o caminho de um modelo salvo.
+    """
+    if template is None:
+        return None
+    if template == "auto":
+        return TemplateTables()
+    if isinstance(template, str):
+        template = load_template(template)
+    return TemplateTables(template)
+
+
+def learn_template(file):
+    """Aprende o modelo com a primeira página do PDF que tiver tabelas (None se não houver)."""
+    with pdfplumber.open(file) as pdf:
+        for page in pdf.pages:
+            try:
+                tables = page.find_tables()
+                if tables:
+                    return TableTemplate.from_page(page, tables)
+            finally:
+                page.close()
+    return None
+
+
+def save_template(template, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(template.spec, f, ensure_ascii=False)
+
+
+def load_template(path):
+    """Carrega um modelo salvo com `save_template`."""
+    with open(path, encoding='utf-8') as f:
+        return TableTemplate(json.load(f))
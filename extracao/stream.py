@@ -0,0 +1,28 @@
+"""
+Utilitários do pipeline incremental: as páginas chegam de um gerador, são
+agrupadas por funcionário conforme aparecem (ver extracao.grouping) e os
+resultados são liberados em blocos, para que a interface possa exibir o
+progresso sem esperar o documento inteiro.
+"""
+
+# Quantidade de registros acumulados antes de atualizar a interface
+STREAM_CHUNK_SIZE = 50
+
+
+def chunked(iterable, size=STREAM_CHUNK_SIZE):
+    """Agrupa os itens de um iterável em listas de até `size` elementos."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def count_progress(items, callback):
+    """Repassa os itens chamando `callback(n)` com a quantidade já consumida."""
+    for n, item in enumerate(items, start=1):
+        yield item
+        callback(n)
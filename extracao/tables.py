@@ -0,0 +1,186 @@
+"""
+Parser das tabelas do contracheque.
+
+Cada tabela é percorrida uma única vez. A classificação das células usa
+dicionários rótulo -> campo definidos em um layout, de forma que novos
+modelos de contracheque podem ser suportados sem alterar o código:
+
+  - header_fields: células "Rótulo\\nValor" das primeiras `header_rows` linhas
+  - contains_fields: rótulos procurados por substring (o valor é opcional)
+  - anchor / column_fields: linha de cabeçalho da tabela de lançamentos
+    (primeira célula igual a `anchor`) e a linha de valores logo abaixo
+  - total_fields: células cujo texto começa com o rótulo do total
+  - ignored_labels: rótulos conhecidos que não viram colunas (ex.: "Ref.")
+
+Rótulos das linhas de cabeçalho que não casam com nenhuma regra são
+reportados, para facilitar o ajuste de layouts novos.
+"""
+import json
+
+DEFAULT_SPEC = {
+    'header_rows': 7,
+    'header_fields': {
+        'Matrícula': 'Matrícula',
+        'Nome': 'Nome',
+        'CPF': 'CPF',
+        'PIS/PASEP': 'PIS/PASEP',
+        'Banco': 'Banco',
+        'Agência': 'Agência',
+        'Conta': 'Conta',
+        'Órgão/Secretaria': 'Órgão/Secretaria',
+        'Unid. Trabalho/Lotação': 'Unid. Trabalho/Lotação',
+        'Data Admissão': 'Data Admissão',
+        'Cargo/Benefício': 'Cargo/Benefício',
+        'Carga Horária': 'Carga Horária',
+        'Tempo de Serviço': 'Tempo de Serviço',
+        'Margem Consignável': 'Margem Consignável',
+    },
+    'contains_fields': {
+        'Tempo de Serviço Anterior': 'Tempo de Serviço Anterior',
+    },
+    'anchor': 'Código',
+    'column_fields': {
+        'Código': 'Código',
+        'Descrição': 'Descrição',
+        'Limite': 'Limite',
+        'Vantagens': 'Vantagens',
+        'Descontos': 'Descontos',
+    },
+    'total_fields': {
+        'Total de Vencimentos': 'Total de Vencimentos',
+        'Total de Descontos': 'Total de Descontos',
+        'Valor Líquido a Receber': 'Valor Líquido a Receber',
+    },
+    'ignored_labels': ['Ref.'],
+}
+
+
+class TableLayout:
+    """
+    Layout de contracheque pronto para uso: guarda as estruturas derivadas da
+    especificação (colunas, prefixos dos totais etc.) para não recalculá-las
+    a cada tabela.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.header_rows = spec['header_rows']
+        self.header_fields = dict(spec['header_fields'])
+        self.contains_fields = dict(spec['contains_fields'])
+        self.anchor = spec['anchor']
+        self.column_fields = dict(spec['column_fields'])
+        self.total_fields = dict(spec['total_fields'])
+        self.total_prefixes = tuple(self.total_fields)
+        self.ignored_labels = frozenset(spec['ignored_labels'])
+        # Colunas do resultado, na ordem: cabeçalho, lançamentos e totais
+        self.columns = []
+        for group in ('header_fields', 'contains_fields', 'column_fields', 'total_fields'):
+            for field in spec[group].values():
+                if field not in self.columns:
+                    self.columns.append(field)
+        self.template = dict.fromkeys(self.columns)
+
+
+def make_layout(base=DEFAULT_SPEC, **overrides):
+    """
+    Cria um layout a partir de uma especificação, acrescentando rótulos. Os
+    grupos de rótulos (dicionários) são mesclados; os demais valores são
+    substituídos. Ex.: make_layout(header_fields={'Matr.': 'Matrícula'})
+    """
+    spec = {}
+    for key, value in base.items():
+        spec[key] = dict(value) if isinstance(value, dict) else value
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(spec.get(key), dict):
+            spec[key].update(value)
+        else:
+            spec[key] = value
+    return TableLayout(spec)
+
+
+def load_layout(path):
+    # Layout salvo em JSON, com as mesmas chaves do DEFAULT_SPEC (parciais são mescladas)
+    with open(path, encoding='utf-8') as f:
+        return make_layout(**json.load(f))
+
+
+DEFAULT_LAYOUT = TableLayout(DEFAULT_SPEC)
+
+
+def _join_lines(value):
+    return '; '.join([v.strip() for v in value.split('\n')])
+
+
+def parse_table_report(table, layout=DEFAULT_LAYOUT):
+    """
+    Converte uma tabela extraída em um dicionário (uma coluna por campo do
+    layout) em uma única passada pelas células.
+    Retorna (resultado, rótulos não reconhecidos).
+    """
+    header_rows = layout.header_rows
+    header_fields = layout.header_fields
+    contains_fields = layout.contains_fields
+    column_fields = layout.column_fields
+    total_fields = layout.total_fields
+    total_prefixes = layout.total_prefixes
+    ignored = layout.ignored_labels
+
+    result = layout.template.copy()
+    unmatched = []
+    header_row = None  # linha com o rótulo âncora ("Código")
+    data_row_idx = None
+
+    for idx, row in enumerate(table):
+        in_header = idx < header_rows
+        # Linha de valores da tabela de lançamentos
+        if idx == data_row_idx:
+            in_header = False
+            for i, header in enumerate(header_row):
+                if header is None or i >= len(row) or row[i] is None:
+                    continue
+                field = column_fields.get(header)
+                if field:
+                    result[field] = _join_lines(row[i])
+        elif header_row is None and row and row[0] == layout.anchor:
+            header_row = row
+            data_row_idx = idx + 1
+            if in_header:
+                in_header = False
+                unmatched.extend(
+                    h for h in row if h and h not in column_fields and h not in ignored
+                )
+
+        for cell in row:
+            if cell is None:
+                continue
+            # Totais: qualquer célula que comece com o rótulo do total
+            is_total = cell.startswith(total_prefixes)
+            if is_total:
+                for prefix in total_prefixes:
+                    if cell.startswith(prefix):
+                        lines = cell.split('\n', 2)
+                        if len(lines) > 1:
+                            result[total_fields[prefix]] = lines[1].strip()
+                        break
+            if idx >= header_rows:
+                continue
+            # Dados de identificação: "Rótulo\nValor"
+            lines = cell.split('\n', 2)
+            label = lines[0]
+            field = header_fields.get(label)
+            if field is not None and len(lines) > 1:
+                result[field] = lines[1].strip()
+                continue
+            for text, contains_field in contains_fields.items():
+                if text in label:
+                    result[contains_field] = lines[1].strip() if len(lines) > 1 else ''
+                    break
+            else:
+                if in_header and not is_total and label and field is None and label not in ignored:
+                    unmatched.append(label)
+    return result, unmatched
+
+
+def parse_table(table, layout=DEFAULT_LAYOUT):
+    """Versão de `parse_table_report` que devolve apenas o dicionário."""
+    return parse_table_report(table, layout)[0]
@@ -0,0 +1,276 @@
+"""
+Componentes de interface compartilhados pelas aplicações Streamlit.
+"""
+import hashlib
+import importlib.util
+import json
+
+import pandas as pd
+import streamlit as st
+
+from extracao.cache import file_bytes, get_default_cache
+from extracao.export import FORMATS, export_dataframe
+from extracao.grouping import summarize_warnings
+from extracao.jobs import CANCELLED, DONE, FAILED, QUEUED, get_default_manager
+from extracao.profiling import DEEP_PROFILERS, Profiler, stage
+
+
+def _count_edit(key):
+    versions = st.session_state.setdefault("versoes_editor", {})
+    versions[key] = versions.get(key, 0) + 1
+
+
+def data_editor(df, key, **options):
+    """
+    st.data_editor que conta as edições: devolve (DataFrame editado, versão).
+    A versão muda a cada edição e serve de `version` para o `export_panel`.
+    """
+    edited = st.data_editor(df, key=key, on_change=_count_edit, args=(key,), **options)
+    return edited, st.session_state.get("versoes_editor", {}).get(key, 0)
+
+
+def export_panel(df, base_name, key, version, formats=tuple(FORMATS)):
+    """
+    Exportação sob demanda: o arquivo só é gerado quando o usuário clica em
+    "Gerar arquivo" e fica guardado na sessão enquanto `version` não mudar,
+    em vez de serializar todos os formatos a cada rerun. `version` é um valor
+    barato que identifica os dados (ex.: a chave do resultado, as colunas
+    escolhidas e a versão das edições; ver `data_editor`): o conteúdo do
+    DataFrame não é percorrido nos reruns.
+    """
+    col_format, col_generate = st.columns(2)
+    with col_format:
+        fmt = st.selectbox(
+            "Formato de exportação",
+            options=list(formats),
+            format_func=lambda f: FORMATS[f]['label'],
+            key=f"{key}_formato",
+        )
+    state_key = f"{key}_arquivo"
+    with col_generate:
+        if st.button("Gerar arquivo", key=f"{key}_gerar"):
+            try:
+                with stage(f"exportação {fmt}"):
+                    st.session_state[state_key] = (fmt, version, export_dataframe(df, fmt))
+            except Exception as e:
+                st.error(f"Erro ao exportar para {FORMATS[fmt]['label']}.")
+                st.exception(e)
+
+        stored = st.session_state.get(state_key)
+        if stored and stored[0] == fmt and stored[1] == version:
+            st.download_button(
+                label=f"Baixar {FORMATS[fmt]['label']}",
+                data=stored[2],
+                file_name=f"{base_name}.{FORMATS[fmt]['extension']}",
+                mime=FORMATS[fmt]['mime'],
+                key=f"{key}_baixar",
+            )
+
+
+def page_preview(uploaded_file, key="visualizacao"):
+    """
+    Seleção de página e imagem da pré-visualização. A imagem é renderizada na
+    largura da coluna (com zoom opcional em alta resolução), vem do cache
+    quando a página já foi vista e a próxima página é preparada em segundo plano.
+    """
+    # Importado só quando a pré-visualização é exibida (pdfplumber e renderização)
+    from extracao.preview import ZOOM_DPI, get_default_renderer
+
+    renderer = get_default_renderer()
+    data = file_bytes(uploaded_file)
+    digest = hashlib.sha256(data).hexdigest()
+
+    page_number = st.number_input(
+        "Selecione a página para visualizar",
+        min_value=1,
+        max_value=renderer.page_count(data, digest),
+        value=1,
+        step=1,
+        key=f"{key}_pagina",
+    )
+    zoom = st.checkbox(f"Zoom em alta resolução ({ZOOM_DPI} dpi)", key=f"{key}_zoom")
+    with stage("pré-visualização"):
+        png = renderer.render(data, page_number, resolution=ZOOM_DPI if zoom else None, digest=digest)
+    st.image(png, caption=f"Página {page_number}")
+
+
+def _run_and_cache(job, cache, key, cacheable, func, *args):
+    # O resultado vai para o cache na própria thread do job, mesmo que a sessão
+    # já tenha sido encerrada. O job só o guarda (em job.result) quando ele não
+    # cabe no cache ou não deve ir para ele, para que a memória dos jobs
+    # terminados fique dentro do limite do cache (EXTRACAO_CACHE_MAX_MB)
+    result = func(job, *args)
+    if (cacheable is None or cacheable(result)) and cache.put(key, result):
+        return None
+    return result
+
+
+def background_result(key, description, func, *args, cacheable=None):
+    """
+    Resultado de `func(job, *args)` processado em segundo plano (ver
+    extracao.jobs). Vem do cache quando o conteúdo já foi processado; senão o
+    job é enviado (ou reaproveitado, se já existir para a mesma chave) e o
+    progresso é exibido em um fragmento atualizado a cada segundo, sem
+    prender o restante da página. Retorna None enquanto o job não termina.
+    Resultados para os quais `cacheable(resultado)` é falso (ex.: com páginas
+    que não puderam ser lidas) ficam só na sessão que os pediu, e um novo
+    envio do mesmo conteúdo processa o PDF de novo.
+    """
+    cache = get_default_cache()
+    result = cache.get(key)
+    if result is not None:
+        return result
+    # Resultado maior que o cache inteiro: fica só na sessão que o pediu
+    stored = st.session_state.get("resultado_fora_do_cache")
+    if stored is not None and stored[0] == key:
+        return stored[1]
+
+    manager = get_default_manager()
+    job = manager.find(key)
+    if job is not None and job.status == DONE:
+        if job.result is None:
+            # Já saiu do cache (despejado pelo LRU): processa de novo
+            manager.discard(job.id)
+            job = None
+        else:
+            st.session_state["resultado_fora_do_cache"] = (key, job.result)
+            result, job.result = job.result, None
+            return result
+    # Jobs com erro ou cancelados só são enviados de novo a pedido do usuário
+    if job is None or job.status not in (FAILED, CANCELLED):
+        job = manager.submit(_run_and_cache, cache, key, cacheable, func, *args, key=key,
+                             description=description, profiler=session_profiler())
+    session_jobs = st.session_state.setdefault("jobs", [])
+    if job.id not in session_jobs:
+        session_jobs.append(job.id)
+    st.session_state["job_atual"] = job.id
+
+    if job.status == FAILED:
+        st.error(f"Erro no processamento: {description}")
+        st.code(job.error)
+        if st.button("Tentar novamente", key=f"job_repetir_{job.id}"):
+            manager.discard(job.id)
+            st.rerun()
+        return None
+    if job.status == CANCELLED:
+        st.info(f"Processamento cancelado: {description}")
+        if st.button("Reprocessar", key=f"job_reprocessar_{job.id}"):
+            manager.discard(job.id)
+            st.rerun()
+        return None
+    _job_progress(job.id)
+    return None
+
+
+@st.fragment(run_every=1)
+def _job_progress(job_id):
+    # Reexecutado a cada segundo; ao fim do job a página inteira é refeita com o resultado
+    job = get_default_manager().get(job_id)
+    if job is None or job.is_finished:
+        st.rerun()
+    if job.status == QUEUED:
+        st.info(f"{job.description}: aguardando na fila de processamento.")
+        if st.button("Cancelar", key=f"job_cancelar_{job.id}"):
+            get_default_manager().cancel(job.id)
+            st.rerun()
+        return
+    text = "Processando páginas..."
+    if job.total:
+        text = f"Página {job.done} de {job.total}"
+    st.progress(job.fraction, text=text)
+    # Os blocos são juntados uma vez por atualização (a cada segundo), e não a cada bloco publicado
+    parts = list(job.partial)
+    if parts:
+        st.dataframe(pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0])
+
+
+def warnings_panel(warnings):
+    """
+    Avisos do processamento por página. Um único aviso com o resumo; a lista
+    completa fica em uma tabela (um elemento do Streamlit por aviso custava
+    mais do que o parse em PDFs grandes).
+    """
+    if not warnings:
+        return
+    st.warning(f"{len(warnings)} páginas com avisos durante o processamento.")
+    with st.expander("Avisos"):
+        st.dataframe(pd.DataFrame(summarize_warnings(warnings)), hide_index=True)
+        st.dataframe(pd.DataFrame(warnings), hide_index=True)
+
+
+def jobs_panel():
+    """Lista, na barra lateral, os processamentos enviados nesta sessão."""
+    job_ids = st.session_state.get("jobs")
+    if not job_ids:
+        return
+    jobs = get_default_manager().jobs(job_ids)
+    if not jobs:
+        return
+    with st.sidebar.expander("Processamentos"):
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    'Arquivo': job.description,
+                    'Status': job.status,
+                    'Páginas': f"{job.done}/{job.total or '?'}",
+                    'Tempo (s)': round(job.elapsed(), 1),
+                }
+                for job in jobs
+            ]),
+            hide_index=True,
+        )
+
+
+def session_profiler():
+    """Profiler da execução atual, com as opções escolhidas no painel "Performance"."""
+    deep = st.session_state.get("perf_detalhado")
+    if deep == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+        st.warning("pyinstrument não está instalado; perfil detalhado desativado.")
+        deep = None
+    return Profiler(track_memory=st.session_state.get("perf_memoria", False), deep=deep)
+
+
+def performance_panel(profiler):
+    """
+    Painel recolhível com o tempo, CPU e memória por etapa e por página. As
+    etapas do processamento em segundo plano da sessão (ver
+    `background_result`) aparecem junto com as da execução atual.
+    """
+    with st.expander("Performance"):
+        col_memory, col_deep = st.columns(2)
+        with col_memory:
+            st.checkbox("Medir pico de memória por etapa (tracemalloc, mais lento)", key="perf_memoria")
+        with col_deep:
+            st.selectbox(
+                "Perfil detalhado",
+                options=[None, *DEEP_PROFILERS],
+                format_func=lambda p: "Nenhum" if p is None else p,
+                key="perf_detalhado",
+            )
+        st.caption(
+            "As opções valem a partir da próxima execução. Quando o PDF vem do cache, "
+            "só as etapas efetivamente executadas aparecem."
+        )
+
+        report = profiler.report()
+        job = get_default_manager().get(st.session_state.get("job_atual"))
+        if job is not None and job.profile is not None:
+            report['background'] = job.profile
+            st.write(f"Processamento em segundo plano ({job.description}): {job.profile['total_seconds']:.2f}s")
+            st.dataframe(pd.DataFrame(job.profile['stages']), hide_index=True)
+        st.write(f"Tempo total da execução: {report['total_seconds']:.2f}s")
+        if report['stages']:
+            st.write("Por etapa")
+            st.dataframe(pd.DataFrame(report['stages']), hide_index=True)
+        if report['pages']:
+            st.write("Por página")
+            st.dataframe(pd.DataFrame(report['pages']), hide_index=True)
+        if report['deep_report']:
+            st.code(report['deep_report'])
+        st.download_button(
+            label="Baixar relatório (JSON)",
+            data=json.dumps(report, ensure_ascii=False, indent=2),
+            file_name="desempenho.json",
+            mime="application/json",
+            key="perf_relatorio",
+        )
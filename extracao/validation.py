@@ -0,0 +1,136 @@
+"""
+Validação e agregação vetorizadas dos contracheques extraídos.
+
+Os campos de várias linhas (Código, Descrição, Vantagens, Descontos) são
+expandidos em um DataFrame longo, uma linha por lançamento (ver
+`RecordTable.children`), e as conferências são feitas sobre colunas inteiras
+com NumPy/pandas, sem laço por contracheque:
+
+  - soma das Vantagens = Total de Vencimentos
+  - soma dos Descontos = Total de Descontos
+  - Total de Vencimentos - Total de Descontos = Valor Líquido a Receber
+  - um Código por lançamento (vantagens e descontos)
+
+Diferenças de até `TOLERANCE` (arredondamento dos centavos) são aceitas;
+totais ausentes e lançamentos que não puderam ser convertidos também tornam
+o contracheque inconsistente. O Código e a Descrição só são associados aos
+lançamentos quando as quantidades batem; senão ficam nulos, em vez de ir
+para o lançamento errado.
+"""
+import numpy as np
+import pandas as pd
+
+from extracao.profiling import stage
+
+TOLERANCE = 0.01
+
+# Colunas do registro repetidas em cada linha do DataFrame longo
+KEY_COLUMNS = ('Matrícula', 'Nome', 'Órgão/Secretaria')
+
+TOTAL_COLUMNS = ('Total de Vencimentos', 'Total de Descontos', 'Valor Líquido a Receber')
+
+VANTAGEM = 'Vantagem'
+DESCONTO = 'Desconto'
+
+CHECKS = (
+    ('Diferença Vencimentos', "soma das vantagens difere do Total de Vencimentos"),
+    ('Diferença Descontos', "soma dos descontos difere do Total de Descontos"),
+    ('Diferença Líquido', "vencimentos menos descontos difere do Valor Líquido a Receber"),
+)
+MISALIGNED_CODES = "quantidade de códigos difere da de lançamentos"
+
+
+def aligned_codes(records):
+    """
+    Registros em que cada lançamento tem o seu Código: as vantagens ocupam as
+    primeiras linhas da tabela e os descontos, as seguintes, então só há
+    correspondência com len(Código) == len(Vantagens) + len(Descontos).
+    """
+    return records.counts('Código') == records.counts('Vantagens') + records.counts('Descontos')
+
+
+def lancamentos(records, keys=KEY_COLUMNS):
+    """
+    DataFrame longo com uma linha por valor de Vantagens ou Descontos:
+    registro, colunas de `keys`, 'Tipo' (Vantagem/Desconto), posição e
+    'Valor', com o Código e a Descrição da linha correspondente (nulos nos
+    registros sem um Código por lançamento; ver `aligned_codes`).
+    """
+    keys = [key for key in keys if key in records.schema]
+    parts = []
+    for column, kind in (('Vantagens', VANTAGEM), ('Descontos', DESCONTO)):
+        part = records.children(column, keys=keys).rename(columns={column: 'Valor'})
+        part.insert(len(part.columns) - 1, 'Tipo', kind)
+        parts.append(part)
+    frame = pd.concat(parts, ignore_index=True)
+
+    # Código/Descrição pela linha da tabela de lançamentos: as vantagens ocupam
+    # as primeiras linhas e os descontos, as seguintes
+    codes = records.children('Código').merge(records.children('Descrição'), on=['registro', 'posição'], how='left')
+    codes = codes[aligned_codes(records)[codes['registro']]]
+    earnings_count = np.bincount(parts[0]['registro'], minlength=len(records))
+    line = frame['posição'] + np.where(frame['Tipo'] == DESCONTO, earnings_count[frame['registro']], 0)
+    frame = frame.merge(codes.rename(columns={'posição': 'linha'}), left_on=['registro', line], how='left',
+                        right_on=['registro', 'linha']).drop(columns='linha')
+    return frame.sort_values(['registro', 'Tipo', 'posição'], ascending=[True, False, True], ignore_index=True)
+
+
+def validate_contracheques(records, tolerance=TOLERANCE):
+    """
+    Conferência dos totais de cada contracheque. Retorna um DataFrame com uma
+    linha por registro (mesma ordem de `records.to_frame()`): somas dos
+    lançamentos, diferenças, 'Consistente' e a descrição das 'Inconsistências'.
+    """
+    size = len(records)
+    with stage("validação"):
+        sums = {}
+        for column in ('Vantagens', 'Descontos'):
+            children = records.children(column)
+            sums[column] = np.bincount(children['registro'], weights=children[column], minlength=size)
+        totals = {column: records.column(column).to_numpy() for column in TOTAL_COLUMNS}
+        earnings, deductions, net = totals.values()
+
+        result = pd.DataFrame({
+            'Soma Vantagens': sums['Vantagens'].round(2),
+            'Soma Descontos': sums['Descontos'].round(2),
+            'Diferença Vencimentos': (sums['Vantagens'] - earnings).round(2),
+            'Diferença Descontos': (sums['Descontos'] - deductions).round(2),
+            'Diferença Líquido': (earnings - deductions - net).round(2),
+        })
+        problems = pd.Series('', index=result.index)
+        for column, values in totals.items():
+            problems = problems.mask(np.isnan(values), problems + f"{column} ausente; ")
+        # Um lançamento que não pôde ser convertido (ver `records.invalid`) fica
+        # nulo e anula a soma do registro
+        for column, values in sums.items():
+            problems = problems.mask(np.isnan(values), problems + f"valor não convertido em {column}; ")
+        problems = problems.mask(~aligned_codes(records), problems + MISALIGNED_CODES + "; ")
+        # As diferenças nulas vêm dos casos acima (totais ausentes ou valores não
+        # convertidos), já apontados
+        for column, message in CHECKS:
+            failed = result[column].abs() > tolerance
+            problems = problems.mask(failed, problems + message + "; ")
+        result['Consistente'] = problems == ''
+        result['Inconsistências'] = problems.str.rstrip('; ')
+    return result
+
+
+def summarize(df, checks=None, by='Órgão/Secretaria'):
+    """
+    Totais por grupo (padrão: Órgão/Secretaria): quantidade de contracheques,
+    somas de vencimentos, descontos e líquido e, com `checks`
+    (ver `validate_contracheques`), a quantidade de inconsistentes.
+    """
+    with stage("agregação"):
+        frame = df[[by, *TOTAL_COLUMNS]].copy()
+        frame[by] = frame[by].fillna("(sem informação)")
+        aggregations = {
+            'Contracheques': ('Total de Vencimentos', 'size'),
+            'Total de Vencimentos': ('Total de Vencimentos', 'sum'),
+            'Total de Descontos': ('Total de Descontos', 'sum'),
+            'Valor Líquido a Receber': ('Valor Líquido a Receber', 'sum'),
+        }
+        if checks is not None:
+            frame['Inconsistentes'] = (~checks['Consistente']).to_numpy()
+            aggregations['Inconsistentes'] = ('Inconsistentes', 'sum')
+        return frame.groupby(by, sort=True).agg(**aggregations).reset_index()
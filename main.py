@@ -1,163 +1,37 @@
-import pdfplumber
-import io
 import streamlit as st
-from streamlit_pdf_viewer import pdf_viewer
-import base64
 import pandas as pd
-import re
-from io import BytesIO
-import pandas as pd
-
+from extracao.engine import extract_document, document_text, document_tables
+from extracao.cache import content_key, file_bytes, stream_document_pages
+from extracao.grouping import has_read_errors, readable_pages
+from extracao.pipeline import contracheque_rows
+from extracao.profiling import stage
+from extracao.records import CONTRACHEQUE_SCHEMA, RECORDS_VERSION, RecordTable
+from extracao.stream import chunked, count_progress
+from extracao.tables import parse_table_report
+from extracao.ui import (background_result, data_editor, export_panel, jobs_panel, page_preview, performance_panel,
+                         session_profiler, warnings_panel)
+from extracao.validation import lancamentos, summarize, validate_contracheques
 
-st.set_page_config(
-    page_title="Extração de Dados - Contra cheque",
-    layout="wide",
-    initial_sidebar_state="collapsed"  # Inicia a sidebar recolhida
-)
 
 def parse_table(table):
     """
     Extrai os dados do OCR e organiza-os em um dicionário.
-    O processamento é dividido em três partes:
+    O processamento é feito em uma única passada pela tabela, classificando as
+    células pelo layout padrão (ver extracao.tables.DEFAULT_SPEC):
       1. Dados superiores (identificação: Matrícula, Nome, CPF, etc.)
       2. Dados da tabela (cabeçalho e linha de valores)
       3. Totais (Total de Vencimentos, Total de Descontos, Valor Líquido a Receber)
     """
-    result = {
-        'Matrícula': None,
-        'Nome': None,
-        'CPF': None,
-        'PIS/PASEP': None,
-        'Banco': None,
-        'Agência': None,
-        'Conta': None,
-        'Órgão/Secretaria': None,
-        'Unid. Trabalho/Lotação': None,
-        'Data Admissão': None,
-        'Cargo/Benefício': None,
-        'Carga Horária': None,
-        'Tempo de Serviço': None,
-        'Margem Consignável': None,
-        'Tempo de Serviço Anterior': None,
-        'Código': None,
-        'Descrição': None,
-        'Limite': None,
-        'Vantagens': None,
-        'Descontos': None,
-        'Total de Vencimentos': None,
-        'Total de Descontos': None,
-        'Valor Líquido a Receber': None
-    }
-
-    # Parte 1: Processar as linhas superiores (primeiras 7 linhas)
-    for row in table[:7]:
-        for cell in row:
-            if cell is None:
-                continue
-            lines = cell.split('\n')
-            if lines[0] == 'Matrícula' and len(lines) > 1:
-                result['Matrícula'] = lines[1].strip()
-            elif lines[0] == 'Nome' and len(lines) > 1:
-                result['Nome'] = lines[1].strip()
-            elif lines[0] == 'CPF' and len(lines) > 1:
-                result['CPF'] = lines[1].strip()
-            elif lines[0] == 'PIS/PASEP' and len(lines) > 1:
-                result['PIS/PASEP'] = lines[1].strip()
-            elif lines[0] == 'Banco' and len(lines) > 1:
-                result['Banco'] = lines[1].strip()
-            elif lines[0] == 'Agência' and len(lines) > 1:
-                result['Agência'] = lines[1].strip()
-            elif lines[0] == 'Conta' and len(lines) > 1:
-                result['Conta'] = lines[1].strip()
-            elif lines[0] == 'Órgão/Secretaria' and len(lines) > 1:
-                result['Órgão/Secretaria'] = lines[1].strip()
-            elif lines[0] == 'Unid. Trabalho/Lotação' and len(lines) > 1:
-                result['Unid. Trabalho/Lotação'] = lines[1].strip()
-            elif lines[0] == 'Data Admissão' and len(lines) > 1:
-                result['Data Admissão'] = lines[1].strip()
-            elif lines[0] == 'Cargo/Benefício' and len(lines) > 1:
-                result['Cargo/Benefício'] = lines[1].strip()
-            elif lines[0] == 'Carga Horária' and len(lines) > 1:
-                result['Carga Horária'] = lines[1].strip()
-            elif lines[0] == 'Tempo de Serviço' and len(lines) > 1:
-                result['Tempo de Serviço'] = lines[1].strip()
-            elif lines[0] == 'Margem Consignável' and len(lines) > 1:
-                result['Margem Consignável'] = lines[1].strip()
-            elif 'Tempo de Serviço Anterior' in lines[0]:
-                if len(lines) > 1:
-                    result['Tempo de Serviço Anterior'] = lines[1].strip()
-                else:
-                    result['Tempo de Serviço Anterior'] = ''
-
-    # Parte 2: Processar a parte da tabela (cabeçalho e linha de valores)
-    header_row = None
-    data_row = None
-    for idx, row in enumerate(table):
-        if row[0] == 'Código':
-            header_row = row
-            # Supomos que a linha seguinte contenha os dados correspondentes
-            if idx + 1 < len(table):
-                data_row = table[idx + 1]
-            break
-
-    if header_row and data_row:
-        for i, header in enumerate(header_row):
-            if header is None:
-                continue
-            value = data_row[i] if i < len(data_row) else None
-            if value is None:
-                continue
-            # Extração baseada no rótulo da coluna
-            if header == 'Código':
-                # Junta valores separados por quebra de linha com vírgula
-                result['Código'] = '; '.join([v.strip() for v in value.split('\n')])
-            elif header == 'Descrição':
-                # Junta com " - " para melhor legibilidade
-                result['Descrição'] = '; '.join([v.strip() for v in value.split('\n')])
-            elif header == 'Limite':
-                result['Limite'] = '; '.join([v.strip() for v in value.split('\n')])
-            elif header == 'Vantagens':
-                result['Vantagens'] = '; '.join([v.strip() for v in value.split('\n')])
-            elif header == 'Descontos':
-                result['Descontos'] = '; '.join([v.strip() for v in value.split('\n')])
-            # O rótulo "Ref." pode ser ignorado ou tratado se necessário
-
-    # Parte 3: Processar as linhas de totais
-    for row in table:
-        for cell in row:
-            if cell is None:
-                continue
-            if cell.startswith('Total de Vencimentos'):
-                lines = cell.split('\n')
-                if len(lines) > 1:
-                    result['Total de Vencimentos'] = lines[1].strip()
-            elif cell.startswith('Total de Descontos'):
-                lines = cell.split('\n')
-                if len(lines) > 1:
-                    result['Total de Descontos'] = lines[1].strip()
-            elif cell.startswith('Valor Líquido a Receber'):
-                lines = cell.split('\n')
-                if len(lines) > 1:
-                    result['Valor Líquido a Receber'] = lines[1].strip()
-
-    return result
+    return parse_table_report(table)[0]
 
 # Função para extrair o texto de todas as páginas do PDF
 def extract_pdf_text(file):
-    with pdfplumber.open(file) as pdf:
-        raw_text = [page.extract_text() for page in pdf.pages if page.extract_text()]
-    return "\n".join(raw_text)
+    return document_text(extract_document(file, tables=False))
 
 # Função para extrair todas as tabelas do PDF
+# (modelo de regiões aprendido na primeira página; ver extracao.regions)
 def extract_pdf_tables(file):
-    tables_data = []
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            if tables:
-                for table in tables:
-                    tables_data.append(table)
-    return tables_data
+    return document_tables(extract_document(file, text=False, template="auto"))
 
 # Função para criar o DataFrame a partir de uma tabela extraída
 # OBS.: Certifique-se de ter implementado a função 'parse_table' que transforma a tabela no dicionário desejado.
@@ -165,29 +39,89 @@ def create_dataframe_from_table(table):
     parsed_dict = parse_table(table)  # Função que você deve implementar
     return pd.DataFrame([parsed_dict])
 
+# Pipeline incremental: páginas lidas sob demanda e tabelas convertidas conforme chegam
+def stream_table_rows(job, data):
+    """
+    Lê as páginas do PDF uma a uma (ou do cache, se o conteúdo já foi
+    processado), aplica o parse_table em cada tabela assim que a página chega
+    e publica o progresso e as linhas novas da tabela parcial no job a cada
+    bloco de páginas.
+    Roda em segundo plano (ver extracao.jobs), sem acessar o Streamlit.
+    Retorna o texto completo, os registros tipados (um por tabela), os
+    rótulos que o layout não reconheceu e os avisos das páginas que não
+    puderam ser lidas.
+    """
+    # Os contracheques têm layout fixo: as tabelas usam o modelo de regiões da primeira página
+    # O resultado vai inteiro para o cache (chave de registros), então as páginas não são acumuladas
+    num_pages, pages = stream_document_pages(data, keep=False, template="auto")
+    pages = count_progress(pages, lambda n: job.set_progress(n, num_pages))
+    warnings = []
+    pages = readable_pages(pages, warnings)
+
+    raw_text = []
+    records = RecordTable(CONTRACHEQUE_SCHEMA)
+    unmatched = set()
+    for chunk in chunked(pages):
+        raw_text.extend(page['text'] for page in chunk if page['text'])
+        # Converte cada tabela em um dicionário (mesmo parser do parse_table) e
+        # guarda os valores já tipados (ver extracao.records)
+        published = len(records)
+        records.extend(contracheque_rows(chunk, unmatched))
+        if len(records) > published:
+            job.add_partial(records.to_frame(start=published))
+    return "\n".join(raw_text), records, unmatched, warnings
+
 
 def main():
+    # Configurada aqui (e não na importação) para que o módulo possa ser importado sem o Streamlit rodando
+    st.set_page_config(
+        page_title="Extração de Dados - Contra cheque",
+        layout="wide",
+        initial_sidebar_state="collapsed"  # Inicia a sidebar recolhida
+    )
     st.title("Extração de Dados - Contra cheque")
 
+    # Cada execução é medida; o resultado aparece no painel "Performance"
+    profiler = session_profiler()
+    with profiler.activate():
+        process_upload()
+    jobs_panel()
+    performance_panel(profiler)
+
+
+def process_upload():
     # Upload do arquivo PDF
     uploaded_file = st.file_uploader("Faça o upload de um PDF - Contra cheque", type=["pdf"])
 
     if uploaded_file is not None:
+        # Texto e tabelas saem de uma única passada pelo PDF, feita em segundo
+        # plano com o progresso exibido de forma incremental; o resultado fica
+        # em cache pelo conteúdo, então os reruns não reprocessam o arquivo
+        data = file_bytes(uploaded_file)
+        records_key = content_key(data, "contracheques", f"registros={RECORDS_VERSION}")
+        # Com páginas que não puderam ser lidas o resultado não vai para o cache
+        result = background_result(records_key, uploaded_file.name, stream_table_rows, data,
+                                   cacheable=lambda result: not has_read_errors(result[3]))
+        if result is None:
+            return
+        pdf_text, records, unmatched, warnings = result
+        # Páginas não lidas: os contracheques delas não estão na tabela
+        warnings_panel(warnings)
+
         # Extração de texto
-        pdf_text = extract_pdf_text(uploaded_file)
         st.subheader("Texto Extraído")
         st.text_area("Conteúdo do PDF", pdf_text, height=200)
         # Extração de tabelas
-        tables = extract_pdf_tables(uploaded_file)
-        if tables:
-            data_rows = []
-            for idx, table in enumerate(tables):
-                # Converte a tabela em um dicionário usando a função parse_table
-                parsed_dict = parse_table(table)  # Implemente essa função conforme a estrutura dos seus dados
-                data_rows.append(parsed_dict)
-
-            # Cria um DataFrame onde cada linha representa os dados de uma tabela extraída
-            df = pd.DataFrame(data_rows)
+        if len(records):
+            # Cria um DataFrame onde cada linha representa os dados de uma tabela extraída,
+            # com valores, datas e números já convertidos
+            with stage("DataFrame"):
+                df = records.to_frame()
+            # Conferência vetorizada dos totais (soma dos lançamentos, líquido); as
+            # colunas de resultado seguem para a tabela e para a exportação
+            checks = validate_contracheques(records)
+            df['Consistente'] = checks['Consistente']
+            df['Inconsistências'] = checks['Inconsistências']
 
             # Lista de colunas desejadas na ordem definida
             desired_columns = [
@@ -196,7 +130,7 @@ def main():
                 'Cargo/Benefício', 'Carga Horária', 'Tempo de Serviço',
                 'Margem Consignável', 'Tempo de Serviço Anterior', 'Código', 'Descrição',
                 'Limite', 'Vantagens', 'Descontos', 'Total de Vencimentos',
-                'Total de Descontos', 'Valor Líquido a Receber'
+                'Total de Descontos', 'Valor Líquido a Receber', 'Consistente', 'Inconsistências'
             ]
             # Seleciona apenas as colunas que realmente existem no DataFrame
             available_columns = [col for col in desired_columns if col in df.columns]
@@ -211,18 +145,44 @@ def main():
             df_final = df[user_columns] if user_columns else df
 
             st.subheader("Dados Extraídos")
+            inconsistent = int((~checks['Consistente']).sum())
+            only_inconsistent = False
+            if inconsistent:
+                st.warning(f"{inconsistent} de {len(df)} contracheques com totais que não conferem "
+                           "(ver a coluna \"Inconsistências\").")
+                only_inconsistent = st.toggle("Mostrar apenas os inconsistentes", key="somente_inconsistentes")
+                if only_inconsistent:
+                    df_final = df_final[~checks['Consistente']]
+            else:
+                st.success("Totais conferidos em todos os contracheques.")
             st.dataframe(df_final)
 
-            # Geração do botão de download para o Excel
-            towrite = BytesIO()
-            df_final.to_excel(towrite, index=False, engine='openpyxl')
-            towrite.seek(0)
-            st.download_button(
-                label="Download Excel",
-                data=towrite,
-                file_name="contra_cheque.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            # Totais por Órgão/Secretaria, agregados sobre as colunas tipadas
+            with st.expander("Totais por Órgão/Secretaria"):
+                summary = summarize(df, checks)
+                st.dataframe(summary, hide_index=True)
+                export_panel(summary, "totais_por_orgao", key="totais_orgao", version=records_key)
+
+            # Um lançamento (vantagem ou desconto) por linha, montado só quando pedido
+            if st.toggle("Mostrar lançamentos (uma linha por vantagem/desconto)", key="mostrar_lancamentos"):
+                long_df = lancamentos(records)
+                st.dataframe(long_df, hide_index=True)
+                export_panel(long_df, "lancamentos", key="lancamentos", version=records_key)
+
+            # Valores que não puderam ser convertidos (ficam vazios na tabela)
+            if records.invalid:
+                with st.expander(f"Valores não convertidos ({len(records.invalid)})"):
+                    st.dataframe(pd.DataFrame(records.invalid, columns=['Registro', 'Coluna', 'Texto']),
+                                 hide_index=True)
+
+            # Rótulos do cabeçalho que o layout não reconhece (layout novo de contracheque?)
+            if unmatched:
+                with st.expander(f"Rótulos não reconhecidos ({len(unmatched)})"):
+                    st.write(sorted(unmatched))
+
+            # Exportação das colunas selecionadas, gerada só quando solicitada
+            export_panel(df_final, "contra_cheque", key="dados_extraidos",
+                         version=(records_key, tuple(user_columns), only_inconsistent))
         else:
             st.info("Nenhuma tabela foi encontrada no PDF.")
 
@@ -233,52 +193,14 @@ def main():
 
         with col1:
             # 4. Edição dos Dados
-            edited_df = st.data_editor(df, num_rows="dynamic")
-
-            # Cria 3 colunas para os botões
-            col_txt, col_xlsx = st.columns(2)
-
-            with col_txt:
-                txt_data = edited_df.to_string(index=False)
-                st.download_button(
-                    label="Exportar TXT",
-                    data=txt_data,
-                    file_name="contra_cheque.txt",
-                    mime="text/plain"
-                )
+            edited_df, edits = data_editor(df, key=f"editor_{records_key}", num_rows="dynamic")
 
-            with col_xlsx:
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
-                    edited_df.to_excel(writer, index=False, sheet_name="Dados")
-                excel_data = excel_buffer.getvalue()
-                st.download_button(
-                    label="Exportar XLSX",
-                    data=excel_data,
-                    file_name="contra_cheque.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+            # Exportação dos dados editados (XLSX, CSV, Parquet, Arrow ou TXT)
+            export_panel(edited_df, "contra_cheque", key="dados_editados", version=(records_key, edits))
 
         with col2:
             # Exibição da visualização (imagem da página)
-             if uploaded_file is not None:
-                pdf = pdfplumber.open(uploaded_file)
-                page_number = st.number_input(
-                    "Selecione a página para visualizar",
-                    min_value=1,
-                    max_value=len(pdf.pages),
-                    value=1,
-                    step=1
-                )
-                # Converte a página selecionada em imagem
-                selected_page = pdf.pages[page_number - 1]
-                page_image = selected_page.to_image(resolution=800)
-                
-                # Exibe a imagem da página
-                st.image(page_image.original, caption=f"Página {page_number}")
-                # Reinicia o ponteiro do arquivo e lê os bytes
-             else:
-                st.write("Não foi possível carregar o PDF.")
+            page_preview(uploaded_file)
 
 
 
@@ -1,137 +1,186 @@
-import pdfplumber
 import streamlit as st
-import re
 import pandas as pd
 import io
-from collections import defaultdict
-from io import BytesIO
+from extracao.engine import TEXT_FAST, TEXT_FULL, count_pages, iter_pages
+from extracao.cache import content_key, file_bytes, stream_document_pages
+from extracao.fields import extract_fields, extract_identity
+from extracao.grouping import EmployeeGrouper, has_read_errors
+from extracao.incremental import PageIndex, default_index_path, employee_status, indexed_pages, indexed_records
+from extracao.pipeline import ficha_records, merge_records
+from extracao.profiling import stage
+from extracao.records import FICHA_SCHEMA, RECORDS_VERSION, RecordTable
+from extracao.stream import chunked, count_progress
+from extracao.ui import (background_result, data_editor, export_panel, jobs_panel, page_preview, performance_panel,
+                         session_profiler, warnings_panel)
 
-st.set_page_config(
-    page_title="Extração de Dados - REGISTRO DO EMPREGADO - FICHA COMPLETA",
-    layout="wide",
-    initial_sidebar_state="collapsed"  # Inicia a sidebar recolhida
-)
 
 # Função que extrai o texto cru de cada página e retorna em lista
-def extract_text_by_page(pdf_file):
-    with pdfplumber.open(pdf_file) as pdf:
-        pages_text = []
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            pages_text.append(text)
-    return pages_text
+# (text_mode=TEXT_FAST usa o modo rápido, sem a análise de layout completa)
+def extract_text_by_page(pdf_file, text_mode=TEXT_FULL):
+    return [page['text'] for page in iter_pages(pdf_file, tables=False, text_mode=text_mode)]
 
 
 def parse_page_1(text):
-    data = {}
-    
-    patterns = {
-        "Nome": r'Nome:\s*([^\n]+)',
-        "Matrícula": r'Matr[ií]cula:\s*(\d+)',
-        "CPF": r'C\.P\.F:\s*([\d\.\-]+)',
-        "RG": r'RG:\s*([\w\/\.\-]+)',
-        "Data de Nascimento": r'Data Nasc(?:\.|imento):\s*([\d\/]+)',
-        "Data de Admissão": r'Data Adm(?:\.|issão):\s*([\d\/]+)',
-        "Cargo": r'Cargo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
-        "Vínculo": r'V[ií]nculo:\s*(\d+\s*-\s*[^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
-        "PIS/PASEP": r'PIS/PASEP:\s*([\d\.\-]+)',
-        "Sexo": r'Sexo:\s*([MF])',
-        "Estado Civil": r'Estado Civil:\s*([^\n]+?)(?=\s+N[ií]vel Instru[cç][ãa]o:|$)',
-        "Nível de Instrução": r'N[ií]vel Instru[cç][ãa]o:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
-        "Órgão": r'Órgão\s*([\d]+\s*-\s*[^\n]+)(?=\s+Regime:|$)',
-        "Regime": r'Regime:\s*([^\n]+?)(?=\s+(?:Regime Prev\.|Lotação|[A-Z][\w\s/\.]+:)|$)',
-        "Lotação": r'Lotação\s*([\d]+\s*-\s*[^\n]+)',
-        "Regime Prev.": r'Regime Prev\.:\s*([^\n]+?)(?=\s+[A-Z][\w\s/\.]+:|$)',
-        "Pai": r'Pai:\s*([^\n]+)(?=\s+M[ãa]e:|$)',
-        "Mãe": r'M[ãa]e:\s*([^\n]+)',
-        "Cônjugue": r'C[ôo]njugue:\s*([^\n]+)(?=\s+Data Nascimento:|$)',
-        "Rua/Av": r'Rua/Av:\s*([^\n]+)(?=\s+Número:|$)',
-        "Número": r'Número:\s*([^\n]+)(?=\s+Bairro:|$)',
-        # Bairro: captura até encontrar "Cidade:" ou o fim da linha
-        "Bairro": r'Bairro:\s*([^\n]+?)(?=\s+Cidade:|$)',
-        # Cidade: captura até encontrar "UF:" ou o fim da linha
-        "Cidade": r'Cidade:\s*([^\n]+?)(?=\s+UF:|$)',
-        "UF": r'UF:\s*([A-Z]{2})(?!\w)',
-        "C.E.P": r'C\.E\.P:\s*([\d\.\-]+)',
-        "Telefone": r'Telefone:\s*([\d]+)',
-        "Nº Dependentes Sal. Família": r'Nº Dependentes Sal\. Família:\s*(\d+)',
-        "Nº Dependentes IRRF": r'Nº Dependentes IRRF:\s*(\d+)',
-        "Dependentes": r'Nome dos Dependentes Sal\. Família:\s*([^\n]+)(?=\s+Data Nascimento:|$)'
-    }
-    
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text)
-        if match:
-            data[field] = match.group(1).strip()
-    
-    return data
-
-# Função exemplo para extrair a matrícula de uma página.
-    
+    # Padrões pré-compilados na importação (ver extracao.fields.FIELD_PATTERNS)
+    return extract_fields(text)
+
+# Função que extrai a identificação do funcionário de uma página.
+
 def extract_id(text):
     """
-    Implemente aqui a lógica para extrair o número de matrícula a partir do texto da página.
-    Por exemplo, utilizando expressões regulares.
+    Matrícula, CPF e nome da página (ver extracao.fields.Identity). As páginas
+    são agrupadas pela matrícula; o CPF e, por último, o nome são usados
+    quando a matrícula não aparece. Páginas sem nenhum deles (None) são
+    continuação da página anterior.
     """
-    import re
-    # Supondo que a matrícula esteja no formato "Matrícula: 123456"
-    match = re.search(r"Nome:\s*([^\n]+)", text)
-    if match:
-        return match.group(1)
-    return None
+    return extract_identity(text)
+
+
+def stream_users_data(job, data, text_mode=TEXT_FULL, index_path=None):
+    """
+    Pipeline incremental: as páginas são lidas sob demanda, agrupadas por
+    funcionário conforme chegam e a tabela parcial é publicada no job a cada
+    bloco de registros. Roda em segundo plano (ver extracao.jobs), sem acessar
+    o Streamlit. Apenas o texto das páginas do bloco corrente fica em memória.
+    Os avisos são acumulados e exibidos ao final, junto com os dados.
+    Com `index_path`, as páginas já vistas em envios anteriores vêm do índice
+    local (ver extracao.incremental) e cada funcionário recebe a sua situação
+    (novo, alterado ou sem alteração).
+    """
+    if index_path:
+        with PageIndex(index_path) as index:
+            return _indexed_users_data(job, data, text_mode, index)
+
+    num_pages, pages = stream_document_pages(data, tables=False, keep=False, text_mode=text_mode)
+    pages = count_progress(pages, lambda n: job.set_progress(n, num_pages))
+
+    # 2) Agrupar páginas pelo número de matrícula (ou CPF/nome), com as páginas de continuação
+    # 3) Processar os dados de cada usuário (parse_page_1 em cada página do grupo)
+    users_data = {}  # dicionário com os dados de cada matrícula
+    warnings = []
+    grouper = EmployeeGrouper()
+    records = ficha_records(pages, warnings, key_func=extract_id, parse_func=parse_page_1, grouper=grouper)
+    for chunk in chunked(records):
+        _publish_chunk(job, chunk, users_data)
+
+    return {'num_pages': num_pages, 'keys': list(users_data), 'records': _typed_records(users_data),
+            'warnings': warnings, 'continuations': grouper.continuations}
+
+
+def _publish_chunk(job, chunk, users_data):
+    # Mescla o bloco e publica só os funcionários que apareceram nele pela
+    # primeira vez; páginas posteriores de quem já foi publicado entram só no
+    # resultado final
+    new_keys = dict.fromkeys(key for key, _ in chunk if key not in users_data)
+    merge_records(chunk, users_data)
+    if new_keys:
+        job.add_partial(pd.DataFrame([users_data[key] for key in new_keys]))
+
+
+def _typed_records(users_data):
+    # Registros finais com esquema fixo e valores já tipados (ver extracao.records)
+    with stage("registros tipados"):
+        return RecordTable(FICHA_SCHEMA).extend(users_data.values())
+
+
+def _indexed_users_data(job, data, text_mode, index):
+    # Mesmo pipeline, com o parse só das páginas cuja impressão digital é nova
+    num_pages = count_pages(io.BytesIO(data))
+    warnings = []
+    changed = set()
+    pages = indexed_pages(io.BytesIO(data), index, warnings, text_mode, key_func=extract_id, parse_func=parse_page_1)
+    pages = count_progress(pages, lambda n: job.set_progress(n, num_pages))
+
+    users_data = {}
+    grouper = EmployeeGrouper()
+    for chunk in chunked(indexed_records(pages, changed, warnings, grouper)):
+        _publish_chunk(job, chunk, users_data)
+
+    status = employee_status(users_data, changed, index)
+    index.flush()
+    return {'num_pages': num_pages, 'keys': list(users_data), 'records': _typed_records(users_data),
+            'warnings': warnings, 'continuations': grouper.continuations,
+            'status': status, 'reused_pages': index.hits}
 
 
 def main():
+    # Configurada aqui (e não na importação) para que o módulo possa ser importado sem o Streamlit rodando
+    st.set_page_config(
+        page_title="Extração de Dados - REGISTRO DO EMPREGADO - FICHA COMPLETA",
+        layout="wide",
+        initial_sidebar_state="collapsed"  # Inicia a sidebar recolhida
+    )
     st.title("Extração de Dados - Ficha Completa")
-    
+
+    # Cada execução é medida; o resultado aparece no painel "Performance"
+    profiler = session_profiler()
+    with profiler.activate():
+        process_upload()
+    jobs_panel()
+    performance_panel(profiler)
+
+
+def process_upload():
     uploaded_file = st.file_uploader("Faça o upload do PDF", type=["pdf"])
+    # Modo rápido: remonta as linhas direto dos caracteres do pdfminer (texto aproximado)
+    fast_text = st.sidebar.toggle(
+        "Extração de texto rápida",
+        value=False,
+        help="Dispensa a análise de layout completa do pdfplumber. O texto é "
+             "aproximado, mas suficiente para os campos rotulados da ficha."
+    )
+    text_mode = TEXT_FAST if fast_text else TEXT_FULL
+    # Índice local das páginas já processadas: nos envios mensais só as páginas alteradas são lidas
+    incremental = st.sidebar.toggle(
+        "Reaproveitar páginas já processadas",
+        value=True,
+        help="Guarda, em um índice local, os dados de cada página pela impressão digital "
+             "do seu conteúdo. Em um novo envio, só as páginas alteradas são processadas."
+    )
     if uploaded_file is not None:
-        # 1) Extrair o texto de todas as páginas com tratamento de exceções
-        try:
-            pages_text = extract_text_by_page(uploaded_file)
-        except Exception as e:
-            st.error("Erro ao extrair o texto das páginas do PDF.")
-            st.exception(e)
+        # 1) O PDF é processado em segundo plano, com o progresso e a tabela
+        #    parcial exibidos enquanto isso. Dados já processados para este
+        #    conteúdo ficam em cache: os reruns do Streamlit (edições, troca de
+        #    página) não reprocessam o PDF
+        data = file_bytes(uploaded_file)
+        if incremental:
+            # A situação de cada funcionário e as páginas reaproveitadas são
+            # relativas ao índice no momento do envio: o resultado fica só na
+            # sessão, fora do cache por conteúdo (um novo envio compara com o
+            # índice atual, e o próprio índice evita ler de novo as páginas)
+            records_key = content_key(data, "fichas", text_mode, f"registros={RECORDS_VERSION}", "indice")
+            index_path = default_index_path()
+            cacheable = lambda result: False
+        else:
+            records_key = content_key(data, "fichas", text_mode, f"registros={RECORDS_VERSION}")
+            index_path = None
+            # Com páginas que não puderam ser lidas o resultado não vai para o cache
+            cacheable = lambda result: not has_read_errors(result['warnings'])
+        result = background_result(records_key, uploaded_file.name, stream_users_data, data, text_mode, index_path,
+                                   cacheable=cacheable)
+        if result is None:
             return
-        
-        num_pages = len(pages_text)
+
+        num_pages = result['num_pages']
         st.write(f"O PDF possui {num_pages} páginas.")
-        
-        # 2) Agrupar páginas pelo número de matrícula
-        users_pages = {}  # dicionário para agrupar páginas por matrícula
-        for idx, page_text in enumerate(pages_text):
-            try:
-                matricula = extract_id(page_text)
-            except Exception as e:
-                st.warning(f"Erro ao extrair o id na página {idx+1}: {e}")
-                continue
-
-            if matricula:
-                if matricula not in users_pages:
-                    users_pages[matricula] = []
-                users_pages[matricula].append(page_text)
-            else:
-                st.warning(f"id não encontrada na página {idx+1}. Página ignorada.")
-        
-        # 3) Processar os dados de cada usuário
-        all_users_data = []
-        for matricula, pages in users_pages.items():
-            user_data = {}
-            for page in pages:
-                try:
-                    data = parse_page_1(page)  # Função para processar cada página
-                    user_data.update(data)
-                except Exception as e:
-                    st.warning(f"Erro ao processar página para matrícula {matricula}: {e}")
-                    continue
-            
-            # Salva a quantidade de páginas associadas a esse usuário
-            #user_data["Número_de_Páginas"] = len(pages)
-            all_users_data.append(user_data)
-        
+        status = result.get('status')
+        if status is not None:
+            counts = pd.Series(list(status.values()), dtype=object).value_counts()
+            st.write(
+                f"{result['reused_pages']} páginas reaproveitadas do índice. Funcionários: "
+                + ", ".join(f"{count} {label}" for label, count in counts.items())
+            )
+        if result['continuations']:
+            st.write(f"{result['continuations']} páginas de continuação atribuídas ao funcionário da página anterior.")
+        warnings_panel(result['warnings'])
+
         # 4) Converter os dados para DataFrame e exibir
         try:
-            df = pd.DataFrame(all_users_data)
+            with stage("DataFrame"):
+                df = result['records'].to_frame()
+                # Marca os funcionários alterados desde o último envio
+                if status is not None:
+                    df.insert(0, "Situação", [status[key] for key in result['keys']])
         except Exception as e:
             st.error("Erro ao converter os dados para DataFrame.")
             st.exception(e)
@@ -148,61 +197,20 @@ def main():
             st.write("### Visualizar e editar dados")
 
             try:
-                edited_df = st.data_editor(df, num_rows="dynamic")
+                edited_df, edits = data_editor(df, key=f"editor_{records_key}", num_rows="dynamic")
             except Exception as e:
                 st.error("Erro ao carregar o editor de dados.")
                 st.exception(e)
-                edited_df = df  # fallback para o DataFrame original
-
-            # Cria 2 colunas para os botões de exportação
-            col_txt, col_xlsx = st.columns(2)
-
-            with col_txt:
-                txt_data = edited_df.to_string(index=False)
-                st.download_button(
-                    label="Exportar TXT",
-                    data=txt_data,
-                    file_name="ficha_geral.txt",
-                    mime="text/plain"
-                )
-
-            with col_xlsx:
-                try:
-                    excel_buffer = io.BytesIO()
-                    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
-                        edited_df.to_excel(writer, index=False, sheet_name="Dados")
-                    excel_data = excel_buffer.getvalue()
-                    st.download_button(
-                        label="Exportar XLSX",
-                        data=excel_data,
-                        file_name="ficha_geral.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-                except Exception as e:
-                    st.error("Erro ao exportar para XLSX.")
-                    st.exception(e)
+                edited_df, edits = df, 0  # fallback para o DataFrame original
+
+            # Exportação gerada só quando solicitada (XLSX, CSV, Parquet, Arrow ou TXT)
+            export_panel(edited_df, "ficha_geral", key="dados_editados", version=(records_key, edits))
 
         with col2:
             st.write("---")
             st.write("### Visualizar Páginas de um Usuário Específico")
             try:
-                pdf = pdfplumber.open(uploaded_file)
-            except Exception as e:
-                st.error("Erro ao abrir o arquivo PDF para visualização.")
-                st.exception(e)
-                return
-
-            try:
-                page_number = st.number_input(
-                    "Selecione a página para visualizar",
-                    min_value=1,
-                    max_value=len(pdf.pages),
-                    value=1,
-                    step=1
-                )
-                selected_page = pdf.pages[page_number - 1]
-                page_image = selected_page.to_image(resolution=800)
-                st.image(page_image.original, caption=f"Página {page_number}")
+                page_preview(uploaded_file)
             except Exception as e:
                 st.error("Erro ao visualizar a página selecionada.")
                 st.exception(e)